@@ -0,0 +1,134 @@
+"""
+Throughput of the METIS, SNAP, DIMACS and GraphML loaders.
+
+Generates a G(n, m) random graph with GraphGenerator.iter_erdos_renyi_edge,
+writes it in every format without building a graph, then times the
+Graph.from_* loader of each file.
+
+    python benchmarks/bench_readers.py [--edges 10000000] [--degree 20]
+                                       [--formats metis snap dimacs graphml]
+                                       [--directory DIR] [--keep]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+from graphtool.graph import Graph
+from graphtool.graph.generator import GraphGenerator
+
+
+def edge_tables(args):
+    n = max(2, 2*args.edges // args.degree)
+    return n, GraphGenerator.iter_erdos_renyi_edge(n, args.edges, seed=1)
+
+
+def write_snap(path, args):
+    n, tables = edge_tables(args)
+    body = path + ".body"
+    m = GraphGenerator.write_edges(body, tables)
+    with open(path, "w") as f:
+        f.write("# Undirected graph: {}\n".format(os.path.basename(path)))
+        f.write("# Nodes: {} Edges: {}\n".format(n, m))
+        f.write("# FromNodeId\tToNodeId\n")
+        with open(body, "r") as source:
+            shutil.copyfileobj(source, f, 1 << 24)
+    os.remove(body)
+
+
+def write_dimacs(path, args):
+    n, tables = edge_tables(args)
+    with open(path, "w") as f:
+        f.write("c G(n, m) graph, unit weights\n")
+        f.write("p sp {} {}\n".format(n, args.edges))
+        for table in tables:
+            np.savetxt(f, table + 1, fmt="a %d %d 1")
+
+
+def write_metis(path, args):
+    n, tables = edge_tables(args)
+    pairs = np.concatenate(list(tables))
+    rows = np.concatenate((pairs[:, 0], pairs[:, 1]))
+    cols = np.concatenate((pairs[:, 1], pairs[:, 0])) + 1
+    del pairs
+    order = np.argsort(rows, kind="stable")
+    counts = np.bincount(rows, minlength=n)
+    neighbours = np.split(cols[order], np.cumsum(counts)[:-1])
+    with open(path, "w") as f:
+        f.write("{} {}\n".format(n, args.edges))
+        for start in range(0, n, 1 << 16):
+            f.write("\n".join(" ".join(map(str, a.tolist()))
+                              for a in neighbours[start:start + (1 << 16)]))
+            f.write("\n")
+
+
+def write_graphml(path, args):
+    n, tables = edge_tables(args)
+    with open(path, "w") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+                '<graph id="G" edgedefault="undirected">\n')
+        for start in range(0, n, 1 << 16):
+            f.write("".join('<node id="n{}"/>\n'.format(i) for i in
+                            range(start, min(start + (1 << 16), n))))
+        for table in tables:
+            f.write("".join('<edge source="n{}" target="n{}"/>\n'.format(u, v)
+                            for (u, v) in table.tolist()))
+        f.write("</graph>\n</graphml>\n")
+
+
+FORMATS = {
+    "metis": (".graph", write_metis, Graph.from_metis),
+    "snap": (".txt", write_snap, Graph.from_snap),
+    "dimacs": (".gr", write_dimacs, Graph.from_dimacs),
+    "graphml": (".graphml", write_graphml, Graph.from_graphml),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--edges", type=int, default=10**7)
+    parser.add_argument("--degree", type=int, default=20,
+                        help="mean degree of the generated graph")
+    parser.add_argument("--formats", nargs="+", default=list(FORMATS),
+                        choices=list(FORMATS))
+    parser.add_argument("--directory", default=None,
+                        help="where the files are written, a temporary "
+                        "directory by default")
+    parser.add_argument("--keep", action="store_true",
+                        help="keep the generated files")
+    args = parser.parse_args()
+    directory = args.directory or tempfile.mkdtemp(prefix="bench_readers_")
+    os.makedirs(directory, exist_ok=True)
+    print("{:<8} {:>10} {:>10} {:>10} {:>14}".format(
+        "format", "size (MB)", "write (s)", "load (s)", "edges/s"))
+    try:
+        for name in args.formats:
+            extension, write, load = FORMATS[name]
+            path = os.path.join(directory, "graph" + extension)
+            start = time.perf_counter()
+            write(path, args)
+            written = time.perf_counter() - start
+            start = time.perf_counter()
+            graph = load(path)
+            loaded = time.perf_counter() - start
+            # counted on the adjacency, the Edge objects being only built
+            # when needed
+            m = sum(graph.vertex_degree()) // 2
+            if m != args.edges:
+                raise Exception("{} edges loaded from {} instead of {}"
+                                .format(m, path, args.edges))
+            del graph
+            print("{:<8} {:>10.1f} {:>10.2f} {:>10.2f} {:>14,.0f}".format(
+                name, os.path.getsize(path) / 1e6, written, loaded,
+                args.edges / loaded))
+            if not args.keep:
+                os.remove(path)
+    finally:
+        if not args.keep and args.directory is None:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
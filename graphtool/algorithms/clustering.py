@@ -31,6 +31,8 @@ def global_clustering_coeff(graph):
     The clustering coefficient is defined by
     3*{number of triangles}/{number of connected triplets}
     """
+    if isinstance(graph, FrozenGraph):
+        return _frozen_global_clustering_coeff(graph)
     v = graph.vertices()
     e = graph.edges()
     triangles = 0
@@ -53,6 +55,8 @@ def global_clustering_coeff(graph):
 
 
 def local_clustering_coeff(graph, v):
+    if isinstance(graph, FrozenGraph):
+        return _frozen_local_clustering_coeff(graph, graph.index_of(v))
     if not isinstance(v, Vertex):
         v = Vertex(v)
     neigh = graph.get_neighbours(v)
@@ -69,7 +73,45 @@ def local_clustering_coeff(graph, v):
 def average_local_clustering_coeff(graph):
     c = 0
     n = 0
+    if isinstance(graph, FrozenGraph):
+        for i in range(len(graph)):
+            c += _frozen_local_clustering_coeff(graph, i)
+        return c/len(graph)
     for v in graph.vertices():
         c += local_clustering_coeff(graph, v)
         n += 1
     return c/n
+
+
+def _frozen_links(graph, neigh):
+    """
+    Number of stored (start, end) pairs with both ends in the set of indices
+    'neigh'
+    """
+    return sum(len(neigh.intersection(graph.neighbours_index(u).tolist()))
+               for u in neigh)
+
+
+def _frozen_global_clustering_coeff(graph):
+    triangles = 0
+    connected_triplets = 0
+    for i in range(len(graph)):
+        neigh = set(graph.neighbours_index(i).tolist())
+        neigh.discard(i)
+        k = len(neigh)
+        connected_triplets += k*(k-1)
+        triangles += _frozen_links(graph, neigh)
+    if connected_triplets == 0:
+        return 0
+    return triangles/connected_triplets
+
+
+def _frozen_local_clustering_coeff(graph, i):
+    neigh = set(graph.neighbours_index(i).tolist())
+    k = len(neigh)
+    if k < 2:
+        return 0
+    e = _frozen_links(graph, neigh)
+    if not graph.oriented:
+        e //= 2
+    return (2*e)/(k*(k-1))
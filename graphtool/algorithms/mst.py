@@ -1,10 +1,13 @@
 # Minimum spanning tree algorithms
 
+import numpy as np
 from ..graph import *
+from ..graph._attributes import weight_reader, check_frozen_weight
+from ..graph._attributes import frozen_edge_lengths
 from heapq import *
 
 
-def MST(graph, algo='Kruskal'):
+def MST(graph, algo='Kruskal', weight="weight"):
     """
     Minimal Spanning Tree.
 
@@ -16,26 +19,38 @@ def MST(graph, algo='Kruskal'):
     'algo' : "Kruskal" or "Prim"
         The algo to use to get the MST. Default to Kruskal
 
+    'weight' : str or None
+        The edge attribute giving the length of the edges, read from the
+        edge attribute table of the graph when it has one. If None, every
+        edge has length 1
+
     Returns
     -------
         A minimal spanning tree of the graph
     """
     if algo.lower() == 'prim':
-        return prim(graph)
+        return prim(graph, weight)
     elif algo.lower() == "kruskal":
-        return kruskal(graph)
+        return kruskal(graph, weight)
     else:
         raise Exception("algo should be 'Prim' or 'Kruskal'")
 
 
-def kruskal(graph):
+def kruskal(graph, weight="weight"):
     """
     Kruskal algorithm
 
+    Parameters
+    ----------
+    'weight' : the edge attribute giving the length of the edges, see MST
+
     Returns
     -------
     The minimal spanning tree on the graph
     """
+    if isinstance(graph, FrozenGraph):
+        return _frozen_kruskal(graph, weight)
+    length = weight_reader(graph, weight)
     father = {node: node for node in graph.vertices()}
     weight = {node: 0 for node in graph.vertices()}
 
@@ -53,7 +68,7 @@ def kruskal(graph):
             merge(f2, f1)
 
     edges = list(graph.edges())
-    edges.sort()
+    edges.sort(key=lambda e: (length(e), e))
     mst = []
     for e in edges:
         fs = get_father(e.start)
@@ -64,14 +79,21 @@ def kruskal(graph):
     return mst
 
 
-def prim(graph):
+def prim(graph, weight="weight"):
     """
     Prim algorithm
 
+    Parameters
+    ----------
+    'weight' : the edge attribute giving the length of the edges, see MST
+
     Returns
     -------
     The minimal spanning tree on the graph
     """
+    if isinstance(graph, FrozenGraph):
+        return _frozen_prim(graph, weight)
+    length = weight_reader(graph, weight)
     heap = [(0, 0, next(iter(graph.vertices())), None)]
     dist = dict()
     t = 0
@@ -87,6 +109,71 @@ def prim(graph):
             neighbour = edge.other(node)
             if neighbour not in dist:
                 t += 1
-                realweight = edge["weight"]
-                heappush(heap, (realweight, t, neighbour, edge))
+                heappush(heap, (length(edge), t, neighbour, edge))
+    return mst
+
+
+def _frozen_edge(graph, i, j, weight):
+    e = Edge(graph.vertex_at(i), graph.vertex_at(j))
+    e["weight"] = weight
+    return e
+
+
+def _frozen_kruskal(graph, weight="weight"):
+    """
+    Kruskal algorithm on the index arrays of a FrozenGraph
+    """
+    rows, cols, weights = frozen_edge_lengths(graph, weight)
+    keep = rows < cols
+    rows, cols, weights = rows[keep], cols[keep], weights[keep]
+    order = np.lexsort((cols, rows, weights))
+    father = list(range(len(graph)))
+    rank = [0]*len(graph)
+
+    def get_father(node):
+        root = node
+        while root != father[root]:
+            root = father[root]
+        while node != root:
+            father[node], node = root, father[node]
+        return root
+
+    mst = []
+    for k in order.tolist():
+        fs, fe = get_father(int(rows[k])), get_father(int(cols[k]))
+        if fs != fe:
+            mst.append(_frozen_edge(graph, int(rows[k]), int(cols[k]),
+                                    float(weights[k])))
+            if rank[fs] < rank[fe]:
+                fs, fe = fe, fs
+            father[fe] = fs
+            if rank[fs] == rank[fe]:
+                rank[fs] += 1
+    return mst
+
+
+def _frozen_prim(graph, weight="weight"):
+    """
+    Prim algorithm on the index arrays of a FrozenGraph
+    """
+    check_frozen_weight(weight)
+    unweighted = weight is None
+    seen = bytearray(len(graph))
+    heap = [(0, 0, -1)]
+    mst = []
+    while len(heap) != 0:
+        weight, node, father = heappop(heap)
+        if seen[node]:
+            continue
+        seen[node] = 1
+        if father != -1:
+            mst.append(_frozen_edge(graph, father, node, weight))
+        neighbours = graph.neighbours_index(node).tolist()
+        if unweighted:
+            weights = [1.0]*len(neighbours)
+        else:
+            weights = graph.weights_index(node).tolist()
+        for (neighbour, w) in zip(neighbours, weights):
+            if not seen[neighbour]:
+                heappush(heap, (w, neighbour, node))
     return mst
@@ -1,8 +1,11 @@
+import numpy as np
 from heapq import *
-from copy import copy
 from ..graph.vertex_edge import Vertex, Edge
 from ..graph.graph import Graph
 from ..graph.orientedGraph import OrientedGraph
+from ..graph.frozenGraph import FrozenGraph
+from ..graph._attributes import weight_reader, check_frozen_weight
+from ..graph._attributes import frozen_edge_lengths
 from .search import get_connected_components
 
 
@@ -20,20 +23,27 @@ def all_shortest_paths(graph):
         A matrix M (list of list) where M[i][j] = the length of the
         shortest path from vertex i to vertex j
     """
-    adj = copy(graph.adjacency_matrix())
-    n = len(adj)
-    for i in range(n):
-        for j in range(n):
-            if adj[i][j] == 0 and i != j:
-                adj[i][j] = float("inf")
-    for k in range(n):
-        for i in range(n):
-            for j in range(n):
-                adj[i][j] = min(adj[i][j], adj[i][k]+adj[k][j])
-    return adj
+    return _distance_matrix(graph).tolist()
 
 
-def shortest_path(graph, v_start, v_end, heuristic):
+def _distance_matrix(graph):
+    """
+    Floyd-Warshall algorithm on a numpy matrix, relaxing a whole row of
+    pairs at each step. Every edge has length 1.
+
+    Returns
+    -------
+        The numpy array of the distances between vertices, in sorted id order
+    """
+    adj, _ = graph.adjacency_matrix(format="dense", weight=None)
+    dist = np.where(adj != 0, 1.0, float("inf"))
+    np.fill_diagonal(dist, 0)
+    for k in range(len(dist)):
+        np.minimum(dist, dist[:, k, None] + dist[None, k, :], out=dist)
+    return dist
+
+
+def shortest_path(graph, v_start, v_end, heuristic, weight="weight"):
     """
     A* algorithm
 
@@ -51,11 +61,20 @@ def shortest_path(graph, v_start, v_end, heuristic):
         'heuristic' : a function (Vertex a, Vertex b) -> weight
             Evaluate the remaining distance from a to b
 
+        'weight' : str or None
+            The edge attribute giving the length of the edges, read from the
+            edge attribute table of the graph when it has one. If None,
+            every edge has length 1
+
     Returns
     -------
         The length l and the sequence of vertices of (one of the) shortest
         paths from v_start to v_end
     """
+    if isinstance(graph, FrozenGraph):
+        return _frozen_shortest_path(graph, v_start, v_end, heuristic,
+                                     weight)
+    length = weight_reader(graph, weight)
     heap = [(0, 0, 0, v_start, None)]
     dist = dict()
     origin = dict()
@@ -70,7 +89,7 @@ def shortest_path(graph, v_start, v_end, heuristic):
             neighbour = edge.other(node)
             if neighbour not in dist:
                 t += 1
-                realweight = weight + edge["weight"]
+                realweight = weight + length(edge)
                 fakeweight = realweight + heuristic(neighbour, v_end)
                 heappush(heap, (fakeweight, realweight, t, neighbour, node))
 
@@ -85,7 +104,48 @@ def shortest_path(graph, v_start, v_end, heuristic):
     return dist[v_end], recover(v_end)
 
 
-def dijkstra(graph, v_start, v_end):
+def _frozen_shortest_path(graph, v_start, v_end, heuristic,
+                          weight="weight"):
+    """
+    A* algorithm on the index arrays of a FrozenGraph. The heuristic is
+    still called on Vertex objects.
+    """
+    check_frozen_weight(weight)
+    unweighted = weight is None
+    start, end = graph.index_of(v_start), graph.index_of(v_end)
+    target = graph.vertex_at(end)
+    n = len(graph)
+    dist = [None]*n
+    origin = [-1]*n
+    heap = [(0, 0, start, -1)]
+    while len(heap) != 0 and dist[end] is None:
+        _, weight, node, father = heappop(heap)
+        if dist[node] is not None:
+            continue
+        dist[node] = weight
+        origin[node] = father
+        neighbours = graph.neighbours_index(node).tolist()
+        if unweighted:
+            weights = [1.0]*len(neighbours)
+        else:
+            weights = graph.weights_index(node).tolist()
+        for (neighbour, w) in zip(neighbours, weights):
+            if dist[neighbour] is None:
+                realweight = weight + w
+                fakeweight = realweight + heuristic(
+                    graph.vertex_at(neighbour), target)
+                heappush(heap, (fakeweight, realweight, neighbour, node))
+    if dist[end] is None:
+        return float("inf"), []
+    path = []
+    node = end
+    while node != -1:
+        path.append(graph.vertex_at(node))
+        node = origin[node]
+    return dist[end], path[::-1]
+
+
+def dijkstra(graph, v_start, v_end, weight="weight"):
     """
     Dijkstra's algorithm
 
@@ -100,6 +160,10 @@ def dijkstra(graph, v_start, v_end):
         'v_end' : a Vertex object
             Target point of the algorithm
 
+        'weight' : str or None
+            The edge attribute giving the length of the edges, see
+            shortest_path
+
     Returns
     -------
         The length l and the sequence of vertices of (one of the) shortest
@@ -107,23 +171,76 @@ def dijkstra(graph, v_start, v_end):
     """
     def no_heuristic(a, b):
         return 0
-    return shortest_path(graph, v_start, v_end, no_heuristic)
+    return shortest_path(graph, v_start, v_end, no_heuristic, weight)
 
 
-def bellman_ford(graph, s):
+def bellman_ford(graph, s, weight="weight"):
+    """
+    Bellman-Ford algorithm. Non-oriented edges are relaxed in both
+    directions, so that a non-oriented edge of negative length is a
+    negative cycle.
+
+    Parameters
+    ----------
+        'graph' : a Graph object
+            graph on which to perform the search
+
+        's' : a Vertex object
+            Starting point of the algorithm
+
+        'weight' : str or None
+            The edge attribute giving the length of the edges, see
+            shortest_path
+
+    Returns
+    -------
+        A dictionnary Vertex -> length of the shortest path from s
+
+    Raises
+    ------
+        An Exception if a negative cycle is reachable from s
+    """
+    if isinstance(graph, FrozenGraph):
+        return _frozen_bellman_ford(graph, s, weight)
+    length = weight_reader(graph, weight)
     nbnodes = len(graph.vertices())
     dist = {vertex: float("inf") for vertex in graph.vertices()}
     dist[s] = 0
     for _ in range(nbnodes-1):
         for edge in graph.edges(erase_multiple=False):
             dist[edge.end] = min(
-                dist[edge.end], dist[edge.start] + edge["weight"])
+                dist[edge.end], dist[edge.start] + length(edge))
+            if not edge.oriented:
+                dist[edge.start] = min(
+                    dist[edge.start], dist[edge.end] + length(edge))
     for edge in graph.edges(erase_multiple=False):
-        if dist[edge.start] + edge["weight"] < dist[edge.end]:
+        if dist[edge.start] + length(edge) < dist[edge.end]:
+            raise Exception("Negative cycle has been found")
+        if not edge.oriented and \
+                dist[edge.end] + length(edge) < dist[edge.start]:
             raise Exception("Negative cycle has been found")
     return dist
 
 
+def _frozen_bellman_ford(graph, s, weight="weight"):
+    """
+    Bellman-Ford algorithm on a FrozenGraph, relaxing every stored edge at
+    once with array operations
+    """
+    rows, cols, weights = frozen_edge_lengths(graph, weight)
+    dist = np.full(len(graph), float("inf"))
+    dist[graph.index_of(s)] = 0
+    for _ in range(len(graph)-1):
+        relaxed = dist.copy()
+        np.minimum.at(relaxed, cols, dist[rows] + weights)
+        if np.array_equal(relaxed, dist):
+            break
+        dist = relaxed
+    if np.any(dist[rows] + weights < dist[cols]):
+        raise Exception("Negative cycle has been found")
+    return {Vertex(i): d for (i, d) in zip(graph.ids.tolist(), dist.tolist())}
+
+
 def diameter(graph):
     """
     The diameter is defined as the longest shortest path among all pairs
@@ -138,14 +255,10 @@ def diameter(graph):
     -------
         The diameter of the graph.
     """
-    paths = all_shortest_paths(graph)
-    n = len(paths)
-    maxi = -float("inf")
-    for i in range(n):
-        for j in range(n):
-            if paths[i][j] >= maxi:
-                maxi = paths[i][j]
-    return maxi
+    paths = _distance_matrix(graph)
+    if paths.size == 0:
+        return -float("inf")
+    return float(paths.max())
 
 
 def biggest_component_diameter(graph):
@@ -168,4 +281,4 @@ def biggest_component_diameter(graph):
         if len(comp_list[i]) > n:
             n = len(comp_list[i])
             biggest = i
-    return diameter(Graph.renumber(comp_list[biggest]))
+    return diameter(comp_list[biggest].renumber())
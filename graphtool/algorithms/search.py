@@ -1,3 +1,4 @@
+import numpy as np
 from ..graph import *
 
 
@@ -73,18 +74,62 @@ def depth_first_search(graph, init_node, functors):
     Returns:
         The return value of the init node
     """
+    if isinstance(graph, FrozenGraph):
+        return _frozen_depth_first_search(graph, init_node, functors)
     pre_functor, neighbour_functor, post_functor = functors
-    visited = set()
-
-    def dfs(node):
-        visited.add(node)
-        state = pre_functor(node)
-        for neighbour in graph.get_neighbours(node):
+    # explicit stack of (state, iterator over the neighbours) so that deep
+    # graphs, such as the ones stored on disk, do not hit the recursion limit
+    visited = set([init_node])
+    stack = [(pre_functor(init_node),
+              iter(graph.get_neighbours(init_node)))]
+    answer = None
+    while stack:
+        state, neighbours = stack[-1]
+        for neighbour in neighbours:
             if neighbour not in visited:
-                answer = dfs(neighbour)
-                state = neighbour_functor(state, answer)
-        return post_functor(state)
-    return dfs(init_node)
+                break
+        else:
+            stack.pop()
+            answer = post_functor(state)
+            if stack:
+                state, neighbours = stack.pop()
+                stack.append((neighbour_functor(state, answer), neighbours))
+            continue
+        visited.add(neighbour)
+        stack.append((pre_functor(neighbour),
+                      iter(graph.get_neighbours(neighbour))))
+    return answer
+
+
+def _frozen_depth_first_search(graph, init_node, functors):
+    """
+    Iterative version of depth_first_search running on the index arrays of a
+    FrozenGraph. Functors are called in the same order as in the recursive
+    version and receive Vertex objects.
+    """
+    pre_functor, neighbour_functor, post_functor = functors
+    visited = bytearray(len(graph))
+    start = graph.index_of(init_node)
+    visited[start] = 1
+    stack = [(pre_functor(graph.vertex_at(start)),
+              iter(graph.neighbours_index(start).tolist()))]
+    answer = None
+    while stack:
+        state, neighbours = stack[-1]
+        for neighbour in neighbours:
+            if not visited[neighbour]:
+                break
+        else:
+            stack.pop()
+            answer = post_functor(state)
+            if stack:
+                state, neighbours = stack.pop()
+                stack.append((neighbour_functor(state, answer), neighbours))
+            continue
+        visited[neighbour] = 1
+        stack.append((pre_functor(graph.vertex_at(neighbour)),
+                      iter(graph.neighbours_index(neighbour).tolist())))
+    return answer
 
 
 def topological_sort(graph):
@@ -94,6 +139,8 @@ def topological_sort(graph):
     Returns:
         The list of the vertices ordered
     """
+    if isinstance(graph, FrozenGraph):
+        return _frozen_topological_sort(graph)
     degrees = graph.get_out_degrees()
     stack = list(graph.get_sinks())
     total_order = []
@@ -109,34 +156,124 @@ def topological_sort(graph):
     return total_order
 
 
+def _frozen_topological_sort(graph):
+    degrees = np.diff(graph.offsets).tolist()
+    stack = [i for i in range(len(graph)) if degrees[i] == 0]
+    total_order = []
+    while stack:
+        vertex = stack.pop()
+        for neighbour in graph.neighbours_index_in(vertex).tolist():
+            degrees[neighbour] -= 1
+            if degrees[neighbour] == 0:
+                stack.append(neighbour)
+        total_order.append(vertex)
+    if len(graph) != len(total_order):
+        raise Exception("Topological sort error : cycles found graph")
+    return [graph.vertex_at(i) for i in total_order]
+
+
 def get_connected_components(graph):
     """
-    Get the connected components of the graph
+    Get the connected components of the graph.
+    The partition of the vertices is cached until the graph is modified,
+    only the subgraphs are rebuilt at each call.
 
     Returns:
         List of components. Each component is the list of the vertices in it
     """
-    seen = set()
-    components = []
+    if isinstance(graph, FrozenGraph):
+        return _frozen_connected_components(graph)
+    components = graph.cached("components",
+                              lambda: _vertex_components(graph))
+    return [graph.subgraph(comp) for comp in components]
 
-    def pre_functor(node):
-        component.append(node)
-        seen.add(node)
 
-    def explore_components(node):
-        functors = (pre_functor, no_neighbour_functor, no_post_functor)
-        return depth_first_search(graph, node, functors)
+def _vertex_components(graph):
+    """
+    Partitions the vertices of the graph by connected component, with an
+    iterative traversal so that large components do not hit the recursion
+    limit.
 
+    Returns:
+        A list of lists of vertices
+    """
+    seen = set()
+    components = []
     for vertex in graph.vertices():
-        if vertex not in seen:
-            component = []
-            explore_components(vertex)
-            components.append(component)
-    return [graph.subgraph(comp) for comp in components]
+        if vertex in seen:
+            continue
+        seen.add(vertex)
+        component = [vertex]
+        stack = [vertex]
+        while stack:
+            for neighbour in graph.get_neighbours(stack.pop()):
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    component.append(neighbour)
+                    stack.append(neighbour)
+        components.append(component)
+    return components
+
+
+def _frozen_connected_components(graph):
+    """
+    Labels the vertices of a FrozenGraph by component with an iterative
+    traversal on indices, then extracts every component as a FrozenGraph.
+    """
+    n = len(graph)
+    label = [-1]*n
+    components = []
+    for root in range(n):
+        if label[root] != -1:
+            continue
+        c = len(components)
+        label[root] = c
+        component = [root]
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            for neighbour in graph.neighbours_index(node).tolist():
+                if label[neighbour] == -1:
+                    label[neighbour] = c
+                    component.append(neighbour)
+                    stack.append(neighbour)
+        components.append(component)
+    return [graph._subgraph_index(np.sort(np.array(comp, dtype=np.int64)))
+            for comp in components]
+
+
+def breath_first_search(graph, init_node, max_depth: int = None):
+    """
+    Generic Breadth First Search algorithm. Only the frontier and the
+    distances are held in memory, the neighbourhoods being requested from
+    the graph one vertex at a time.
 
+    Parameters:
+        'graph': Graph, OrientedGraph, FrozenGraph or DiskGraph
+            The graph to explore
 
-def breath_first_search():
-    """
-    TODO
+        'init_node' : Vertex
+            The starting node
+
+        'max_depth' : int or None
+            If given, vertices further than max_depth edges are not explored
+
+    Returns:
+        A dictionary Vertex -> number of edges of a shortest path from
+        init_node, over the vertices reachable from init_node
     """
-    pass
+    if not isinstance(init_node, Vertex):
+        init_node = Vertex(init_node)
+    depth = {init_node: 0}
+    frontier = [init_node]
+    d = 0
+    while frontier and (max_depth is None or d < max_depth):
+        d += 1
+        next_frontier = []
+        for node in frontier:
+            for neighbour in graph.get_neighbours(node):
+                if neighbour not in depth:
+                    depth[neighbour] = d
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
+    return depth
@@ -2,4 +2,10 @@ from .vertex_edge import Vertex, Edge
 from .graph import Graph
 from .orientedGraph import OrientedGraph
 from .multiGraph import MultiGraph
+from .frozenGraph import FrozenGraph
+from .subgraphView import SubgraphView
+from .diskGraph import DiskGraph
+from .sharedGraph import SharedGraph
+from .journal import Journal
+from ._attributes import AttributeTable
 from .generator import GraphGenerator
@@ -0,0 +1,488 @@
+import numpy as np
+from .vertex_edge import Vertex, Edge
+from ._parsing import parse_node_data, parse_edge_data
+
+# value of the rows of a column that were never set, by dtype kind
+_FILL = {"f": np.nan, "i": 0, "u": 0, "b": False, "U": ""}
+
+# kinds of values stored in a column of another kind without changing them
+_FITS = {"f": "iuf", "i": "ui", "u": "u", "b": "b", "U": "U"}
+
+
+def _python(value):
+    """
+    Converts numpy scalars read from a column back to Python objects
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class AttributeTable:
+    """
+    Attributes of a collection of vertices or edges, stored by column: one
+    typed numpy array per attribute, indexed by the row of the object.
+
+    Vertices and edges built from a table keep a light _Row object as their
+    data, so that v["name"] or e["weight"] read the columns, while
+    algorithms read the arrays directly.
+    """
+
+    def __init__(self, columns=None, hidden=()):
+        """
+        Parameters:
+            'columns' : dictionary attribute name -> array, of equal lengths
+            'hidden' : names of the columns that are stored as attributes
+                of the objects themselves (start, end and weight of an edge)
+                and are not part of their data dictionaries
+
+        self._unset : attribute name -> boolean array of the rows without a
+            value, for the columns created after the table or given with
+            missing values
+        self.objects : the vertices or edges of the rows, when known
+        """
+        columns = columns or dict()
+        self._columns = {k: np.asarray(c) for (k, c) in columns.items()}
+        self._size = len(next(iter(self._columns.values()), ()))
+        if any(len(c) != self._size for c in self._columns.values()):
+            raise Exception("The columns of a table must have equal lengths")
+        self._hidden = frozenset(hidden)
+        self._unset = dict()
+        self.objects = None
+
+    def __len__(self):
+        """
+        Number of rows of the table
+        """
+        return self._size
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    def __getitem__(self, name):
+        """
+        Returns the array of the attribute 'name', indexed by row
+        """
+        return self._columns[name]
+
+    def __str__(self):
+        return "AttributeTable(" + ", ".join(
+            "{}: {}".format(k, c.dtype) for (k, c) in self._columns.items()) \
+            + ")"
+
+    def __getstate__(self):
+        """
+        The objects of the rows are not pickled: a graph sets them back
+        when it is unpickled with its table
+        """
+        state = dict(self.__dict__)
+        state["objects"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # arrays read from read-only buffers (shared memory) are copied,
+        # since set_value writes into them
+        for arrays in (self._columns, self._unset):
+            for (k, c) in arrays.items():
+                if not c.flags.writeable:
+                    arrays[k] = c.copy()
+
+    def names(self):
+        """
+        Returns:
+            The list of the attribute names
+        """
+        return list(self._columns)
+
+    def row(self, i: int):
+        """
+        Returns:
+            A dictionary-like view of the attributes of the row i
+        """
+        return _Row(self, i)
+
+    def has_value(self, i: int, name) -> bool:
+        if name not in self._columns or name in self._hidden:
+            return False
+        unset = self._unset.get(name)
+        return unset is None or not unset[i]
+
+    def get_value(self, i: int, name):
+        if not self.has_value(i, name):
+            raise KeyError(name)
+        return _python(self._columns[name][i])
+
+    def set_value(self, i: int, name, value) -> None:
+        """
+        Sets the attribute 'name' of the row i. A new attribute creates a
+        column. A value that does not fit the type of the column widens it
+        when the other rows keep their values (longer strings, larger
+        integers, ...). Otherwise the column becomes an object column
+        holding the Python value of every row, so that a string weight
+        does not turn the other weights into strings.
+        """
+        column = self._columns.get(name)
+        if isinstance(value, (list, tuple, set, dict)):
+            # containers are stored as objects, never spread over the row
+            value_type = np.dtype(object)
+        else:
+            value_type = np.asarray(value).dtype
+        if column is None:
+            column = np.full(self._size, _FILL.get(value_type.kind, None),
+                             dtype=value_type if value_type.kind in _FILL
+                             else object)
+            self._unset[name] = np.ones(self._size, dtype=bool)
+        elif column.dtype != object:
+            kind = column.dtype.kind
+            try:
+                widened = np.promote_types(column.dtype, value_type)
+            except TypeError:
+                widened = np.dtype(object)
+            if value_type.kind not in _FITS[kind] or widened.kind != kind:
+                widened = np.dtype(object)
+            if widened == object:
+                values = column.tolist()
+                column = np.empty(len(values), dtype=object)
+                column[:] = values
+            elif widened != column.dtype:
+                column = column.astype(widened)
+        self._columns[name] = column
+        column[i] = value
+        if name in self._unset:
+            self._unset[name][i] = False
+
+    def select(self, name, predicate):
+        """
+        Finds the rows whose attribute 'name' satisfies a predicate, the
+        predicate being applied once on the whole column.
+
+        Parameters:
+            'name' : an attribute name
+            'predicate' : a function array -> boolean array, such as
+                lambda x: x > 5
+
+        Returns:
+            The array of the selected rows
+        """
+        mask = np.asarray(predicate(self._columns[name]), dtype=bool)
+        if name in self._unset:
+            mask &= ~self._unset[name]
+        return np.flatnonzero(mask)
+
+
+class _Row:
+    """
+    The attributes of one row of an AttributeTable, behaving as the data
+    dictionary of a vertex or an edge
+    """
+    __slots__ = ("table", "index")
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, key):
+        return self.table.get_value(self.index, key)
+
+    def __setitem__(self, key, value):
+        self.table.set_value(self.index, key, value)
+
+    def __contains__(self, key):
+        return self.table.has_value(self.index, key)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __eq__(self, other):
+        if isinstance(other, (_Row, dict)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def keys(self):
+        return dict.fromkeys(k for k in self.table.names() if k in self).keys()
+
+    def values(self):
+        return [self[k] for k in self.keys()]
+
+    def items(self):
+        return [(k, self[k]) for k in self.keys()]
+
+
+def vertex_table(columns):
+    """
+    Builds the table of the vertex attributes read from a data file and
+    one Vertex per row, whose data is a row of the table.
+
+    Parameters:
+        'columns' : dictionary attribute name -> array, with an 'id' column
+
+    Returns:
+        The AttributeTable and the list of the Vertex objects, in the order
+        of the rows
+    """
+    if "name" not in columns:
+        columns = dict(columns, name=columns["id"].astype(str))
+    table = AttributeTable(columns)
+    vertices = []
+    for (i, id) in enumerate(columns["id"].tolist()):
+        v = Vertex(id)
+        v._data = table.row(i)
+        vertices.append(v)
+    table.objects = vertices
+    return table, vertices
+
+
+def edge_table(columns, oriented: bool = True):
+    """
+    Builds the table of the edge attributes read from a data file and one
+    Edge per row, whose additional data is a row of the table.
+
+    Parameters:
+        'columns' : dictionary attribute name -> array, with 'start' and
+            'end' columns
+        'oriented' : orientation of the Edge objects
+
+    Returns:
+        The AttributeTable and a dictionary (start, end) -> list of Edge
+        objects, as parse_edge_data
+    """
+    table = AttributeTable(columns, hidden=("start", "end", "weight"))
+    weights = columns["weight"].tolist() if "weight" in columns else None
+    edges = dict()
+    table.objects = []
+    for (i, (a, b)) in enumerate(zip(columns["start"].tolist(),
+                                     columns["end"].tolist())):
+        e = Edge(a, b, oriented=oriented)
+        if weights is not None:
+            e.weight = weights[i]
+        e._data = table.row(i)
+        table.objects.append(e)
+        if (a, b) in edges:
+            edges[(a, b)].append(e)
+        else:
+            edges[(a, b)] = [e]
+    return table, edges
+
+
+def array_edge_table(starts, ends, weights=None, data=None):
+    """
+    Builds the table of edges given as arrays, without any Edge object.
+    A graph keeps it in place of its edge dictionary until an Edge is
+    needed, see table_edges.
+
+    Parameters:
+        'starts', 'ends' : arrays of the vertex ids of the ends of the edges
+        'weights' : array of the weights of the edges, or None
+        'data' : dictionary attribute name -> array of the values, or
+            None. The masked rows of a numpy masked array have no value
+
+    Returns:
+        An AttributeTable whose start, end and weight columns are hidden
+    """
+    columns = {"start": starts, "end": ends}
+    if weights is not None:
+        columns["weight"] = weights
+    unset = dict()
+    for (name, column) in (data or dict()).items():
+        if np.ma.isMaskedArray(column):
+            unset[name] = np.ma.getmaskarray(column)
+            column = column.data
+        columns[name] = np.asarray(column)
+    table = AttributeTable(columns, hidden=("start", "end", "weight"))
+    table._unset = unset
+    return table
+
+
+def table_edges(table, vertices, oriented: bool = False,
+                multiple: bool = False):
+    """
+    Builds the Edge objects of a table made by array_edge_table. When the
+    table has attribute columns, the data of an edge is its row.
+
+    Parameters:
+        'table' : the AttributeTable of the edges
+        'vertices' : dictionary id -> Vertex of the graph. The rows of
+            the other ids are skipped
+        'oriented' : orientation of the Edge objects
+        'multiple' : True to build the edge lists of a MultiGraph
+
+    Returns:
+        The (Vertex, Vertex) -> Edge dictionary of the graph, or
+        (Vertex, Vertex) -> list of Edge objects if 'multiple' is True.
+        Non-oriented edges are stored under both keys
+    """
+    weights = table["weight"].tolist() if "weight" in table else None
+    with_data = any(name not in ("start", "end", "weight")
+                    for name in table.names())
+    edges = dict()
+    objects = [None] * len(table)
+    for (i, (a, b)) in enumerate(zip(table["start"].tolist(),
+                                     table["end"].tolist())):
+        a, b = vertices.get(a), vertices.get(b)
+        if a is None or b is None:
+            # the edges of a vertex removed from the graph are dropped
+            continue
+        e = Edge(a, b, oriented=oriented)
+        if weights is not None:
+            e.weight = weights[i]
+        if with_data:
+            e._data = table.row(i)
+            objects[i] = e
+        for key in ((a, b),) if oriented or a == b else ((a, b), (b, a)):
+            if not multiple:
+                edges[key] = e
+            elif key in edges:
+                edges[key].append(e)
+            else:
+                edges[key] = [e]
+    if with_data:
+        table.objects = objects
+    return edges
+
+
+def load_vertex_data(filename: str):
+    """
+    Reads a vertex data file into an AttributeTable.
+
+    Returns:
+        The list of Vertex objects L where L[i] is the object of id i, as
+        parse_node_data, their data being the rows of the table
+    """
+    return vertex_table(parse_node_data(filename, columnar=True))[1]
+
+
+def load_edge_data(filename: str, oriented: bool = True):
+    """
+    Reads an edge data file into an AttributeTable.
+
+    Returns:
+        A dictionary (start, end) -> list of Edge objects, as
+        parse_edge_data, their data being the rows of the table
+    """
+    return edge_table(parse_edge_data(filename, columnar=True), oriented)[1]
+
+
+def _table_of(objects):
+    """
+    The AttributeTable backing the data of a list of vertices or of a
+    dictionary of edge lists, or None
+    """
+    if isinstance(objects, dict):
+        objects = next(iter(objects.values()), [])
+    for o in objects:
+        if isinstance(o._data, _Row):
+            return o._data.table
+    return None
+
+
+def attach_tables(graph, vertex_data=None, edge_data=None):
+    """
+    Keeps the attribute tables of the data loaded with load_vertex_data and
+    load_edge_data in the graph built from them.
+
+    Returns:
+        The graph
+    """
+    if vertex_data is not None:
+        graph._vertex_table = _table_of(vertex_data)
+    if edge_data is not None:
+        graph._edge_table = _table_of(edge_data)
+    return graph
+
+
+def attach_edge_arrays(graph, starts, ends, index, weights=None, data=None):
+    """
+    Keeps the weights and data given to from_edge_array in the table of
+    the edges of the graph built from them. The table stands for the edge
+    dictionary of the graph until an Edge is needed, and is also its edge
+    table when it holds data.
+
+    Parameters:
+        'starts', 'ends' : arrays of the vertex ids of the ends of the edges
+        'index' : array of the rows of 'weights' and 'data' of the edges
+        'weights' : array-like of the weights, or None
+        'data' : dictionary attribute name -> array-like, or None
+
+    Returns:
+        The graph
+    """
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64)[index]
+    columns = dict()
+    for (name, column) in (data or dict()).items():
+        if not np.ma.isMaskedArray(column):
+            column = np.asarray(column)
+        columns[name] = column[index]
+    table = array_edge_table(starts, ends, weights, columns)
+    graph._lazy_edges = table
+    if columns:
+        graph._edge_table = table
+    return graph
+
+
+def weight_reader(graph, weight="weight"):
+    """
+    Builds the function reading the length of the edges for the algorithms
+    taking a 'weight' argument.
+
+    Parameters:
+        'graph' : the graph the edges belong to
+        'weight' : None to give a length of 1 to every edge, "weight" for
+            the weight of the edges, or the name of another edge attribute,
+            read in the attribute table of the graph when there is one
+
+    Returns:
+        A function Edge -> number
+    """
+    if weight is None:
+        return lambda e: 1
+    if weight == "weight":
+        return lambda e: e.weight
+    table = getattr(graph, "_edge_table", None)
+    if table is not None and weight in table:
+        column = table[weight].tolist()
+
+        def read(e):
+            data = e._data
+            if isinstance(data, _Row) and data.table is table:
+                return column[data.index]
+            return e[weight]
+        return read
+    return lambda e: e[weight]
+
+
+def check_frozen_weight(weight) -> None:
+    """
+    A FrozenGraph only stores the "weight" attribute of the edges
+    """
+    if weight is not None and weight != "weight":
+        raise Exception("A FrozenGraph only stores the weight of the edges, "
+                        "not "+str(weight))
+
+
+def frozen_edge_lengths(graph, weight="weight"):
+    """
+    The edge arrays of a FrozenGraph, for the algorithms taking a 'weight'
+    argument
+
+    Returns:
+        The (rows, cols, lengths) arrays of the stored edges, the lengths
+        being 1 when 'weight' is None or the graph is not weighted
+    """
+    check_frozen_weight(weight)
+    rows, cols, weights = graph.edge_arrays()
+    if weight is None or weights is None:
+        weights = np.ones(len(cols), dtype=np.float64)
+    return rows, cols, weights
@@ -0,0 +1,179 @@
+import json
+import numpy as np
+
+# Layout of a binary graph file:
+#   MAGIC (8 bytes) | header length (uint64, little endian) | JSON header
+#   | arrays, each starting on a multiple of ALIGNMENT bytes
+# Array offsets in the header are relative to the end of the padded header.
+MAGIC = b"GRAPHTL\x00"
+VERSION = 1
+ALIGNMENT = 64
+
+_STRUCTURE = ("ids", "offsets", "targets", "weights",
+              "offsets_in", "targets_in", "weights_in")
+
+
+def _align(n: int) -> int:
+    return -(-n // ALIGNMENT) * ALIGNMENT
+
+
+def vertex_columns(vertices):
+    """
+    Gathers the data of the vertices into one array per attribute.
+    Only scalar attributes (booleans, numbers and strings) set on every
+    vertex are kept. The others, such as lists or dictionaries, are not
+    saved.
+
+    Parameters
+    ----------
+        'vertices' : list of Vertex objects, in index order
+
+    Returns
+    -------
+        A dictionary attribute name -> numpy array
+    """
+    if len(vertices) == 0 or any(v._data is None for v in vertices):
+        return dict()
+    keys = set(vertices[0]._data)
+    for v in vertices:
+        keys &= v._data.keys()
+    columns = dict()
+    for key in sorted(keys):
+        column = _column(vertices, key)
+        if column is not None:
+            columns[key] = column
+    return columns
+
+
+def edge_columns(edges):
+    """
+    Gathers the data of the edges into one array per attribute. Unlike
+    vertex_columns, an attribute that cannot be written raises instead of
+    being dropped.
+
+    Parameters
+    ----------
+        'edges' : list of the Edge objects of the stored (start, end)
+            pairs, in CSR order, None standing for an edge without data
+
+    Returns
+    -------
+        A dictionary attribute name -> numpy array
+    """
+    keys = set()
+    for e in edges:
+        if e is not None and e._data is not None:
+            keys.update(e._data.keys())
+    columns = dict()
+    for key in sorted(keys):
+        if any(e is None or e._data is None or key not in e._data
+               for e in edges):
+            raise Exception("Cannot save the edge attribute {}: it is not "
+                            "set on every edge".format(key))
+        column = _column(edges, key)
+        if column is None:
+            raise Exception("Cannot save the edge attribute {}: only "
+                            "booleans, numbers and strings are saved"
+                            .format(key))
+        columns[key] = column
+    return columns
+
+
+def _column(objects, key):
+    """
+    The values of an attribute as a one dimensional array of booleans,
+    numbers or strings, or None if they do not fit in one
+    """
+    try:
+        column = np.asarray([o._data[key] for o in objects])
+    except ValueError:  # lists of different lengths
+        return None
+    if column.dtype.kind in "biufU" and column.ndim == 1:
+        return column
+    return None
+
+
+def write_binary(filename: str, graph, attributes=None) -> None:
+    """
+    Writes a FrozenGraph, its vertex attribute columns and its edge
+    attribute columns to a binary file.
+
+    Parameters
+    ----------
+        'filename' : path of the file to write
+        'graph' : a FrozenGraph
+        'attributes' : dictionary attribute name -> array aligned on the
+            vertex ids, or None
+    """
+    arrays = dict()
+    for name in _STRUCTURE:
+        array = getattr(graph, "_" + name)
+        if array is not None:
+            arrays[name] = np.ascontiguousarray(array)
+    for (key, column) in (attributes or dict()).items():
+        arrays["attribute:" + key] = np.ascontiguousarray(column)
+    for (key, column) in graph.edge_attributes.items():
+        arrays["edge_attribute:" + key] = np.ascontiguousarray(column)
+    entries = dict()
+    position = 0
+    for (name, array) in arrays.items():
+        entries[name] = {"dtype": array.dtype.str,
+                         "shape": list(array.shape),
+                         "offset": position}
+        position = _align(position + array.nbytes)
+    header = json.dumps({"version": VERSION,
+                         "oriented": graph.oriented,
+                         "multiple": graph.multiple,
+                         "arrays": entries}).encode()
+    start = _align(len(MAGIC) + 8 + len(header))
+    with open(filename, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.uint64(len(header)).astype("<u8").tobytes())
+        f.write(header)
+        for (name, array) in arrays.items():
+            f.seek(start + entries[name]["offset"])
+            f.write(array.tobytes())
+        f.truncate(start + position)
+
+
+def read_binary(filename: str, mmap: bool = True):
+    """
+    Reads a binary graph file written by write_binary.
+
+    Parameters
+    ----------
+        'filename' : path of the file to read
+        'mmap' : bool
+            If True, the arrays are read-only numpy.memmap objects sharing
+            the pages of the file. Otherwise, they are read into memory
+
+    Returns
+    -------
+        A pair (header, arrays) where arrays maps the names of the arrays to
+        numpy arrays
+    """
+    with open(filename, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise Exception("Not a binary graph file: "+filename)
+        size = int(np.frombuffer(f.read(8), dtype="<u8")[0])
+        header = json.loads(f.read(size).decode())
+        if header["version"] > VERSION:
+            raise Exception("Unsupported binary graph version {}"
+                            .format(header["version"]))
+        start = _align(len(MAGIC) + 8 + size)
+        arrays = dict()
+        for (name, entry) in header["arrays"].items():
+            dtype = np.dtype(entry["dtype"])
+            shape = tuple(entry["shape"])
+            offset = start + entry["offset"]
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            elif mmap:
+                arrays[name] = np.memmap(filename, dtype=dtype, mode="r",
+                                         offset=offset, shape=shape)
+            else:
+                f.seek(offset)
+                count = int(np.prod(shape))
+                arrays[name] = np.fromfile(f, dtype=dtype,
+                                           count=count).reshape(shape)
+    return header, arrays
@@ -0,0 +1,56 @@
+from collections import OrderedDict
+
+
+class DerivedCache:
+    """
+    Memoizes data derived from a graph (edge set, adjacency matrix, degrees,
+    components, frozen copy...).
+
+    Each entry is stamped with the mutation epoch of the graph at which it was
+    computed, and is only returned while the graph is still at that epoch.
+    At most 'max_entries' entries are kept, the least recently used ones
+    being evicted first.
+    """
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, epoch: int, compute):
+        """
+        Returns the entry stored under 'key' if it was computed at 'epoch'.
+        Otherwise, calls compute() and stores its result.
+        """
+        entry = self._entries.get(key, None)
+        if entry is not None and entry[0] == epoch:
+            self._entries.move_to_end(key)
+            return entry[1]
+        value = compute()
+        self.put(key, epoch, value)
+        return value
+
+    def put(self, key, epoch: int, value) -> None:
+        """
+        Stores a value computed at 'epoch' under 'key'
+        """
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (epoch, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def evict(self, key=None) -> None:
+        """
+        Removes the entry stored under 'key', or every entry if key is None
+        """
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
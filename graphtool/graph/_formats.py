@@ -0,0 +1,327 @@
+import xml.etree.ElementTree as ET
+from array import array
+import numpy as np
+from .vertex_edge import Vertex
+from ._parsing import open_text, _file_chunks, read_edge_array
+
+
+def read_metis(filename: str, chunk_size: int = 1 << 24):
+    """
+    Reads a graph in the METIS format: a header 'n m [fmt [ncon]]' followed
+    by one line per vertex listing its neighbours, counted from 1. Every
+    chunk of lines is converted at once by numpy. Vertex sizes and weights
+    are skipped, except the first vertex weight.
+
+    Parameters:
+        'filename' : path of the file, possibly compressed (see open_text)
+        'chunk_size' : number of characters read at once
+
+    Returns:
+        The number n of vertices, the int64 rows and cols arrays of the
+        adjacency, with vertices counted from 0 and every edge listed in
+        both directions, the float64 array of the edge weights or None,
+        and the float64 array of the vertex weights or None
+    """
+    with open_text(filename) as f:
+        line = f.readline()
+        while line and (not line.strip() or line.lstrip()[0] == "%"):
+            line = f.readline()
+        header = [int(x) for x in line.split()]
+        if len(header) < 2:
+            raise Exception("Missing METIS header in "+filename)
+        n = header[0]
+        fmt = "{:03d}".format(header[2]) if len(header) > 2 else "000"
+        ncon = header[3] if len(header) > 3 else 1
+        has_size, has_vweights, has_eweights = (c == "1" for c in fmt)
+        skip = has_size + ncon*has_vweights
+        step = 2 if has_eweights else 1
+        parts = []
+        vertex = 0
+        for text in _file_chunks(f, chunk_size):
+            lines = [line for line in text.split("\n")
+                     if line.lstrip()[:1] != "%"]
+            counts = np.array([len(line.split()) for line in lines],
+                              dtype=np.int64)
+            if vertex + len(lines) > n:
+                if np.any(counts[n - vertex:] > 0):
+                    raise Exception("More than {} vertices in {}"
+                                    .format(n, filename))
+                lines, counts = lines[:n - vertex], counts[:n - vertex]
+            values = np.fromstring(" ".join(lines), dtype=np.float64,
+                                   sep=" ")
+            if len(values) != counts.sum() or np.any((counts - skip) < 0) \
+                    or np.any((counts - skip) % step):
+                raise Exception("Malformed METIS line in "+filename)
+            heads = np.repeat(np.arange(vertex, vertex + len(lines)), counts)
+            starts = np.repeat(np.cumsum(counts) - counts, counts)
+            position = np.arange(len(values)) - starts
+            neighbour = (position >= skip) & ((position - skip) % step == 0)
+            part = [heads[neighbour], values[neighbour].astype(np.int64) - 1]
+            part.append(values[np.flatnonzero(neighbour) + 1]
+                        if has_eweights else None)
+            part.append(values[np.cumsum(counts) - counts + has_size]
+                        if has_vweights else None)
+            parts.append(part)
+            vertex += len(lines)
+    if not parts:
+        empty = np.empty(0, dtype=np.int64)
+        parts = [[empty, empty, None, None]]
+
+    def gather(k):
+        if parts[0][k] is None:
+            return None
+        return np.concatenate([p[k] for p in parts])
+    rows, cols, weights, vweights = (gather(k) for k in range(4))
+    if vweights is not None and len(vweights) < n:
+        vweights = np.concatenate((vweights, np.zeros(n - len(vweights))))
+    return n, rows, cols, weights, vweights
+
+
+def read_snap(filename: str):
+    """
+    Reads a SNAP edge list: '#' comment lines, among which a header giving
+    the orientation and the numbers of nodes and edges, followed by one
+    'from to' line per edge.
+
+    Returns:
+        The int64 array of shape (m, 2) of the edges, and the header as a
+        dictionary with the keys 'directed', 'nodes' and 'edges' (None when
+        not given)
+    """
+    info = {"directed": None, "nodes": None, "edges": None}
+    with open_text(filename) as f:
+        for line in f:
+            if not line.startswith("#"):
+                break
+            words = line[1:].replace(":", " ").split()
+            kind = words[0].lower() if words else ""
+            if kind in ("directed", "undirected"):
+                info["directed"] = kind == "directed"
+            for key in ("Nodes", "Edges"):
+                if key in words[:-1]:
+                    info[key.lower()] = int(words[words.index(key) + 1])
+    arr, _ = read_edge_array(filename, comments="#")
+    if info["edges"] is not None and info["edges"] != len(arr):
+        raise Exception("Expected {} edges in {}"
+                        .format(info["edges"], filename))
+    return arr, info
+
+
+def read_dimacs(filename: str, chunk_size: int = 1 << 24):
+    """
+    Reads a graph of the DIMACS shortest path challenge (.gr): 'c' comment
+    lines, a 'p sp n m' problem line and 'a u v w' arcs with vertices
+    counted from 1. Every chunk of arcs is converted at once by numpy.
+
+    Returns:
+        The number n of vertices, the int64 array of shape (m, 2) of the
+        arcs and the float64 array of their weights
+    """
+    n, m = None, None
+    tables = []
+    with open_text(filename) as f:
+        for text in _file_chunks(f, chunk_size):
+            arcs = []
+            for line in text.split("\n"):
+                kind = line[:1]
+                if kind == "a":
+                    arcs.append(line[1:])
+                elif kind == "p":
+                    _, _, n, m = line.split()
+                    n, m = int(n), int(m)
+                elif kind not in ("c", "", "\r"):
+                    raise Exception("Unknown DIMACS line in "+filename)
+            values = np.fromstring(" ".join(arcs), dtype=np.float64, sep=" ")
+            if len(values) % 3 != 0:
+                raise Exception("Malformed DIMACS arc in "+filename)
+            tables.append(values.reshape(-1, 3))
+    if n is None:
+        raise Exception("Missing DIMACS problem line in "+filename)
+    table = np.concatenate(tables) if tables else np.empty((0, 3))
+    if len(table) != m:
+        raise Exception("Expected {} arcs in {}".format(m, filename))
+    return n, table[:, :2].astype(np.int64), table[:, 2].copy()
+
+
+def _tag(elem):
+    return elem.tag.rsplit("}", 1)[-1]
+
+
+_GRAPHML_TYPES = {
+    "boolean": lambda x: x.strip().lower() in ("true", "1"),
+    "int": int,
+    "long": int,
+    "float": float,
+    "double": float,
+    "string": str,
+}
+
+
+def iter_graphml(filename: str):
+    """
+    Streams a GraphML file with iterparse. Every node or edge element is
+    detached from the tree once read, so that memory stays
+    bounded whatever the size of the file. The attributes declared by
+    <key> elements are converted to their declared types, defaults
+    included.
+
+    Vertices are numbered from 0 in their order of appearance, and the
+    GraphML id of a vertex is kept as its "name" unless a "name" attribute
+    is given.
+
+    Returns:
+        An iterator over ("node", Vertex) and ("edge", start, end, directed,
+        data) items, start and end being Vertex objects
+    """
+    keys = dict()
+    defaults = {"node": dict(), "edge": dict()}
+    vertices = dict()
+    tags = dict()
+    directed = False
+    graph = None
+
+    def vertex(name):
+        v = vertices.get(name)
+        if v is None:
+            v = vertices[name] = Vertex(len(vertices))
+        return v
+
+    def data(elem, domain):
+        d = dict(defaults[domain])
+        for child in elem:
+            if _tag(child) == "data" and child.get("key") in keys:
+                name, convert = keys[child.get("key")]
+                d[name] = convert(child.text or "")
+        return d
+
+    with open_text(filename) as f:
+        for (event, elem) in ET.iterparse(f, events=("start", "end")):
+            tag = tags.get(elem.tag)
+            if tag is None:
+                tag = tags[elem.tag] = _tag(elem)
+            if event == "start":
+                if tag == "graph" and graph is None:
+                    graph = elem
+                    directed = elem.get("edgedefault") == "directed"
+                continue
+            if tag == "node":
+                v = vertex(elem.get("id"))
+                d = data(elem, "node")
+                d.setdefault("name", elem.get("id"))
+                v.data = d
+                yield ("node", v)
+            elif tag == "edge":
+                oriented = elem.get("directed")
+                oriented = directed if oriented is None \
+                    else oriented == "true"
+                yield ("edge", vertex(elem.get("source")),
+                       vertex(elem.get("target")), oriented,
+                       data(elem, "edge"))
+            elif tag == "key":
+                convert = _GRAPHML_TYPES.get(elem.get("attr.type", "string"),
+                                             str)
+                name = elem.get("attr.name", elem.get("id"))
+                keys[elem.get("id")] = (name, convert)
+                for child in elem:
+                    if _tag(child) == "default":
+                        for domain in defaults:
+                            if elem.get("for", "all") in (domain, "all"):
+                                defaults[domain][name] = convert(
+                                    child.text or "")
+                continue
+            else:
+                continue
+            # the elements read so far are dropped from the tree
+            if graph is not None:
+                del graph[:]
+
+
+def _masked_column(values):
+    """
+    Converts the values of an attribute, None for the edges without a
+    value, into an array masked on these edges
+    """
+    missing = np.fromiter((x is None for x in values), dtype=bool,
+                          count=len(values))
+    if not missing.any():
+        return np.asarray(values)
+    fill = values[int(np.argmin(missing))]
+    column = np.asarray([fill if x is None else x for x in values])
+    return np.ma.array(column, mask=missing)
+
+
+def load_graphml(cls, filename: str, oriented: bool = False):
+    """
+    Builds a graph from a GraphML file. The ends and the attributes of the
+    edges are gathered in arrays and given to from_edge_array, the
+    "weight" attribute being the weights, so that no Edge is built while
+    loading.
+
+    Parameters:
+        'cls' : the class Graph, OrientedGraph or MultiGraph
+        'filename' : path of the file, possibly compressed (see open_text)
+        'oriented' : True for an OrientedGraph, whose undirected GraphML
+            edges are added in both directions
+
+    Returns:
+        A new graph of class 'cls'
+    """
+    vertices = []
+    ends = array("q")
+    undirected = array("b")
+    values = dict()
+    m = 0
+    for item in iter_graphml(filename):
+        if item[0] == "node":
+            vertices.append(item[1])
+            continue
+        _, a, b, directed, d = item
+        ends.append(a.id)
+        ends.append(b.id)
+        undirected.append(not directed)
+        for (name, value) in d.items():
+            if name not in values:
+                values[name] = [None] * m
+            values[name].append(value)
+        m += 1
+        for column in values.values():
+            if len(column) < m:
+                column.append(None)
+    arr = np.frombuffer(ends, dtype=np.int64).reshape(-1, 2)
+    data = {name: _masked_column(column) for (name, column) in values.items()}
+    weights = data.pop("weight", None)
+    if weights is not None:
+        weights = np.ma.filled(weights, 1)
+    if oriented:
+        back = np.flatnonzero(np.frombuffer(undirected, dtype=np.int8))
+        index = np.concatenate((np.arange(m), back))
+        arr = np.concatenate((arr, arr[back, ::-1]))
+        if weights is not None:
+            weights = weights[index]
+        data = {name: column[index] for (name, column) in data.items()}
+    graph = cls.from_edge_array(arr, weights, data)
+    # the vertices keep their GraphML data, and the isolated ones are added
+    named = {v.id: v for v in vertices}
+    for v in graph.vertices():
+        if v.id in named:
+            v.data = named[v.id].data
+    graph.add_vertices_from(vertices)
+    return graph
+
+
+def add_vertex_range(graph, ids, weights=None):
+    """
+    Adds the vertices 'ids' that have no edge to a graph read from a file
+    declaring its number of vertices, and stores the vertex weights as
+    their "weight" attribute.
+
+    Returns:
+        The graph
+    """
+    graph.add_vertices_from(ids)
+    if weights is not None:
+        weights = weights.tolist()
+        first = ids[0] if len(ids) else 0
+        for v in graph.vertices():
+            v["weight"] = weights[v.id - first]
+    return graph
@@ -0,0 +1,90 @@
+import numpy as np
+from collections import Counter
+
+
+def _edge_value(edge, weight):
+    try:
+        return edge[weight]
+    except KeyError:
+        return 1
+
+
+def adjacency_entries(adj, edges=None, weight=None, multiple=False):
+    """
+    Lists the non-zero entries of the adjacency matrix of a graph stored as
+    an adjacency dictionary. Rows follow the order of the sorted vertices.
+
+    Parameters
+    ----------
+        'adj' : dict
+            Vertex -> container of neighbours
+        'edges' : dict or None
+            (Vertex, Vertex) -> Edge (or list of Edge for multigraphs)
+        'weight' : str or None
+            Name of the edge attribute used as value. Edges without this
+            attribute, or a None weight, count as 1
+        'multiple' : bool
+            If True, the value of an entry is the sum over the multiple edges
+
+    Returns
+    -------
+        The Vertex -> row index dictionary, and the rows, cols and values
+        lists of the entries
+    """
+    vertices = sorted(adj)
+    index = {v: i for (i, v) in enumerate(vertices)}
+    rows, cols, vals = [], [], []
+    for v in vertices:
+        i = index[v]
+        if multiple:
+            neighbours = Counter(adj[v]).items()
+        else:
+            neighbours = ((u, 1) for u in adj[v])
+        for (u, k) in neighbours:
+            val = k
+            if weight is not None and edges is not None:
+                e = edges.get((v, u), None)
+                if e is not None and multiple:
+                    val = sum(_edge_value(x, weight) for x in e[:k])
+                    val += k - len(e[:k])
+                elif e is not None:
+                    val = _edge_value(e, weight)
+            rows.append(i)
+            cols.append(index[u])
+            vals.append(val)
+    return index, rows, cols, vals
+
+
+def build_matrix(n: int, rows, cols, vals, format: str, dtype=None):
+    """
+    Assembles matrix entries into a numpy array or a scipy sparse matrix.
+    Duplicate entries are summed.
+
+    Parameters
+    ----------
+        'n' : int
+            Size of the square matrix
+        'rows', 'cols', 'vals' : containers
+            Coordinates and values of the entries
+        'format' : "dense", "csr" or "coo"
+        'dtype' : numpy dtype or None to infer it from the values
+    """
+    vals = np.asarray(vals, dtype=dtype)
+    if len(vals) == 0 and dtype is None:
+        vals = vals.astype(np.int64)
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    if format == "dense":
+        matrix = np.zeros((n, n), dtype=vals.dtype)
+        np.add.at(matrix, (rows, cols), vals)
+        return matrix
+    if format not in ("csr", "coo"):
+        raise Exception("Unknown matrix format: "+str(format))
+    try:
+        from scipy import sparse
+    except ImportError:
+        raise ImportError("scipy is needed for sparse adjacency matrices")
+    matrix = sparse.coo_matrix((vals, (rows, cols)), shape=(n, n))
+    if format == "csr":
+        return matrix.tocsr()
+    return matrix
@@ -0,0 +1,202 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from ._parsing import parse_edge_text
+
+COMPRESSED = (".gz", ".bz2", ".xz", ".zst")
+
+
+def split_lines(filename: str, parts: int):
+    """
+    Cuts a file into at most 'parts' byte ranges of similar sizes, each
+    range starting and ending on a line boundary.
+
+    Returns
+    -------
+        A list of (start, end) byte offsets
+    """
+    size = os.path.getsize(filename)
+    bounds = [0]
+    with open(filename, "rb") as f:
+        for k in range(1, parts):
+            f.seek(max(size*k // parts, bounds[-1]))
+            f.readline()
+            bounds.append(min(max(f.tell(), bounds[-1]), size))
+    bounds.append(size)
+    return [(a, b) for (a, b) in zip(bounds[:-1], bounds[1:]) if a < b]
+
+
+def _range_chunks(filename: str, start: int, end: int,
+                  chunk_size: int = 1 << 24):
+    """
+    Reads the bytes [start, end) of a file by chunks of complete lines
+    """
+    with open(filename, "rb") as f:
+        f.seek(start)
+        tail = b""
+        while start < end:
+            chunk = f.read(min(chunk_size, end - start))
+            if not chunk:
+                break
+            start += len(chunk)
+            cut = chunk.rfind(b"\n")
+            if cut == -1:
+                tail += chunk
+                continue
+            yield (tail + chunk[:cut]).decode()
+            tail = chunk[cut+1:]
+        if tail:
+            yield tail.decode()
+
+
+def map_ranges(function, filename: str, workers: int, *args):
+    """
+    Applies function(filename, start, end, *args) on the line ranges of a
+    file in 'workers' processes. The workers only send numpy arrays back.
+
+    Returns
+    -------
+        The list of the results, in the order of the file
+    """
+    if filename.endswith(COMPRESSED):
+        raise Exception("Parallel parsing needs an uncompressed file: "
+                        + filename)
+    ranges = split_lines(filename, workers)
+    calls = [(filename, a, b) + args for (a, b) in ranges]
+    if len(calls) <= 1:
+        return [function(*call) for call in calls]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, *zip(*calls)))
+
+
+def edge_range(filename, start, end, delimiter, comments, weighted):
+    """
+    Worker parsing a range of an edge list with parse_edge_text
+    """
+    width = 3 if weighted else 2
+    tables = [parse_edge_text(text, delimiter, comments, weighted, filename)
+              for text in _range_chunks(filename, start, end)]
+    if not tables:
+        return np.empty((0, width))
+    return np.concatenate(tables)
+
+
+def adjacency_range(filename, start, end, comments):
+    """
+    Worker parsing a range of an adjacency list, one line per vertex
+    followed by its neighbours.
+
+    Returns
+    -------
+        The (rows, cols) arrays of the adjacency
+    """
+    rows, cols = [], []
+    for text in _range_chunks(filename, start, end):
+        for line in text.split("\n"):
+            line = line.strip()
+            if not line or line[0] in comments:
+                continue
+            ids = [int(x) for x in line.split()]
+            rows += [ids[0]]*(len(ids) - 1)
+            cols += ids[1:]
+    return np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)
+
+
+def matrix_range(filename, start, end):
+    """
+    Worker parsing a range of the rows of an adjacency matrix.
+
+    Returns
+    -------
+        The number of rows read, and the (rows, cols, values) arrays of the
+        non-zero entries, rows being counted from the start of the range
+    """
+    blocks = []
+    for text in _range_chunks(filename, start, end):
+        lines = [line for line in text.split("\n") if line.strip()]
+        if lines:
+            block = np.array([line.split() for line in lines],
+                             dtype=np.float64)
+            blocks.append(block)
+    if not blocks:
+        empty = np.empty(0, dtype=np.int64)
+        return 0, empty, empty, np.empty(0)
+    block = np.concatenate(blocks)
+    rows, cols = np.nonzero(block)
+    return len(block), rows, cols, block[rows, cols]
+
+
+def read_edge_array_parallel(filename: str, workers: int,
+                             delimiter: str = None, comments: str = "#%",
+                             weighted: bool = False):
+    """
+    Same as read_edge_array, with the file parsed by 'workers' processes
+
+    Returns
+    -------
+        A pair (edges, weights) as read_edge_array
+    """
+    parts = map_ranges(edge_range, filename, workers, delimiter, comments,
+                       weighted)
+    width = 3 if weighted else 2
+    table = np.concatenate(parts) if parts else np.empty((0, width))
+    if not weighted:
+        return table.astype(np.int64).reshape(-1, 2), None
+    return table[:, :2].astype(np.int64), table[:, 2].copy()
+
+
+def read_adjacency_parallel(filename: str, workers: int,
+                            comments: str = "#%"):
+    """
+    Parses an adjacency list with 'workers' processes
+
+    Returns
+    -------
+        The (rows, cols) arrays of adjacency_range for the whole file
+    """
+    parts = map_ranges(adjacency_range, filename, workers, comments)
+    if not parts:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    return tuple(np.concatenate(p) for p in zip(*parts))
+
+
+def read_matrix_parallel(filename: str, workers: int):
+    """
+    Parses an adjacency matrix with 'workers' processes
+
+    Returns
+    -------
+        The size n of the matrix and the (rows, cols, values) arrays of its
+        non-zero entries
+    """
+    parts = map_ranges(matrix_range, filename, workers)
+    n = 0
+    rows, cols, vals = [], [], []
+    for (size, r, c, v) in parts:
+        rows.append(r + n)
+        cols.append(c)
+        vals.append(v)
+        n += size
+    if n == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return 0, empty, empty, np.empty(0)
+    return n, np.concatenate(rows), np.concatenate(cols), np.concatenate(vals)
+
+
+def map_blocks(function, calls, workers: int):
+    """
+    Applies function(*call) on every call of 'calls' in 'workers'
+    processes. The blocks of work of the random generators are fixed by
+    the size of the problem and each carries its own random stream, so
+    that the results do not depend on the number of workers.
+
+    Returns
+    -------
+        The list of the results, in the order of 'calls'
+    """
+    calls = list(calls)
+    if workers <= 1 or len(calls) <= 1:
+        return [function(*call) for call in calls]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, *zip(*calls)))
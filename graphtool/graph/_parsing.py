@@ -1,71 +1,766 @@
+import bz2
 import csv
+import gzip
+import io
+import lzma
+import warnings
+from itertools import chain, islice
+import numpy as np
 from .vertex_edge import Vertex, Edge
 
 
-def parse_node_data(filename: str):
+def _is_pair_array(edges):
+    """
+    True for numpy arrays of shape (m, 2), which bulk methods handle without
+    going through individual edges
+    """
+    return (isinstance(edges, np.ndarray) and edges.ndim == 2
+            and edges.shape[1] == 2)
+
+
+class _VertexPool(dict):
+    """
+    id -> Vertex dictionary building each Vertex once, so that loaders share
+    a single object per vertex instead of one per occurrence
+    """
+
+    def __missing__(self, id):
+        v = self[id] = Vertex(id)
+        return v
+
+    def get_vertex(self, v):
+        """
+        Returns the shared Vertex object for a Vertex or a vertex id
+        """
+        if isinstance(v, Vertex):
+            return self.setdefault(v.id, v)
+        return self[v]
+
+
+def _edge_batch(edges):
+    """
+    Normalizes a batch of edges for the bulk mutation methods.
+
+    Parameters
+    ----------
+        'edges' : an iterable of Edge objects, (u, v) pairs or
+            (u, v, weight) triples, or a numpy array of shape (m, 2) or (m, 3)
+
+    Returns
+    -------
+        An iterator of (u, v, weight, edge) tuples where weight is None when
+        not given and edge is None unless an Edge object was provided
+    """
+    if isinstance(edges, np.ndarray):
+        if edges.ndim != 2 or edges.shape[1] not in (2, 3):
+            raise Exception("Expected an array of shape (m, 2) or (m, 3)")
+        starts = edges[:, 0].astype(np.int64).tolist()
+        ends = edges[:, 1].astype(np.int64).tolist()
+        if edges.shape[1] == 2:
+            return ((a, b, None, None) for (a, b) in zip(starts, ends))
+        weights = edges[:, 2].tolist()
+        return ((a, b, w, None) for (a, b, w) in zip(starts, ends, weights))
+    return (_edge_item(item) for item in edges)
+
+
+def _reusable(edges):
+    """
+    Edges that can be iterated over again: arrays are kept as they are and
+    other iterables are turned into lists
+    """
+    return edges if isinstance(edges, np.ndarray) else list(edges)
+
+
+def _adjacency_batches(rows, cols, pool):
+    """
+    Groups arrays of (row, col) vertex ids by row with a single sort.
+
+    Returns
+    -------
+        An iterator of (Vertex, list of neighbour Vertex) pairs, built from
+        the shared objects of 'pool'
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    order = np.argsort(rows, kind="stable")
+    rows, cols = rows[order], cols[order]
+    ids, starts = np.unique(rows, return_index=True)
+    neighbours = [pool[c] for c in cols.tolist()]
+    bounds = starts.tolist() + [len(neighbours)]
+    for (k, i) in enumerate(ids.tolist()):
+        yield pool[i], neighbours[bounds[k]:bounds[k+1]]
+
+
+def _edge_item(item):
+    if isinstance(item, Edge):
+        return item.start, item.end, None, item
+    if len(item) == 2:
+        return item[0], item[1], None, None
+    return item[0], item[1], item[2], None
+
+
+def open_text(filename: str):
+    """
+    Opens a text file for reading. Files ending with .gz, .bz2, .xz or .zst
+    are decompressed on the fly. Reading .zst files needs the optional
+    zstandard package.
+
+    Returns:
+        A text file object
+    """
+    if filename.endswith(".gz"):
+        return gzip.open(filename, "rt")
+    if filename.endswith(".bz2"):
+        return bz2.open(filename, "rt")
+    if filename.endswith(".xz"):
+        return lzma.open(filename, "rt")
+    if filename.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstandard is needed to read .zst files")
+        raw = open(filename, "rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(reader)
+    return open(filename, "r")
+
+
+def read_records(filename: str, delimiter: str = None,
+                 comments: str = "#%", chunk_size: int = 1 << 20):
+    """
+    Reads a text file by chunks of 'chunk_size' characters, so that the
+    whole file never sits in memory. Blank lines and lines starting with
+    one of the 'comments' characters are skipped.
+
+    Parameters:
+        'filename' : path of the file, possibly compressed (see open_text)
+        'delimiter' : separator of the fields, any whitespace if None
+        'comments' : characters starting a comment line
+        'chunk_size' : number of characters read at once
+
+    Returns:
+        An iterator over lists of records, one list per chunk. Each record
+        is the list of the fields of a line
+    """
+    for text in _read_chunks(filename, chunk_size):
+        records = []
+        for line in text.split("\n"):
+            line = line.strip()
+            if line and line[0] not in comments:
+                records.append(line.split(delimiter))
+        yield records
+
+
+def _read_chunks(filename: str, chunk_size: int):
+    """
+    Reads a text file by chunks of about 'chunk_size' characters, each
+    chunk ending at the end of a line
+    """
+    with open_text(filename) as f:
+        yield from _file_chunks(f, chunk_size)
+
+
+def _file_chunks(f, chunk_size: int):
+    """
+    Same as _read_chunks on an opened text file, from its current position
+    """
+    tail = ""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        end = chunk.rfind("\n")
+        if end == -1:
+            tail += chunk
+            continue
+        yield tail + chunk[:end]
+        tail = chunk[end+1:]
+    if tail:
+        yield tail
+
+
+def read_edge_array(filename: str, delimiter: str = None,
+                    comments: str = "#%", weighted: bool = False,
+                    chunk_size: int = 1 << 24):
+    """
+    Reads a numeric edge list into numpy arrays. Each chunk of the file is
+    converted at once by numpy instead of line by line.
+
+    Parameters:
+        'filename' : path of the file, possibly compressed (see open_text)
+        'delimiter' : separator of the fields, any whitespace if None
+        'comments' : characters starting a comment line
+        'weighted' : if True, the third field is read as the edge weight
+        'chunk_size' : number of characters read at once
+
+    Returns:
+        A pair (edges, weights) where edges is an int64 array of shape
+        (m, 2) and weights a float64 array of length m, or None if
+        'weighted' is False
+    """
+    width = 3 if weighted else 2
+    dtype = np.float64 if weighted else np.int64
+    parts = list(iter_edge_tables(filename, delimiter, comments, weighted,
+                                  chunk_size))
+    table = np.concatenate(parts) if parts else np.empty((0, width), dtype)
+    if not weighted:
+        return table, None
+    return table[:, :2].astype(np.int64), table[:, 2].copy()
+
+
+def iter_edge_tables(filename: str, delimiter: str = None,
+                     comments: str = "#%", weighted: bool = False,
+                     chunk_size: int = 1 << 24):
+    """
+    Same as read_edge_array, but yields the table of each chunk instead of
+    gathering the whole file.
+
+    Returns:
+        An iterator of int64 arrays of shape (m, 2), or float64 arrays of
+        shape (m, 3) with the weights in the last column if 'weighted'
+    """
+    for text in _read_chunks(filename, chunk_size):
+        yield parse_edge_text(text, delimiter, comments, weighted, filename)
+
+
+def parse_edge_text(text: str, delimiter: str = None, comments: str = "#%",
+                    weighted: bool = False, filename: str = ""):
+    """
+    Converts a block of complete lines of a numeric edge list into an array
+    with numpy.
+
+    Returns:
+        An int64 array of shape (m, 2), or a float64 array of shape (m, 3)
+        with the weights in the last column if 'weighted'
+    """
+    width = 3 if weighted else 2
+    dtype = np.float64 if weighted else np.int64
+    if any(c in text for c in comments):
+        text = "\n".join(line for line in text.split("\n")
+                         if line.strip()[:1] not in comments)
+    if delimiter is not None:
+        text = text.replace(delimiter, " ")
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", DeprecationWarning)
+            values = np.fromstring(text, dtype=dtype, sep=" ")
+    except (DeprecationWarning, ValueError):
+        raise Exception("Malformed line in edge list "+filename)
+    if len(values) % width != 0:
+        raise Exception("Expected {} columns in edge list {}"
+                        .format(width, filename))
+    return values.reshape(-1, width)
+
+
+def _nonzero_entries(block, first_row=0):
+    rows, cols = np.nonzero(block)
+    return rows + first_row, cols, block[rows, cols]
+
+
+def read_matrix_entries(m, chunk_size: int = 1 << 24):
+    """
+    Lists the non-zero entries of an adjacency matrix. Dense text files are
+    converted by numpy block by block, so that only the non-zero entries
+    are kept in memory.
+
+    Parameters:
+        'm' : path of a text file with one row of the matrix per line, of a
+            Matrix Market file (.mtx, possibly compressed), or a matrix as
+            a list of rows
+        'chunk_size' : number of characters read at once
+
+    Returns:
+        The size n of the square matrix, and the int64 rows and cols arrays
+        and the float64 values array of its non-zero entries
+    """
+    if not isinstance(m, str):
+        matrix = np.asarray(m, dtype=np.float64).reshape(len(m), -1)
+        return (len(matrix),) + _nonzero_entries(matrix)
+    if is_matrix_market(m):
+        return read_matrix_market(m, chunk_size)
+    n = None
+    parts = []
+    count = 0
+    for text in _read_chunks(m, chunk_size):
+        lines = [line for line in text.split("\n") if line.strip()]
+        if not lines:
+            continue
+        if n is None:
+            n = len(lines[0].split())
+        values = np.fromstring(" ".join(lines), dtype=np.float64, sep=" ")
+        if len(values) != n*len(lines):
+            raise Exception("Rows of different lengths in matrix "+m)
+        parts.append(_nonzero_entries(values.reshape(-1, n), count))
+        count += len(lines)
+    if n is not None and count != n:
+        raise Exception("Adjacency matrix {} is not square".format(m))
+    if not parts:
+        empty = np.empty(0, dtype=np.int64)
+        return 0, empty, empty, np.empty(0)
+    return (count,) + tuple(np.concatenate(p) for p in zip(*parts))
+
+
+def is_matrix_market(filename: str) -> bool:
+    """
+    Returns:
+        True if the name of the file ends with .mtx, possibly followed by
+        one of the compression suffixes read by open_text
+    """
+    for suffix in (".gz", ".bz2", ".xz", ".zst"):
+        if filename.endswith(suffix):
+            filename = filename[:-len(suffix)]
+            break
+    return filename.endswith(".mtx")
+
+
+def read_matrix_market(filename: str, chunk_size: int = 1 << 24):
+    """
+    Reads a Matrix Market file in coordinate format. Pattern, integer and
+    real fields are supported, with general, symmetric or skew-symmetric
+    storage. The entries are converted by numpy chunk by chunk.
+
+    Returns:
+        The size n of the square matrix, and the rows, cols and values
+        arrays of its entries, counted from 0. The mirrored entries of
+        symmetric matrices are included
+    """
+    with open_text(filename) as f:
+        header = f.readline().lower().split()
+        if len(header) != 5 or header[:2] != ["%%matrixmarket", "matrix"]:
+            raise Exception("Not a Matrix Market file: "+filename)
+        layout, field, symmetry = header[2:]
+        if layout != "coordinate" or field == "complex":
+            raise Exception("Only real coordinate Matrix Market files are "
+                            "supported: "+filename)
+        line = f.readline()
+        while line and (not line.strip() or line.startswith("%")):
+            line = f.readline()
+        nrows, ncols, nnz = (int(x) for x in line.split())
+        if nrows != ncols:
+            raise Exception("Adjacency matrix {} is not square"
+                            .format(filename))
+        width = 2 if field == "pattern" else 3
+        tables = [parse_edge_text(text, None, "%", width == 3, filename)
+                  for text in _file_chunks(f, chunk_size)]
+    table = np.concatenate(tables) if tables else np.empty((0, width))
+    if len(table) != nnz:
+        raise Exception("Expected {} entries in {}".format(nnz, filename))
+    rows = table[:, 0].astype(np.int64) - 1
+    cols = table[:, 1].astype(np.int64) - 1
+    vals = table[:, 2].astype(np.float64) if width == 3 else np.ones(nnz)
+    if symmetry != "general":
+        mirror = rows != cols
+        sign = -1 if symmetry == "skew-symmetric" else 1
+        rows, cols = (np.concatenate((rows, cols[mirror])),
+                      np.concatenate((cols, rows[mirror])))
+        vals = np.concatenate((vals, sign*vals[mirror]))
+    return nrows, rows, cols, vals
+
+
+def write_matrix_market(filename: str, n: int, rows, cols, vals,
+                        symmetric: bool = False) -> None:
+    """
+    Writes matrix entries, counted from 0, as a Matrix Market coordinate
+    file. Integer values are written in an integer field, other values in
+    a real field with repr.
+
+    Parameters:
+        'n' : size of the square matrix
+        'rows', 'cols', 'vals' : the entries. For a symmetric matrix, only
+            the entries of the lower triangle are to be given
+        'symmetric' : the symmetry written in the header
+    """
+    vals = np.asarray(vals)
+    if vals.dtype.kind == "b":
+        vals = vals.astype(np.int64)
+    integer = vals.dtype.kind in "iu"
+    header = "%%MatrixMarket matrix coordinate {} {}".format(
+        "integer" if integer else "real",
+        "symmetric" if symmetric else "general")
+    size = "{} {} {}".format(n, n, len(vals))
+    entry = "{} {} {}" if integer else "{} {} {!r}"
+    rows = (np.asarray(rows, dtype=np.int64) + 1).tolist()
+    cols = (np.asarray(cols, dtype=np.int64) + 1).tolist()
+    write_lines(filename, chain((header, size),
+                                map(entry.format, rows, cols, vals.tolist())))
+
+
+def _check_no_data(vertex_data, edge_data):
+    """
+    The bulk loaders build vertices from integer arrays, without attributes
+    """
+    if vertex_data is not None or edge_data is not None:
+        raise Exception("Vertex and edge data are not supported by the "
+                        "fast and parallel loaders")
+
+
+def _unique_index(rows, cols):
+    """
+    Sorts (row, col) pairs and drops the duplicates, keeping the last
+    occurrence of every pair.
+
+    Returns:
+        The array of the positions of the kept pairs, in sorted order
+    """
+    order = np.lexsort((cols, rows))
+    rows, cols = rows[order], cols[order]
+    last = np.ones(len(rows), dtype=bool)
+    last[:-1] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+    return order[last]
+
+
+def stream_edge_list(filename: str, vertex_data=None, delimiter: str = None,
+                     comments: str = "#%", weighted: bool = False):
+    """
+    Streams the edges of an edge list file, with the first two fields of a
+    line being the ids of the ends of the edge.
+
+    Parameters:
+        'filename' : path of the file, possibly compressed (see open_text)
+        'vertex_data' : list of Vertex objects indexed by id, as returned
+            by parse_node_data. If None, a single Vertex is built per id
+        'delimiter' : separator of the fields, any whitespace if None
+        'comments' : characters starting a comment line
+        'weighted' : if True, the third field is read as the edge weight
+
+    Returns:
+        An iterator of (Vertex, Vertex, weight) triples. The weight is None
+        if 'weighted' is False
+    """
+    pool = _VertexPool() if vertex_data is None else vertex_data
+    for records in read_records(filename, delimiter, comments):
+        for r in records:
+            w = float(r[2]) if weighted else None
+            yield pool[int(r[0])], pool[int(r[1])], w
+
+
+# type tag of a data file column -> (converter of a cell, numpy dtype)
+def _parse_bool(cell: str) -> bool:
+    return cell.strip().lower() not in ("", "0", "false")
+
+
+_TYPES = {
+    "STR": (str, np.str_),
+    "FLOAT": (float, np.float64),
+    "INT": (int, np.int64),
+    "BOOL": (_parse_bool, np.bool_),
+}
+
+
+def _typed_header(row):
+    """
+    Compiles the header of a data file, made of 'name(TYPE)' cells, once
+    for all the rows.
+
+    Returns
+    -------
+        The lists of the column names, converters and numpy dtypes
+    """
+    names, converters, dtypes = [], [], []
+    for cell in row:
+        name, t = cell.strip().split(')')[0].split('(')
+        if t not in _TYPES:
+            raise Exception("Unknown data type: "+str(t))
+        names.append(name)
+        converters.append(_TYPES[t][0])
+        dtypes.append(_TYPES[t][1])
+    return names, converters, dtypes
+
+
+def _typed_batches(filename: str, batch_size: int = 1 << 16):
+    """
+    Streams a data file by batches of rows, converted column by column.
+
+    Returns
+    -------
+        The column names, their dtypes, and an iterator of batches, each
+        batch being the list of the converted columns
+    """
+    assert ".csv" in filename
+    with open(filename, "r") as csvfile:
+        names, converters, dtypes = _typed_header(next(csv.reader(csvfile)))
+
+    def batches():
+        with open(filename, "r") as csvfile:
+            reader = csv.reader(csvfile, delimiter=',')
+            next(reader)
+            while True:
+                rows = [r for r in islice(reader, batch_size) if r]
+                if not rows:
+                    return
+                if any(len(r) != len(names) for r in rows):
+                    raise Exception("Wrong number of columns in "+filename)
+                yield [list(map(f, column))
+                       for (f, column) in zip(converters, zip(*rows))]
+    return names, dtypes, batches()
+
+
+def _columnar(names, dtypes, batches):
+    """
+    Concatenates converted batches into one numpy array per column
+    """
+    columns = [[] for _ in names]
+    for batch in batches:
+        for (column, values) in zip(columns, batch):
+            column.extend(values)
+    return {name: np.array(column, dtype=dtype)
+            for (name, dtype, column) in zip(names, dtypes, columns)}
+
+
+def parse_node_data(filename: str, columnar: bool = False):
     """
     Reads a csv file containing data about the nodes.
     This file's first column must be the id of a node (a integer from 0 to N)
 
+    Parameters:
+    'filename' : path of the csv file, whose header gives the 'name(TYPE)'
+        of every column, TYPE being STR, FLOAT, INT or BOOL
+    'columnar' : if True, returns the columns as numpy arrays instead of
+        building a Vertex per row
+
     Returns:
-    The list of Vertex objects L where L[i] is the object of id i.
+    The list of Vertex objects L where L[i] is the object of id i, or
+    a dictionary column name -> numpy array if 'columnar' is True.
     """
-    assert ".csv" in filename
+    names, dtypes, batches = _typed_batches(filename)
+    if columnar:
+        return _columnar(names, dtypes, batches)
     output = []
-    with open(filename, "r") as csvfile:
-        reader = list(csv.reader(csvfile, delimiter=','))
-        header = [x.strip().split(')')[0].split('(') for x in reader[0]]
-        for row in reader[1:]:
-            d = dict()
-            for i in range(len(row)):
-                name, t = header[i]
-                if t == "STR":
-                    d[name] = row[i]
-                elif t == "FLOAT":
-                    d[name] = float(row[i])
-                elif t == "INT":
-                    d[name] = int(row[i])
-                elif t == "BOOL":
-                    d[name] = bool(row[i])
-                else:
-                    raise Exception("Unknown data type: "+str(t))
+    for batch in batches:
+        for values in zip(*batch):
+            d = dict(zip(names, values))
             output.append(Vertex(d["id"], d))
     return output
 
 
-def write_node_data(filename: str) -> None:
-    return
+def write_matrix(filename: str, matrix) -> None:
+    """
+    Writes a matrix given as a list of rows, one line per row. Integers
+    are written with numpy.savetxt, other values as the shortest repr of
+    the Python float, which reads back exactly.
+    """
+    matrix = np.asarray(matrix)
+    matrix = matrix.reshape(len(matrix), -1)
+    if matrix.dtype.kind in "iub":
+        with open(filename, "w") as f:
+            np.savetxt(f, matrix, fmt="%d")
+        return
+    write_lines(filename, (" ".join(map(repr, row)) for row
+                           in matrix.astype(np.float64).tolist()))
+
+
+def write_lines(filename: str, lines, block_size: int = 1 << 16) -> None:
+    """
+    Writes an iterable of lines, without their end of line, by blocks of
+    'block_size' lines joined into a single write.
+    """
+    lines = iter(lines)
+    with open(filename, "w") as f:
+        block = list(islice(lines, block_size))
+        while block:
+            f.write("\n".join(block))
+            f.write("\n")
+            block = list(islice(lines, block_size))
+
+
+def open_write(filename: str):
+    """
+    Opens a file for writing bytes. Files ending with .gz, .bz2 or .xz are
+    compressed on the fly.
+
+    Returns:
+        A binary file object
+    """
+    if filename.endswith(".gz"):
+        return gzip.open(filename, "wb")
+    if filename.endswith(".bz2"):
+        return bz2.open(filename, "wb")
+    if filename.endswith(".xz"):
+        return lzma.open(filename, "wb")
+    return open(filename, "wb")
+
+
+def _digits(values):
+    """
+    Decimal digits of an array of non negative integers, right aligned
+
+    Returns:
+        A uint8 array of shape (len(values), width) of ASCII characters and
+        the boolean mask of the significant ones
+    """
+    width = len(str(int(values.max()))) if len(values) else 1
+    chars = np.empty((len(values), width), dtype=np.uint8)
+    rest = values.copy()
+    for d in range(width - 1, -1, -1):
+        chars[:, d] = 48 + rest % 10
+        rest //= 10
+    powers = 10**np.arange(1, width, dtype=np.int64)
+    lengths = 1 + np.searchsorted(powers, values, side="right")
+    return chars, np.arange(width) >= width - lengths[:, None]
+
+
+def format_edge_table(table) -> bytes:
+    """
+    Formats an integer array of shape (m, 2) as 'u v' lines, with the
+    digits computed by array operations instead of one string per edge
+
+    Returns:
+        The bytes of the lines
+    """
+    table = np.asarray(table, dtype=np.int64).reshape(-1, 2)
+    if len(table) and table.min() < 0:
+        f = io.BytesIO()
+        np.savetxt(f, table, fmt="%d")
+        return f.getvalue()
+    parts, masks = [], []
+    for (column, end) in ((table[:, 0], b" "), (table[:, 1], b"\n")):
+        chars, mask = _digits(column)
+        parts += [chars, np.full((len(table), 1), end[0], dtype=np.uint8)]
+        masks += [mask, np.ones((len(table), 1), dtype=bool)]
+    return np.hstack(parts)[np.hstack(masks)].tobytes()
+
+
+def write_edge_tables(filename: str, tables, binary: bool = False) -> int:
+    """
+    Writes a stream of integer arrays of shape (m, 2) to an edge list, one
+    'u v' line per edge, or to a binary file of little endian int64 pairs
+    read back by np.fromfile(filename, dtype="<i8").reshape(-1, 2). Only
+    one array is held in memory at once.
+
+    Returns:
+        The number of edges written
+    """
+    count = 0
+    with open_write(filename) as f:
+        for table in tables:
+            table = np.asarray(table).reshape(-1, 2)
+            if binary:
+                f.write(np.ascontiguousarray(table, dtype="<i8").tobytes())
+            else:
+                f.write(format_edge_table(table))
+            count += len(table)
+    return count
+
+
+def _type_tag(values) -> str:
+    """
+    The type tag of a column of Python values, for the header of a data file
+    """
+    types = set(map(type, values))
+    if types <= {bool, np.bool_}:
+        return "BOOL"
+    if all(issubclass(t, (int, np.integer)) and not issubclass(t, bool)
+           for t in types):
+        return "INT"
+    if all(issubclass(t, (int, float, np.integer, np.floating))
+           for t in types):
+        return "FLOAT"
+    return "STR"
+
+
+def _format_cell(value, tag):
+    if tag == "BOOL":
+        return "1" if value else "0"
+    if tag == "FLOAT":
+        return repr(float(value))
+    return str(value)
 
 
-def parse_edge_data(filename: str, oriented: bool = True):
+def _write_typed_csv(filename: str, names, columns) -> None:
+    """
+    Writes columns of values as a csv file with a 'name(TYPE)' header,
+    readable by parse_node_data and parse_edge_data. Floats are written
+    with repr, which reads back to the same float.
+    """
     assert ".csv" in filename
+    tags = [_type_tag(c) for c in columns]
+    columns = [[_format_cell(x, t) for x in c] if t in ("BOOL", "FLOAT")
+               else c for (c, t) in zip(columns, tags)]
+    with open(filename, "w", newline="", buffering=1 << 20) as csvfile:
+        writer = csv.writer(csvfile, delimiter=',')
+        writer.writerow(["{}({})".format(n, t) for (n, t) in zip(names, tags)])
+        writer.writerows(zip(*columns))
+
+
+def _common_keys(datas):
+    """
+    Keys present in every data dictionary, in the order of the first one
+    """
+    if not datas:
+        return []
+    keys = set(datas[0])
+    for d in datas[1:]:
+        keys &= set(d)
+    return [k for k in datas[0] if k in keys]
+
+
+def write_node_data(filename: str, vertices) -> None:
+    """
+    Writes the data of vertices in a csv file read back by parse_node_data.
+    Only the attributes set on every vertex are written, after the id.
+
+    Parameters:
+    'filename' : path of the csv file to write
+    'vertices' : an iterable of Vertex objects, written in increasing id
+        order
+    """
+    vertices = sorted(vertices)
+    datas = [v._data if v._data is not None else {"name": str(v.id)}
+             for v in vertices]
+    names = ["id"] + [k for k in _common_keys(datas) if k != "id"]
+    columns = [[v.id for v in vertices]]
+    columns += [[d[k] for d in datas] for k in names[1:]]
+    _write_typed_csv(filename, names, columns)
+
+
+def parse_edge_data(filename: str, oriented: bool = True,
+                    columnar: bool = False):
+    """
+    Reads a csv file containing data about the edges, whose 'start' and
+    'end' columns are the ids of the extremities of the edges.
+
+    Parameters:
+    'filename' : path of the csv file, with a typed header as for
+        parse_node_data
+    'oriented' : orientation of the Edge objects built
+    'columnar' : if True, returns the columns as numpy arrays instead of
+        building an Edge per row
+
+    Returns:
+    A dictionary (start, end) -> list of Edge objects, or a dictionary
+    column name -> numpy array if 'columnar' is True.
+    """
+    names, dtypes, batches = _typed_batches(filename)
+    if columnar:
+        return _columnar(names, dtypes, batches)
     output = dict()
-    with open(filename, "r") as csvfile:
-        reader = list(csv.reader(csvfile, delimiter=','))
-        header = [x.strip().split(')')[0].split('(') for x in reader[0]]
-        for row in reader[1:]:
-            d = dict()
-            for i in range(len(row)):
-                name, t = header[i]
-                if t == "STR":
-                    d[name] = row[i]
-                elif t == "FLOAT":
-                    d[name] = float(row[i])
-                elif t == "INT":
-                    d[name] = int(row[i])
-                elif t == "BOOL":
-                    d[name] = bool(row[i])
-                else:
-                    raise Exception("Unknown data type: "+str(t))
-            if (d["start"], d["end"]) not in output:
-                output[(d["start"], d["end"])] = [
-                    Edge(oriented=oriented, data=d)]
+    for batch in batches:
+        for values in zip(*batch):
+            d = dict(zip(names, values))
+            e = Edge(oriented=oriented, data=d)
+            key = (d["start"], d["end"])
+            if key in output:
+                output[key].append(e)
             else:
-                output[(d["start"], d["end"])].append(
-                    Edge(oriented=oriented, data=d))
-
+                output[key] = [e]
     return output
 
 
-def write_edge_data(filename: str) -> None:
-    return
+def write_edge_data(filename: str, edges) -> None:
+    """
+    Writes the data of edges in a csv file read back by parse_edge_data:
+    the ids of their ends, their weight, and the attributes set on every
+    edge.
+
+    Parameters:
+    'filename' : path of the csv file to write
+    'edges' : an iterable of Edge objects
+    """
+    edges = list(edges)
+    datas = [e._data or dict() for e in edges]
+    keys = [k for k in _common_keys(datas)
+            if k not in ("start", "end", "weight")]
+    columns = [[e.start.id for e in edges], [e.end.id for e in edges],
+               [e.weight for e in edges]]
+    columns += [[d[k] for d in datas] for k in keys]
+    _write_typed_csv(filename, ["start", "end", "weight"] + keys, columns)
@@ -0,0 +1,155 @@
+import numpy as np
+from .vertex_edge import Vertex, Edge
+from ._attributes import _Row
+from .frozenGraph import _index_dtype
+
+
+def _array(values, dtype=None):
+    """
+    Array of a list of Python values, keeping integers as integers
+    """
+    if len(values) == 0:
+        return np.empty(0, dtype=dtype or np.int64)
+    return np.array(values, dtype=dtype)
+
+
+def _data_state(objects, table):
+    """
+    Splits the data of vertices or edges between the rows of the attribute
+    table of the graph, stored as an array, and the other data dictionaries
+
+    Returns:
+        The array of the rows of the objects in 'table' (-1 for the others)
+        and the list of (position, dict) of the other objects with data
+    """
+    rows = np.full(len(objects), -1, dtype=np.int64)
+    extra = []
+    for (i, o) in enumerate(objects):
+        data = o._data
+        if data is None:
+            continue
+        if isinstance(data, _Row) and data.table is table:
+            rows[i] = data.index
+        else:
+            extra.append((i, dict(data.items())))
+    return rows, extra
+
+
+def _set_data(objects, rows, extra, table):
+    for i in np.flatnonzero(rows >= 0).tolist():
+        objects[i]._data = table.row(int(rows[i]))
+    for (i, data) in extra:
+        objects[i]._data = data
+    if table is not None:
+        table.objects = [None]*len(table)
+        for i in np.flatnonzero(rows >= 0).tolist():
+            table.objects[int(rows[i])] = objects[i]
+
+
+def _indices(values, count: int, bound: int):
+    """
+    Array of 'count' indices smaller than 'bound', in the smallest integer
+    type holding them
+    """
+    return np.fromiter(values, dtype=np.int64, count=count).astype(
+        _index_dtype(bound))
+
+
+def pack(graph, adj, multiple: bool = False):
+    """
+    Flattens a Graph, OrientedGraph or MultiGraph into a few contiguous
+    arrays, for __reduce__. Pickled with protocol 5, the arrays are sent as
+    out-of-band buffers. Only the data dictionaries and the attribute
+    tables remain Python objects.
+
+    Parameters:
+        'graph' : the graph
+        'adj' : its adjacency dictionary (out-adjacency if oriented)
+        'multiple' : True if the values of graph._edges are lists of edges
+
+    Returns:
+        A tuple of arrays and lists, read back by unpack
+    """
+    vertices = list(adj)
+    n = len(vertices)
+    index = {v.id: i for (i, v) in enumerate(vertices)}
+    counts = np.fromiter((len(adj[v]) for v in vertices), dtype=np.int64,
+                         count=n)
+    targets = _indices((index[u.id] for v in vertices for u in adj[v]),
+                       int(counts.sum()), n)
+    vertex_rows, vertex_extra = _data_state(vertices, graph._vertex_table)
+    edges = None
+    if graph._edges is not None:
+        k = len(graph._edges)
+        # loaders of edge data may key the edges by integer ids
+        keys = _indices((index[getattr(v, "id", v)] for pair in graph._edges
+                         for v in pair),
+                        2*k, n).reshape(-1, 2)
+        sizes = None
+        if multiple:
+            sizes = np.fromiter(map(len, graph._edges.values()),
+                                dtype=np.int64, count=k)
+            flat = [e for value in graph._edges.values() for e in value]
+        else:
+            flat = list(graph._edges.values())
+        # an Edge stored under several keys is only sent once
+        _, first, members = np.unique(
+            np.fromiter(map(id, flat), dtype=np.int64, count=len(flat)),
+            return_index=True, return_inverse=True)
+        objects = [flat[i] for i in first.tolist()]
+        ends = _indices((index[v.id] for e in objects
+                         for v in (e.start, e.end)),
+                        2*len(objects), n).reshape(-1, 2)
+        edge_rows, edge_extra = _data_state(objects, graph._edge_table)
+        edges = (keys, sizes, members.astype(_index_dtype(len(objects))),
+                 ends, _array([e.weight for e in objects]),
+                 np.fromiter((e.oriented for e in objects), dtype=bool,
+                             count=len(objects)),
+                 edge_rows, edge_extra)
+    return (multiple, _array([v.id for v in vertices]), counts, targets,
+            vertex_rows, vertex_extra, edges, graph._vertex_table,
+            graph._edge_table)
+
+
+def unpack(cls, state):
+    """
+    Builds back a graph of class 'cls' from the state given by pack
+
+    Returns:
+        A new Graph, OrientedGraph or MultiGraph object
+    """
+    (multiple, ids, counts, targets, vertex_rows, vertex_extra, edges,
+     vertex_table, edge_table) = state
+    container = list if multiple else set
+    vertices = [Vertex(i) for i in ids.tolist()]
+    _set_data(vertices, vertex_rows, vertex_extra, vertex_table)
+    targets = [vertices[j] for j in targets.tolist()]
+    graph_dict = dict()
+    start = 0
+    for (v, count) in zip(vertices, counts.tolist()):
+        graph_dict[v] = container(targets[start:start + count])
+        start += count
+    edge_dict = None
+    if edges is not None:
+        keys, sizes, members, ends, weights, oriented, rows, extra = edges
+        objects = []
+        for (a, b, w, o) in zip(ends[:, 0].tolist(), ends[:, 1].tolist(),
+                                weights.tolist(), oriented.tolist()):
+            # the slots are set directly, the ends being known vertices
+            e = Edge.__new__(Edge)
+            e.start, e.end = vertices[a], vertices[b]
+            e.oriented, e.weight, e._data = o, w, None
+            objects.append(e)
+        _set_data(objects, rows, extra, edge_table)
+        values = [objects[k] for k in members.tolist()]
+        if multiple:
+            bounds = np.cumsum(sizes).tolist()
+            values = [values[b - s:b]
+                      for (b, s) in zip(bounds, sizes.tolist())]
+        edge_dict = dict(zip([(vertices[a], vertices[b]) for (a, b)
+                              in zip(keys[:, 0].tolist(),
+                                     keys[:, 1].tolist())], values))
+    graph = cls(graph_dict, _edges=edge_dict)
+    graph._vertex_table = vertex_table
+    graph._edge_table = edge_table
+    return graph
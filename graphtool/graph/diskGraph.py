@@ -0,0 +1,368 @@
+import json
+import os
+import numpy as np
+from .vertex_edge import Vertex
+from ._cache import DerivedCache
+from ._parsing import iter_edge_tables
+
+# number of int64 entries in a page of the neighbour files
+PAGE_SIZE = 1 << 16
+VERSION = 1
+
+
+def _before(pairs, cutoff):
+    """
+    Length of the prefix of the sorted (m, 2) array 'pairs' that is
+    lexicographically smaller than or equal to the pair 'cutoff'
+    """
+    s, d = cutoff
+    return int(np.count_nonzero((pairs[:, 0] < s)
+                                | ((pairs[:, 0] == s) & (pairs[:, 1] <= d))))
+
+
+class _Run:
+    """
+    Sorted (m, 2) int64 pairs stored on disk, read back by blocks
+    """
+
+    def __init__(self, filename, pairs):
+        self.filename = filename
+        self.size = len(pairs)
+        self.position = 0
+        pairs.astype(np.int64).tofile(filename)
+
+    def read(self, block):
+        count = min(block, self.size - self.position)
+        pairs = np.fromfile(self.filename, dtype=np.int64, count=2*count,
+                            offset=16*self.position).reshape(-1, 2)
+        self.position += count
+        return pairs
+
+    def exhausted(self):
+        return self.position == self.size
+
+
+def _sort_runs(tables, directory, run_size, oriented):
+    """
+    First phase of the external merge sort: cuts the stream of edges into
+    runs of at most 'run_size' pairs, sorted in memory and written to disk.
+    Non-oriented edges are stored in both directions, and oriented ones
+    also in reverse for the in-adjacency. Loops are dropped.
+
+    Returns
+    -------
+        The lists of the runs of the out-adjacency and of the in-adjacency
+    """
+    runs_out, runs_in = [], []
+    buffer, size = [], 0
+
+    def flush():
+        pairs = np.concatenate(buffer)
+        if oriented:
+            reverse = pairs[:, ::-1]
+        else:
+            pairs = np.concatenate((pairs, pairs[:, ::-1]))
+        for (runs, p) in ((runs_out, pairs),
+                          (runs_in, reverse if oriented else None)):
+            if p is None:
+                continue
+            p = p[np.lexsort((p[:, 1], p[:, 0]))]
+            name = os.path.join(directory, "run{}.tmp".format(
+                len(runs_out) + len(runs_in)))
+            runs.append(_Run(name, p))
+
+    for table in tables:
+        table = np.asarray(table)[:, :2].astype(np.int64)
+        table = table[table[:, 0] != table[:, 1]]
+        buffer.append(table)
+        size += len(table)
+        if size >= run_size:
+            flush()
+            buffer, size = [], 0
+    if size > 0:
+        flush()
+    return runs_out, runs_in
+
+
+def _merge_runs(runs, filename, block):
+    """
+    Second phase of the external merge sort: merges the sorted runs by
+    blocks into the file of the neighbours, dropping duplicated pairs.
+    At most one block per run is held in memory.
+
+    Returns
+    -------
+        The sorted array of the vertices having neighbours, and their
+        number of neighbours
+    """
+    buffers = [run.read(block) for run in runs]
+    sources, counts = [], []
+    last = None
+    with open(filename, "wb") as out:
+        while any(len(b) > 0 for b in buffers):
+            pending = [b[-1] for (b, run) in zip(buffers, runs)
+                       if len(b) > 0 and not run.exhausted()]
+            parts = []
+            for (k, b) in enumerate(buffers):
+                if pending:
+                    cutoff = min(pending, key=lambda p: (p[0], p[1]))
+                    taken = _before(b, cutoff)
+                else:
+                    taken = len(b)
+                parts.append(b[:taken])
+                buffers[k] = b[taken:]
+                if len(buffers[k]) == 0 and not runs[k].exhausted():
+                    buffers[k] = runs[k].read(block)
+            merged = np.concatenate(parts)
+            merged = merged[np.lexsort((merged[:, 1], merged[:, 0]))]
+            keep = np.ones(len(merged), dtype=bool)
+            keep[1:] = np.any(merged[1:] != merged[:-1], axis=1)
+            if last is not None and len(merged) > 0:
+                keep[0] = np.any(merged[0] != last)
+            merged = merged[keep]
+            if len(merged) == 0:
+                continue
+            last = merged[-1]
+            merged[:, 1].tofile(out)
+            s, c = np.unique(merged[:, 0], return_counts=True)
+            sources.append(s)
+            counts.append(c)
+    for run in runs:
+        os.remove(run.filename)
+    if not sources:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    sources, inverse = np.unique(np.concatenate(sources), return_inverse=True)
+    counts = np.bincount(inverse, weights=np.concatenate(counts))
+    return sources, counts.astype(np.int64)
+
+
+class DiskGraph:
+    """
+    A read-only graph stored on disk, for graphs whose edges do not fit in
+    memory.
+
+    The neighbours of every vertex are stored in a file sorted by vertex id,
+    and read by pages of PAGE_SIZE entries through a bounded LRU cache.
+    The arrays of the vertex ids and offsets are memory-mapped, so that
+    only the pages in use are loaded.
+
+    A DiskGraph is built with from_edge_list or from_edge_tables, and opened
+    back with DiskGraph(directory).
+    """
+
+    def __init__(self, directory: str, memory: int = 1 << 26):
+        """
+        Opens a graph previously built in 'directory'.
+
+        Parameters:
+            'directory' : the directory holding the files of the graph
+            'memory' : number of bytes of neighbour pages kept in memory
+        """
+        self.directory = directory
+        with open(os.path.join(directory, "meta.json"), "r") as f:
+            meta = json.load(f)
+        self.oriented = meta["oriented"]
+        self._ids = self._array("ids", meta["n"])
+        self._offsets = self._array("offsets", meta["n"] + 1)
+        self._offsets_in = None
+        if self.oriented:
+            self._offsets_in = self._array("offsets_in", meta["n"] + 1)
+        self._pages = DerivedCache(max(1, memory // (8*PAGE_SIZE)))
+
+    def _array(self, name, size):
+        if size == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.memmap(os.path.join(self.directory, name + ".bin"),
+                         dtype=np.int64, mode="r", shape=(size,))
+
+    # --------------- Initialization methods --------------------------
+
+    @staticmethod
+    def from_edge_tables(tables, directory: str, oriented: bool = False,
+                         memory: int = 1 << 26):
+        """
+        Builds a DiskGraph from a stream of edge arrays with an external
+        merge sort, holding at most about 'memory' bytes of edges at once.
+        Duplicated edges and loops are dropped.
+
+        Parameters:
+            'tables' : an iterable of integer arrays of shape (m, 2)
+            'directory' : the directory where the files are written
+            'oriented' : if False, every edge is stored in both directions
+            'memory' : memory budget in bytes for the sort and the pages
+
+        Returns:
+            A new DiskGraph object
+        """
+        os.makedirs(directory, exist_ok=True)
+        run_size = max(1, memory // 64)
+        runs_out, runs_in = _sort_runs(tables, directory, run_size, oriented)
+        block = max(1, run_size // max(1, len(runs_out)))
+        adjacency = [("offsets", "targets", runs_out)]
+        if oriented:
+            adjacency.append(("offsets_in", "targets_in", runs_in))
+        degrees = []
+        for (_, targets, runs) in adjacency:
+            filename = os.path.join(directory, targets + ".bin")
+            degrees.append(_merge_runs(runs, filename, block))
+        ids = degrees[0][0]
+        for (sources, _) in degrees[1:]:
+            ids = np.union1d(ids, sources)
+        for ((offsets, _, _), (sources, counts)) in zip(adjacency, degrees):
+            table = np.zeros(len(ids) + 1, dtype=np.int64)
+            table[1 + np.searchsorted(ids, sources)] = counts
+            np.cumsum(table, out=table)
+            table.tofile(os.path.join(directory, offsets + ".bin"))
+        ids.astype(np.int64).tofile(os.path.join(directory, "ids.bin"))
+        with open(os.path.join(directory, "meta.json"), "w") as f:
+            json.dump({"version": VERSION, "oriented": oriented,
+                       "n": len(ids)}, f)
+        return DiskGraph(directory, memory)
+
+    @staticmethod
+    def from_edge_list(filename: str, directory: str, oriented: bool = False,
+                       memory: int = 1 << 26, delimiter: str = None,
+                       comments: str = "#%"):
+        """
+        Builds a DiskGraph from a text edge list, possibly compressed,
+        streamed by chunks.
+
+        Parameters:
+            'filename' : path of the edge list
+            'directory' : the directory where the files are written
+            'oriented' : if False, every edge is stored in both directions
+            'memory' : memory budget in bytes for the sort and the pages
+            'delimiter' : separator of the fields, any whitespace if None
+            'comments' : lines starting with one of these characters are
+                skipped
+
+        Returns:
+            A new DiskGraph object
+        """
+        chunk_size = max(1 << 16, memory // 8)
+        tables = iter_edge_tables(filename, delimiter, comments,
+                                  chunk_size=chunk_size)
+        return DiskGraph.from_edge_tables(tables, directory, oriented,
+                                          memory)
+
+    # ---------------- Getters -----------------------------
+
+    def __len__(self):
+        """
+        Number of vertices in the graph
+        """
+        return len(self._ids)
+
+    def __contains__(self, v):
+        return self._find(v) is not None
+
+    def _find(self, v):
+        """
+        Index of a vertex, or None if the vertex is not in the graph
+        """
+        if isinstance(v, Vertex):
+            v = v.id
+        i = int(np.searchsorted(self._ids, v))
+        if i < len(self._ids) and self._ids[i] == v:
+            return i
+        return None
+
+    def _index(self, v):
+        i = self._find(v)
+        if i is None:
+            raise KeyError(v)
+        return i
+
+    def vertices(self):
+        """
+        Getter on the vertices of the graph
+
+        Returns:
+            An iterator over the vertices of the graph
+        """
+        for start in range(0, len(self._ids), PAGE_SIZE):
+            for i in self._ids[start:start+PAGE_SIZE].tolist():
+                yield Vertex(i)
+
+    def _page(self, name, p):
+        def load():
+            return np.fromfile(os.path.join(self.directory, name + ".bin"),
+                               dtype=np.int64, count=PAGE_SIZE,
+                               offset=8*PAGE_SIZE*p)
+        return self._pages.get((name, p), 0, load)
+
+    def _neighbour_ids(self, name, offsets, i):
+        """
+        Reads the ids stored between offsets[i] and offsets[i+1] in the
+        neighbour file 'name', page by page
+        """
+        start, end = int(offsets[i]), int(offsets[i+1])
+        parts = []
+        while start < end:
+            p, k = divmod(start, PAGE_SIZE)
+            page = self._page(name, p)
+            parts.append(page[k:k + end - start])
+            start += len(parts[-1])
+        if not parts:
+            return []
+        return np.concatenate(parts).tolist()
+
+    def get_neighbours(self, v):
+        """
+        Returns the vertices that are adjacent to v (out-neighbours for
+        oriented graphs)
+
+        Parameters:
+            'v' : A Vertex object or an integer (vertex id)
+
+        Returns:
+            The set of neighbours of v
+        """
+        ids = self._neighbour_ids("targets", self._offsets, self._index(v))
+        return set(Vertex(u) for u in ids)
+
+    def get_neighbours_in(self, v):
+        """
+        Returns the vertices that can lead to v in an oriented graph
+
+        Parameters:
+            'v' : A Vertex object or an integer (vertex id)
+
+        Returns:
+            The set of in-neighbours of v
+        """
+        if not self.oriented:
+            return self.get_neighbours(v)
+        ids = self._neighbour_ids("targets_in", self._offsets_in,
+                                  self._index(v))
+        return set(Vertex(u) for u in ids)
+
+    # ---------------- Stats computations -----------------------------
+
+    def vertex_degree(self):
+        """
+        Returns the list of (out-)degrees of the vertices in the graph.
+
+        Returns:
+            A list of integers
+        """
+        return np.diff(self._offsets).tolist()
+
+    def degree_sequence(self):
+        """
+        Returns the list of degrees of the vertices in the graph sorted in
+        decreasing order
+
+        Returns:
+            A list of integers sorted in decreasing order
+        """
+        return sorted(self.vertex_degree(), reverse=True)
+
+    def get_in_degrees(self):
+        offsets = self._offsets_in if self.oriented else self._offsets
+        deg = np.diff(offsets).tolist()
+        return {Vertex(i): d for (i, d) in zip(self._ids.tolist(), deg)}
+
+    def get_out_degrees(self):
+        deg = np.diff(self._offsets).tolist()
+        return {Vertex(i): d for (i, d) in zip(self._ids.tolist(), deg)}
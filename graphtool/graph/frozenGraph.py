@@ -0,0 +1,789 @@
+import numpy as np
+from collections.abc import Set
+from .vertex_edge import Vertex, Edge
+from ._matrix import build_matrix
+from .subgraphView import SubgraphView
+from ._binary import read_binary, write_binary, edge_columns
+from .sharedGraph import SharedGraph
+
+
+def _index_dtype(bound: int):
+    """
+    Smallest signed integer type able to store every value up to 'bound'
+    """
+    if bound < 2**31:
+        return np.int32
+    return np.int64
+
+
+def _build_csr(n: int, rows, cols, weights=None):
+    """
+    Sorts (rows, cols) pairs into compressed sparse row arrays.
+
+    Returns
+    -------
+        The offsets and targets arrays, and the weights reordered
+        accordingly (or None)
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    order = np.lexsort((cols, rows))
+    counts = np.bincount(rows, minlength=n)
+    offsets = np.zeros(n+1, dtype=_index_dtype(len(cols)))
+    np.cumsum(counts, out=offsets[1:])
+    targets = cols[order].astype(_index_dtype(n))
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64)[order]
+    return offsets, targets, weights
+
+
+class _VertexView(Set):
+    """
+    Read-only set-like view over the vertices of a FrozenGraph.
+    Vertex objects are built on the fly from the id array.
+    """
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __len__(self):
+        return len(self._graph)
+
+    def __iter__(self):
+        for i in self._graph._ids.tolist():
+            yield Vertex(i)
+
+    def __contains__(self, v):
+        return self._graph._find(v) is not None
+
+    def __repr__(self):
+        return "VertexView(" + repr(list(self)) + ")"
+
+
+class FrozenGraph:
+    """
+    An immutable graph stored in compressed sparse row (CSR) form.
+
+    The neighbours of the vertex of index i are the indices
+    targets[offsets[i]:offsets[i+1]], sorted in increasing order.
+    Vertices are sorted by id, and the id of the vertex of index i is ids[i].
+    For non-oriented graphs, each edge is stored in both directions.
+
+    A FrozenGraph is obtained through the freeze() method of Graph,
+    OrientedGraph or MultiGraph, or loaded from a binary file with load().
+    Only the combinatorial structure, the weights of the edges and the
+    attribute columns of a loaded file are kept.
+    """
+
+    def __init__(self, _ids, _offsets, _targets, _weights=None,
+                 oriented=False, multiple=False,
+                 _offsets_in=None, _targets_in=None, _weights_in=None,
+                 _attributes=None, _edge_attributes=None):
+        """
+        Initialization function. Is not meant to be called as it is.
+
+        Parameters:
+            self._ids : sorted array of vertex ids
+            self._offsets, self._targets : out-adjacency in CSR form
+            self._weights : edge weights aligned on self._targets, or None
+                if every edge has weight 1
+            self._offsets_in, self._targets_in, self._weights_in :
+                in-adjacency of an oriented graph
+            self._attributes : attribute name -> array aligned on self._ids
+            self._edge_attributes : attribute name -> array aligned on
+                self._targets
+        """
+        self._ids = _ids
+        self._offsets = _offsets
+        self._targets = _targets
+        self._weights = _weights
+        self.oriented = oriented
+        self.multiple = multiple
+        self._offsets_in = _offsets_in
+        self._targets_in = _targets_in
+        self._weights_in = _weights_in
+        self._attributes = _attributes or dict()
+        self._edge_attributes = _edge_attributes or dict()
+        # when ids are exactly 0..n-1, the id of a vertex is its index
+        n = len(_ids)
+        self._identity = n == 0 or (int(_ids[0]) == 0
+                                    and int(_ids[-1]) == n-1)
+
+    @staticmethod
+    def from_arrays(ids, rows, cols, weights=None, oriented=False,
+                    multiple=False):
+        """
+        Builds a FrozenGraph from edge arrays expressed in vertex indices.
+
+        Parameters
+        ----------
+            'ids' : array of integers
+                The sorted ids of the vertices
+            'rows', 'cols' : arrays of integers
+                Index of the start and end of every edge. For non-oriented
+                graphs, every edge must be given in both directions
+            'weights' : array of floats or None
+                The weight of every edge
+
+        Returns
+        -------
+            A new FrozenGraph object
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        n = len(ids)
+        offsets, targets, w = _build_csr(n, rows, cols, weights)
+        if not oriented:
+            return FrozenGraph(ids, offsets, targets, w, multiple=multiple)
+        offsets_in, targets_in, w_in = _build_csr(n, cols, rows, weights)
+        return FrozenGraph(ids, offsets, targets, w, oriented=True,
+                           multiple=multiple, _offsets_in=offsets_in,
+                           _targets_in=targets_in, _weights_in=w_in)
+
+    @staticmethod
+    def from_adjacency(adj, edges=None, oriented=False, multiple=False,
+                       edge_attributes=False):
+        """
+        Builds a FrozenGraph from an adjacency dictionary
+        (Vertex -> container of neighbours), as stored in the Graph classes.
+
+        Parameters
+        ----------
+            'adj' : dict
+                The adjacency dictionary
+            'edges' : dict or None
+                The (Vertex, Vertex) -> Edge dictionary from which weights
+                are read
+            'edge_attributes' : bool
+                If True, the data of the edges is also kept as attribute
+                columns, see edge_columns
+        """
+        vertices = sorted(adj)
+        n = len(vertices)
+        index = {v.id: i for (i, v) in enumerate(vertices)}
+        ids = np.fromiter((v.id for v in vertices), dtype=np.int64, count=n)
+        m = sum(len(adj[v]) for v in vertices)
+        rows = np.repeat(np.arange(n, dtype=np.int64),
+                         [len(adj[v]) for v in vertices])
+        cols = np.fromiter((index[u.id] for v in vertices for u in adj[v]),
+                           dtype=np.int64, count=m)
+        weights = None
+        columns = None
+        if edges is not None:
+            stored = [None] * m
+            weights = np.ones(m, dtype=np.float64)
+            k = 0
+            for v in vertices:
+                # parallel edges take the edges of their list in turn
+                seen = dict()
+                for u in adj[v]:
+                    e = edges.get((v, u), None)
+                    if isinstance(e, list):
+                        j = seen.get(u, 0)
+                        seen[u] = j + 1
+                        e = e[j] if j < len(e) else None
+                    if e is not None:
+                        weights[k] = e["weight"]
+                        stored[k] = e
+                    k += 1
+            if np.all(weights == 1):
+                weights = None
+            if edge_attributes:
+                # the columns follow the edges in CSR order
+                order = np.lexsort((cols, rows))
+                rows, cols = rows[order], cols[order]
+                if weights is not None:
+                    weights = weights[order]
+                columns = edge_columns([stored[k] for k in order.tolist()])
+        graph = FrozenGraph.from_arrays(ids, rows, cols, weights,
+                                        oriented=oriented, multiple=multiple)
+        graph._edge_attributes = columns or dict()
+        return graph
+
+    @staticmethod
+    def from_edge_table(adj, table, oriented=False, multiple=False):
+        """
+        Builds a FrozenGraph from the adjacency dictionary of a graph built
+        from arrays and the table of its edges, without any Edge object.
+
+        Parameters
+        ----------
+            'adj' : dict
+                The adjacency dictionary
+            'table' : AttributeTable
+                The table of the edges, with their start, end and weight
+                columns. Non-oriented edges are given once
+        """
+        ids = np.sort(np.fromiter((v.id for v in adj), dtype=np.int64,
+                                  count=len(adj)))
+        rows = np.searchsorted(ids, table["start"])
+        cols = np.searchsorted(ids, table["end"])
+        weights = table["weight"] if "weight" in table else None
+        if weights is not None and np.all(weights == 1):
+            weights = None
+        if not oriented:
+            # loops are only stored once in the adjacency of their end
+            other = rows != cols
+            rows, cols = (np.concatenate((rows, cols[other])),
+                          np.concatenate((cols, rows[other])))
+            if weights is not None:
+                weights = np.concatenate((weights, weights[other]))
+        return FrozenGraph.from_arrays(ids, rows, cols, weights,
+                                       oriented=oriented, multiple=multiple)
+
+    @staticmethod
+    def load(filename: str, mmap: bool = True):
+        """
+        Loads a graph saved in the binary format by a save() method.
+
+        Parameters
+        ----------
+            'filename' : path of the file
+            'mmap' : bool
+                If True, the arrays are memory-mapped: loading is immediate,
+                pages are read on demand and shared between the processes
+                opening the same file. Otherwise, the file is read into
+                memory
+
+        Returns
+        -------
+            A new FrozenGraph object
+        """
+        header, arrays = read_binary(filename, mmap)
+        attributes = {name.split(":", 1)[1]: arrays[name] for name in arrays
+                      if name.startswith("attribute:")}
+        edge_attributes = {name.split(":", 1)[1]: arrays[name]
+                           for name in arrays
+                           if name.startswith("edge_attribute:")}
+        return FrozenGraph(arrays["ids"], arrays["offsets"],
+                           arrays["targets"], arrays.get("weights"),
+                           header["oriented"], header["multiple"],
+                           arrays.get("offsets_in"), arrays.get("targets_in"),
+                           arrays.get("weights_in"), attributes,
+                           edge_attributes)
+
+    def save(self, filename: str) -> None:
+        """
+        Saves the graph in the binary format, readable by load().
+        The file stores a version number, the CSR arrays, the weights and
+        the vertex and edge attribute columns, each array aligned on 64
+        bytes.
+
+        Parameters
+        ----------
+            'filename' : path of the file to write
+        """
+        write_binary(filename, self, self._attributes)
+
+    def share(self):
+        """
+        Places the arrays of the graph in shared memory. Worker processes
+        attach to them without any copy.
+
+        Returns
+        -------
+            A SharedGraph object, whose graph() method gives back the graph
+        """
+        return SharedGraph(self)
+
+    def __eq__(self, other):
+        if not isinstance(other, FrozenGraph):
+            other = other.freeze()
+        return (np.array_equal(self._ids, other._ids)
+                and np.array_equal(self._offsets, other._offsets)
+                and np.array_equal(self._targets, other._targets))
+
+    def __str__(self):
+        return str({v: self.get_neighbours(v) for v in self.vertices()})
+
+    def __len__(self):
+        """
+        Number of vertices in the graph
+        """
+        return len(self._ids)
+
+    # ---------------- Array access -----------------------------
+
+    @property
+    def ids(self):
+        """
+        Array of the vertex ids, in index order
+        """
+        return self._ids
+
+    @property
+    def attributes(self):
+        """
+        Dictionary attribute name -> array of the values of the vertices,
+        in index order
+        """
+        return self._attributes
+
+    @property
+    def edge_attributes(self):
+        """
+        Dictionary attribute name -> array of the values of the edges,
+        aligned on the targets array
+        """
+        return self._edge_attributes
+
+    @property
+    def offsets(self):
+        """
+        Offsets array of the out-adjacency
+        """
+        return self._offsets
+
+    @property
+    def targets(self):
+        """
+        Targets array of the out-adjacency
+        """
+        return self._targets
+
+    @property
+    def weights(self):
+        """
+        Weights of the edges aligned on the targets array, or None if every
+        edge has weight 1
+        """
+        return self._weights
+
+    def _find(self, v):
+        """
+        Index of a vertex, or None if the vertex is not in the graph
+        """
+        if isinstance(v, Vertex):
+            v = v.id
+        n = len(self._ids)
+        if self._identity:
+            return v if 0 <= v < n else None
+        i = int(np.searchsorted(self._ids, v))
+        if i < n and self._ids[i] == v:
+            return i
+        return None
+
+    def index_of(self, v) -> int:
+        """
+        Returns the index of a vertex
+
+        Parameters
+        ----------
+            'v' : A Vertex object or an integer (vertex id)
+        """
+        i = self._find(v)
+        if i is None:
+            raise KeyError(v)
+        return i
+
+    def vertex_at(self, i: int):
+        """
+        Returns the Vertex object of index i
+        """
+        return Vertex(int(self._ids[i]))
+
+    def neighbours_index(self, i: int):
+        """
+        Returns the array of the indices of the out-neighbours of the vertex
+        of index i
+        """
+        return self._targets[self._offsets[i]:self._offsets[i+1]]
+
+    def neighbours_index_in(self, i: int):
+        """
+        Returns the array of the indices of the in-neighbours of the vertex
+        of index i. Only available for oriented graphs.
+        """
+        return self._targets_in[self._offsets_in[i]:self._offsets_in[i+1]]
+
+    def weights_index(self, i: int):
+        """
+        Returns the weights of the out-edges of the vertex of index i, aligned
+        with neighbours_index(i)
+        """
+        a, b = self._offsets[i], self._offsets[i+1]
+        if self._weights is None:
+            return np.ones(b - a, dtype=np.float64)
+        return self._weights[a:b]
+
+    def edge_arrays(self):
+        """
+        Returns the (rows, cols, weights) arrays of every stored
+        (start, end) pair, in index form. Non-oriented edges appear twice.
+        """
+        n = len(self._ids)
+        rows = np.repeat(np.arange(n, dtype=self._targets.dtype),
+                         np.diff(self._offsets))
+        return rows, self._targets, self._weights
+
+    # ---------------- Getters -----------------------------
+
+    def freeze(self):
+        return self
+
+    def thaw(self):
+        """
+        Builds back a mutable graph of the corresponding class. Weights and
+        attribute columns are restored as edge and vertex data.
+
+        Returns
+        -------
+            A new Graph, OrientedGraph or MultiGraph object
+        """
+        from .graph import Graph
+        from .orientedGraph import OrientedGraph
+        from .multiGraph import MultiGraph
+        ids = self._ids.tolist()
+        columns = [(k, c.tolist()) for (k, c) in self._attributes.items()]
+        vertices = [Vertex(x) for x in ids]
+        for (i, v) in enumerate(vertices):
+            if columns:
+                v.data = {k: c[i] for (k, c) in columns}
+        graph_dict = dict()
+        edges = None
+        if self._weights is not None or self._edge_attributes:
+            edges = dict()
+        edge_columns = [(k, c.tolist())
+                        for (k, c) in self._edge_attributes.items()]
+        for i in range(len(vertices)):
+            neigh = self.neighbours_index(i).tolist()
+            if edges is not None:
+                self._thaw_edges(edges, vertices, i, neigh, edge_columns)
+            neigh = [vertices[j] for j in neigh]
+            if self.multiple:
+                graph_dict[vertices[i]] = neigh
+            else:
+                graph_dict[vertices[i]] = set(neigh)
+        if self.oriented:
+            return OrientedGraph(graph_dict, _edges=edges)
+        if self.multiple:
+            return MultiGraph(graph_dict, _edges=edges)
+        return Graph(graph_dict, _edges=edges)
+
+    def _thaw_edges(self, edges, vertices, i, neigh, columns):
+        """
+        Builds the weighted Edge objects leaving the vertex of index i into
+        the (Vertex, Vertex) -> Edge dictionary of the mutable classes,
+        with their data read in the edge attribute columns
+        """
+        a = vertices[i]
+        weights = self.weights_index(i).tolist()
+        start = int(self._offsets[i])
+        for (pos, (j, w)) in enumerate(zip(neigh, weights), start):
+            b = vertices[j]
+            if not self.oriented and j < i:
+                continue
+            e = Edge(a, b, oriented=self.oriented)
+            e.weight = w
+            if columns:
+                e._data = {k: c[pos] for (k, c) in columns}
+            if not self.multiple:
+                edges[(a, b)] = e
+                if not self.oriented:
+                    edges[(b, a)] = e
+                continue
+            for key in ((a, b), (b, a)) if a != b else ((a, a),):
+                if key in edges:
+                    edges[key].append(e)
+                else:
+                    edges[key] = [e]
+
+    def vertices(self):
+        """
+        Getter on the vertices of the graph
+
+        Returns
+        -------
+            A set-like view over the vertices of the graph
+        """
+        return _VertexView(self)
+
+    def _edge(self, i, j, pos):
+        a, b = self.vertex_at(i), self.vertex_at(j)
+        e = Edge(a, b, oriented=self.oriented)
+        if self._weights is not None:
+            e.weight = float(self._weights[pos])
+        if self._edge_attributes:
+            e._data = {k: c[pos].item()
+                       for (k, c) in self._edge_attributes.items()}
+        return e
+
+    def edges(self, erase_multiple=True):
+        """
+        Getter on the edges of the graph
+
+        Parameters
+        ----------
+            'erase_multiple' : bool
+            If set to True, will do not consider duplicate edges
+
+        Returns
+        -------
+            A set of Edge objects, or a list if erase_multiple is False
+        """
+        rows, cols, _ = self.edge_arrays()
+        rows, cols = rows.tolist(), cols.tolist()
+        output = []
+        for pos in range(len(rows)):
+            if self.oriented or rows[pos] <= cols[pos]:
+                output.append(self._edge(rows[pos], cols[pos], pos))
+        if erase_multiple:
+            return set(output)
+        return output
+
+    def adjacency_matrix(self, format: str = None, dtype=None,
+                         weight: str = "weight"):
+        """
+        Computes and return the adjacency matrix of the graph, where row i
+        corresponds to the vertex of index i.
+
+        Parameters
+        ----------
+            'format' : None, "dense", "csr" or "coo"
+                None returns the legacy list of lists. The other formats
+                return a numpy array or a scipy sparse matrix
+            'dtype' : numpy dtype of the values, inferred if None
+            'weight' : str or None
+                If not None, the stored edge weights are used as values.
+                Otherwise, entries count the edges
+
+        Returns
+        -------
+            With format None, a list of lists of shape (N*N) where N is the
+            number of vertices in the graph. Otherwise, a pair
+            (matrix, index) where index maps each Vertex to its row.
+        """
+        n = len(self._ids)
+        if format is not None:
+            rows, cols, vals = self.edge_arrays()
+            if weight is None or vals is None:
+                vals = np.ones(len(cols), dtype=np.int64)
+            index = {Vertex(i): k for (k, i) in enumerate(self._ids.tolist())}
+            return build_matrix(n, rows, cols, vals, format, dtype), index
+        matrix = [[0 for j in range(n)] for i in range(n)]
+        rows, cols, _ = self.edge_arrays()
+        for (i, j) in zip(rows.tolist(), cols.tolist()):
+            if self.multiple:
+                matrix[i][j] += 1
+            else:
+                matrix[i][j] = 1
+        return matrix
+
+    def get_neighbours(self, v):
+        """
+        Returns the vertices that are adjacent to v (out-neighbours for
+        oriented graphs)
+
+        Parameters
+        ----------
+            'v' : A Vertex object or an integer (vertex id)
+
+        Returns
+        -------
+            The set of neighbours of v
+        """
+        ids = self._ids[self.neighbours_index(self.index_of(v))]
+        return set(Vertex(u) for u in ids.tolist())
+
+    def get_neighbours_in(self, v):
+        """
+        Returns the vertices that can lead to v in an oriented graph
+
+        Parameters
+        ----------
+            'v' : A Vertex object or an integer (vertex id)
+
+        Returns
+        -------
+            The set of in-neighbours of v
+        """
+        ids = self._ids[self.neighbours_index_in(self.index_of(v))]
+        return set(Vertex(u) for u in ids.tolist())
+
+    def get_neighbours_edge(self, v):
+        """
+        Returns the edges of the graph that start from v
+
+        Parameters
+        ----------
+            'v' : A Vertex object or an integer (vertex id)
+
+        Returns
+        -------
+            The set of edges incident to v, or a list for multigraphs
+        """
+        i = self.index_of(v)
+        a = int(self._offsets[i])
+        output = [self._edge(i, j, a+k) for (k, j)
+                  in enumerate(self.neighbours_index(i).tolist())]
+        if self.multiple:
+            return output
+        return set(output)
+
+    def get_neighbours_edge_in(self, v):
+        """
+        Returns the edges of an oriented graph that lead to v
+
+        Parameters
+        ----------
+            'v' : A Vertex object or an integer (vertex id)
+
+        Returns
+        -------
+            The set of edges ending at v
+        """
+        i = self.index_of(v)
+        a = int(self._offsets_in[i])
+        output = set()
+        for (k, j) in enumerate(self.neighbours_index_in(i).tolist()):
+            e = Edge(self.vertex_at(j), self.vertex_at(i), oriented=True)
+            if self._weights_in is not None:
+                e["weight"] = float(self._weights_in[a+k])
+            output.add(e)
+        return output
+
+    def subgraph(self, vertices):
+        """
+        Extract a subgraph of the graph, containing the relevant vertices
+        and edges
+
+        Parameters
+        ----------
+        'vertices' : a container
+            Contains the relevant vertices
+
+        Returns
+        -------
+        A new FrozenGraph object
+        """
+        idx = np.unique(np.fromiter((self.index_of(v) for v in vertices),
+                                    dtype=np.int64))
+        return self._subgraph_index(idx)
+
+    def subgraph_view(self, vertices):
+        """
+        Builds a read-only view of the subgraph induced by the relevant
+        vertices, without copying any adjacency data
+
+        Parameters
+        ----------
+        'vertices' : an iterable of Vertex objects or integers
+
+        Returns
+        -------
+        A SubgraphView object
+        """
+        return SubgraphView(self, vertices)
+
+    def _subgraph_index(self, idx):
+        """
+        Subgraph induced by a sorted array of vertex indices. Runs in
+        O(k + sum of the degrees) without touching the rest of the graph.
+        """
+        k = len(idx)
+        if k == 0:
+            return FrozenGraph.from_arrays(self._ids[idx], [], [],
+                                           oriented=self.oriented,
+                                           multiple=self.multiple)
+        starts = self._offsets[idx].astype(np.int64)
+        deg = self._offsets[idx+1] - starts
+        total = int(deg.sum())
+        rows = np.repeat(np.arange(k, dtype=np.int64), deg)
+        first = np.zeros(k, dtype=np.int64)
+        np.cumsum(deg[:-1], out=first[1:])
+        pos = np.repeat(starts - first, deg) + np.arange(total)
+        targets = self._targets[pos]
+        cols = np.searchsorted(idx, targets)
+        cols[cols == k] = k-1
+        keep = idx[cols] == targets
+        weights = None
+        if self._weights is not None:
+            weights = self._weights[pos][keep]
+        return FrozenGraph.from_arrays(self._ids[idx], rows[keep],
+                                       cols[keep], weights,
+                                       oriented=self.oriented,
+                                       multiple=self.multiple)
+
+    def renumber(self):
+        """
+        Returns a copy of the graph where all the vertices have been renumbered
+        from 0 to n.
+
+        Returns
+        -------
+        A FrozenGraph Object
+        """
+        ids = np.arange(len(self._ids), dtype=np.int64)
+        return FrozenGraph(ids, self._offsets, self._targets, self._weights,
+                           self.oriented, self.multiple, self._offsets_in,
+                           self._targets_in, self._weights_in,
+                           _edge_attributes=self._edge_attributes)
+
+    # ---------------- Stats computations -----------------------------
+
+    def vertex_degree(self):
+        """
+        Returns the list of (out-)degrees of the vertices in the graph.
+
+        Returns:
+            A list of integers
+        """
+        return np.diff(self._offsets).tolist()
+
+    def degree_sequence(self):
+        """
+        Returns the list of degrees of the vertices in the graph sorted in
+        decreasing order
+
+        Returns:
+            A list of integers sorted in decreasing order
+        """
+        return sorted(self.vertex_degree(), reverse=True)
+
+    def find_isolated_vertices(self):
+        """
+        Returns the list of isolated vertices, that is vertices with degree 0
+
+        Returns:
+            A list of Vertex objects
+        """
+        deg = np.diff(self._offsets)
+        if self.oriented:
+            deg = deg + np.diff(self._offsets_in)
+        return [Vertex(i) for i in self._ids[deg == 0].tolist()]
+
+    def density(self):
+        """
+        Computes the density of the graph, defined as the proportion of edges
+        = {number of edges}/{total possible number of edges}
+
+        Returns:
+            The density of the graph
+        """
+        v_nb = len(self._ids)
+        e_nb = len(self.edges())
+        possible_edges = v_nb*(v_nb-1)
+        if not self.oriented:
+            possible_edges /= 2
+        return e_nb / possible_edges
+
+    def get_sources(self):
+        """
+        Gets the list of vertices that have in-degree 0
+        """
+        deg = np.diff(self._offsets_in)
+        return [Vertex(i) for i in self._ids[deg == 0].tolist()]
+
+    def get_sinks(self):
+        """
+        Gets the list of vertices that have out degree 0
+        """
+        deg = np.diff(self._offsets)
+        return [Vertex(i) for i in self._ids[deg == 0].tolist()]
+
+    def get_in_degrees(self):
+        deg = np.diff(self._offsets_in).tolist()
+        return {Vertex(i): d for (i, d) in zip(self._ids.tolist(), deg)}
+
+    def get_out_degrees(self):
+        deg = np.diff(self._offsets).tolist()
+        return {Vertex(i): d for (i, d) in zip(self._ids.tolist(), deg)}
@@ -1,8 +1,554 @@
-from random import random, randint, uniform, shuffle, choice
+import os
+import tempfile
+import numpy as np
 from .vertex_edge import Vertex, Edge
 from .graph import Graph
 from .orientedGraph import OrientedGraph
 from .multiGraph import MultiGraph
+from ._parallel import map_blocks
+from ._parsing import write_edge_tables
+
+_CHUNK = 1 << 22
+# expected number of edges of a block of work of the parallel generators
+_BLOCK = 1 << 20
+# bound on the number of block files open at once by the streams
+_MAX_FILES = 512
+
+
+def _rng(seed):
+    """
+    The numpy Generator of a 'seed' argument: None for fresh entropy from
+    the system, an int or a SeedSequence for a reproducible stream, or a
+    Generator used as is
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def _block_bounds(size: int, expected: float):
+    """
+    Cuts range(size) into blocks of about _BLOCK expected edges. The blocks
+    only depend on the size of the problem, never on the number of
+    workers.
+
+    Returns:
+        The list of the (start, stop) bounds of the blocks
+    """
+    count = max(1, min(int(np.ceil(expected / _BLOCK)), size))
+    bounds = [size*k // count for k in range(count + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _from_pairs(n: int, pairs, type: str = None):
+    """
+    Builds a graph of the vertices 0..n-1 from an integer array of shape
+    (m, 2) of edges, through the bulk from_edge_array constructors
+    """
+    cls = {"oriented": OrientedGraph,
+           "multiple": MultiGraph}.get(type, Graph)
+    g = cls.from_edge_array(pairs)
+    g.add_vertices_from(range(n))
+    return g
+
+
+def _gather(tables):
+    """
+    Concatenates a stream of edge arrays of shape (k, 2)
+    """
+    tables = list(tables)
+    if not tables:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.concatenate(tables)
+
+
+def _pairs_of_indices(k):
+    """
+    Converts indices of the n(n-1)/2 pairs of vertices into the pairs
+    (i, j), j < i, pair (i, j) having index i(i-1)/2 + j
+
+    Returns:
+        An int64 array of shape (len(k), 2)
+    """
+    k = np.asarray(k, dtype=np.int64)
+    i = ((1 + np.sqrt(8*k.astype(np.float64) + 1)) // 2).astype(np.int64)
+    # corrects the rounding of the square root for large indices
+    i -= i*(i - 1)//2 > k
+    i += (i + 1)*i//2 <= k
+    return np.stack((i, k - i*(i - 1)//2), axis=1)
+
+
+def _skip_sample(total: int, p: float, rng):
+    """
+    Indices of the successes of 'total' Bernoulli trials of probability p,
+    found by drawing the geometric gaps between successes (Batagelj and
+    Brandes) in O(total*p) time instead of drawing every trial
+
+    Returns:
+        A sorted int64 array of indices smaller than 'total'
+    """
+    if p <= 0 or total == 0:
+        return np.empty(0, dtype=np.int64)
+    expected = total*p
+    size = int(min(expected + 4*np.sqrt(expected) + 16, _CHUNK))
+    parts = []
+    last = -1
+    while last < total:
+        positions = last + np.cumsum(rng.geometric(p, size=size))
+        parts.append(positions[positions < total])
+        last = int(positions[-1])
+    return np.concatenate(parts)
+
+
+def _sample_indices(total: int, count: int, rng):
+    """
+    Draws 'count' distinct indices smaller than 'total' uniformly, by
+    drawing the missing ones with replacement and dropping the duplicates
+    until none is missing. When count > total/2, the complement is drawn
+    instead, so that the expected number of draws stays O(count).
+
+    Returns:
+        A sorted int64 array of 'count' indices
+    """
+    if count > total // 2:
+        return np.setdiff1d(np.arange(total, dtype=np.int64),
+                            _sample_indices(total, total - count, rng),
+                            assume_unique=True)
+    chosen = np.empty(0, dtype=np.int64)
+    while len(chosen) < count:
+        draws = rng.integers(0, total, size=count - len(chosen))
+        chosen = np.union1d(chosen, draws)
+    return chosen
+
+
+def _gnp_block(start: int, stop: int, p: float, rng):
+    """
+    Worker drawing the pairs of indices start..stop-1 of G(n, p)
+
+    Returns:
+        An int64 array of shape (m, 2)
+    """
+    return _pairs_of_indices(start + _skip_sample(stop - start, p, rng))
+
+
+def _permuted(values, rng):
+    """
+    Worker shuffling a block of the half-edges of the configuration model
+    """
+    return rng.permutation(values)
+
+
+def _cycle_tables(n: int, k: int):
+    """
+    Edges (i, i+j+1 mod n), 0 <= j < k, of the cycle by chunks of vertices
+    """
+    step = max(_CHUNK // max(k, 1), 1)
+    for first in range(0, n, step):
+        last = min(first + step, n)
+        sources = np.repeat(np.arange(first, last, dtype=np.int64), k)
+        steps = np.tile(np.arange(1, k + 1, dtype=np.int64), last - first)
+        yield np.stack((sources, (sources + steps) % n), axis=1)
+
+
+def _gnp_tables(n: int, p: float, rng):
+    """
+    Edges of G(n, p) by the blocks of erdos_renyi_proba, drawn one at a
+    time
+    """
+    total = n*(n - 1)//2
+    blocks = _block_bounds(total, total*p)
+    for ((a, b), stream) in zip(blocks, rng.spawn(len(blocks))):
+        yield _gnp_block(a, b, p, stream)
+
+
+# numpy draws hypergeometric variables from populations below this size
+_HYPERGEOMETRIC_LIMIT = 10**9
+
+
+def _split_count(sizes, count: int, rng):
+    """
+    Spreads 'count' items drawn without replacement over blocks of the
+    given sizes, following the multivariate hypergeometric distribution.
+    Populations too large for numpy are halved recursively, each half
+    receiving a hypergeometric share, or a binomial one (clipped to the
+    possible values) once a half exceeds the limit of numpy: its variance
+    only differs by the factor 1 - count/sum(sizes), which is negligible
+    for the sparse graphs with that many pairs.
+
+    Returns:
+        The list of the number of items of every block
+    """
+    total = sum(sizes)
+    if len(sizes) == 1:
+        return [count]
+    if total < _HYPERGEOMETRIC_LIMIT:
+        return rng.multivariate_hypergeometric(sizes, count,
+                                               method="marginals").tolist()
+    half = len(sizes) // 2
+    left = sum(sizes[:half])
+    right = total - left
+    if max(left, right) < _HYPERGEOMETRIC_LIMIT:
+        share = int(rng.hypergeometric(left, right, count))
+    else:
+        share = int(rng.binomial(count, left / total))
+        share = min(max(share, count - right), left, count)
+    return _split_count(sizes[:half], share, rng) + \
+        _split_count(sizes[half:], count - share, rng)
+
+
+def _gnm_tables(n: int, l: int, rng):
+    """
+    Edges of G(n, l) by blocks of pairs. The number of edges of every block
+    is drawn first (see _split_count), after which each block draws its
+    edges without replacement from its own stream, which is a uniform
+    choice of l pairs among all.
+    """
+    total = n*(n - 1)//2
+    if not 0 <= l <= total:
+        raise Exception("A graph of {} vertices has at most {} edges"
+                        .format(n, total))
+    blocks = _block_bounds(total, l)
+    counts = [l]
+    if len(blocks) > 1:
+        counts = _split_count([b - a for (a, b) in blocks], l, rng)
+    streams = rng.spawn(len(blocks))
+    for ((a, b), count, stream) in zip(blocks, counts, streams):
+        yield _pairs_of_indices(a + _sample_indices(b - a, count, stream))
+
+
+def _configuration_tables(seq, rng, directory=None, workers: int = 1):
+    """
+    Pairs of half-edges of the configuration model, streamed by
+    iter_configuration_model and gathered by configuration_model. The
+    half-edges, generated by chunks of vertices, are sent to random block
+    files, so that only one block is held in memory. Every block is
+    then read back, shuffled with its own stream and cut into pairs, an
+    odd half-edge being carried over to the next block. This is a uniform
+    shuffle of all the half-edges.
+
+    Parameters:
+        'seq' : int64 array of the degrees
+        'directory' : where the temporary block files are written, the
+            default temporary directory if None
+        'workers' : number of processes shuffling the blocks, read
+            'workers' at a time
+
+    Returns:
+        An iterator over int64 arrays of shape (k, 2)
+    """
+    total = int(seq.sum())
+    count = min(len(_block_bounds(total, total)), _MAX_FILES)
+    streams = rng.spawn(count)
+    if count == 1:
+        stubs = np.repeat(np.arange(len(seq), dtype=np.int64), seq)
+        yield streams[0].permutation(stubs).reshape(-1, 2)
+        return
+    ends = np.cumsum(seq)
+    with tempfile.TemporaryDirectory(dir=directory) as folder:
+        names = [os.path.join(folder, str(b)) for b in range(count)]
+        files = [open(name, "wb") for name in names]
+        try:
+            first = 0
+            while first < len(seq):
+                last = max(int(np.searchsorted(
+                    ends, ends[first] - seq[first] + _CHUNK, side="right")),
+                    first + 1)
+                stubs = np.repeat(np.arange(first, last, dtype=np.int64),
+                                  seq[first:last])
+                labels = rng.integers(0, count, size=len(stubs),
+                                      dtype=np.uint16)
+                stubs = stubs[np.argsort(labels, kind="stable")]
+                sizes = np.bincount(labels, minlength=count)
+                for (f, part) in zip(files, np.split(stubs,
+                                                     np.cumsum(sizes)[:-1])):
+                    f.write(part.tobytes())
+                first = last
+        finally:
+            for f in files:
+                f.close()
+        carry = np.empty(0, dtype=np.int64)
+        step = max(workers, 1)
+        for start in range(0, count, step):
+            calls = [(np.fromfile(name, dtype=np.int64), stream)
+                     for (name, stream) in zip(names[start:start + step],
+                                               streams[start:start + step])]
+            for name in names[start:start + step]:
+                os.remove(name)
+            for block in map_blocks(_permuted, calls, workers):
+                block = np.concatenate((carry, block))
+                cut = len(block) - len(block) % 2
+                carry = block[cut:]
+                yield block[:cut].reshape(-1, 2)
+
+
+def _components(n: int, pairs):
+    """
+    Labels the connected components of the graph of the vertices 0..n-1
+    and the edges 'pairs' with a union-find
+
+    Returns:
+        The list of the smallest vertex of each component, in increasing
+        order
+    """
+    parent = list(range(n))
+
+    def find(v):
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+    for (a, b) in pairs.tolist():
+        a, b = find(a), find(b)
+        if a != b:
+            parent[max(a, b)] = min(a, b)
+    return [v for v in range(n) if find(v) == v]
+
+
+def _barabasi_albert_tables(n: int, m: int, s: int, rng, targets=None):
+    """
+    Edges of a Barabasi-Albert graph, vertex i >= s being linked to m
+    distinct earlier vertices chosen proportionally to their degree.
+
+    The array of the ends of all edges, in which a uniform position is a
+    vertex drawn proportionally to its degree, is never built: vertex i
+    owns the 2m slots (i, t_1, i, t_2, ...) after the 2e slots of the e
+    edges of the seed graph. Its targets are drawn as uniform positions
+    before its slots. A position on a source slot is vertex i itself, and
+    a position on a target slot is the target drawn for that slot.
+
+    The draws are resolved by chunks of vertices. A draw falling in an
+    earlier chunk is read from the targets already known, and copies
+    inside the chunk are followed with vectorized passes, each going
+    back in the array. Targets drawn twice by the same vertex are drawn
+    again.
+
+    Parameters:
+        'targets' : int64 array of length m(n-s) where the targets are
+            kept, a memmap for streams larger than memory. Allocated in
+            memory if None
+
+    Returns:
+        An iterator over int64 arrays of shape (k, 2): the edges of the
+        seed graph, then those of the new vertices by chunks
+    """
+    seed = _pairs_of_indices(_sample_indices(s*(s - 1)//2, s*m // 2, rng))
+    roots = _components(s, seed)
+    seed = np.concatenate((seed, np.stack(
+        (np.full(len(roots) - 1, roots[0]), roots[1:]), axis=1
+    ).astype(np.int64).reshape(-1, 2)))
+    yield seed
+    if n <= s or m == 0:
+        return
+    offset = 2*len(seed)
+    ends = seed.ravel()
+    size = m*(n - s)
+    if targets is None:
+        targets = np.empty(size, dtype=np.int64)
+    step = max(_CHUNK // m, 1)*m
+    for first in range(0, size, step):
+        last = min(first + step, size)
+        sources = s + np.arange(first, last, dtype=np.int64) // m
+        # a draw for vertex i is uniform among the slots written before i
+        bounds = offset + 2*m*(sources - s)
+        draws = np.empty(last - first, dtype=np.int64)
+        redraw = np.arange(last - first)
+        while len(redraw):
+            draws[redraw] = (rng.random(len(redraw))
+                             * bounds[redraw]).astype(np.int64)
+            positions = draws.copy()
+            # copies of target slots of the chunk
+            todo = np.flatnonzero(positions >= offset + 2*first)
+            while len(todo):
+                slot = positions[todo] - offset
+                todo = todo[slot % 2 == 1]
+                positions[todo] = draws[(positions[todo] - offset)//2
+                                        - first]
+                todo = todo[positions[todo] >= offset + 2*first]
+            slot = positions - offset
+            chunk = np.where(slot < 0, ends[np.minimum(positions, offset-1)],
+                             s + slot // (2*m))
+            known = (slot >= 0) & (slot % 2 == 1)
+            chunk[known] = targets[slot[known] // 2]
+            targets[first:last] = chunk
+            groups = np.sort(chunk.reshape(-1, m), axis=1)
+            twice = np.flatnonzero(np.any(groups[:, 1:] == groups[:, :-1],
+                                          axis=1))
+            redraw = (twice[:, None]*m + np.arange(m)).ravel()
+        yield np.stack((sources, chunk), axis=1)
+
+
+def _barabasi_albert_stream(n: int, m: int, s: int, rng, directory=None):
+    """
+    _barabasi_albert_tables with the targets kept in a memory-mapped
+    temporary file of 'directory'
+    """
+    size = m*max(n - s, 0)
+    if size == 0:
+        yield from _barabasi_albert_tables(n, m, s, rng)
+        return
+    with tempfile.TemporaryDirectory(dir=directory) as folder:
+        targets = np.memmap(os.path.join(folder, "targets.bin"),
+                            dtype=np.int64, mode="w+", shape=(size,))
+        yield from _barabasi_albert_tables(n, m, s, rng, targets)
+        del targets
+
+
+def _seed_size(m: int, s: int) -> int:
+    """
+    Size of the seed graph of the Barabasi-Albert model, 2m by default
+    """
+    if s is None:
+        s = max(2*m, 1)
+    if 0 < m and s <= m:
+        raise Exception("The initial graph should have more than m nodes")
+    return s
+
+
+def _rmat_block(count: int, scale: int, a: float, b: float, c: float,
+                rng):
+    """
+    Worker drawing 'count' edges of an R-MAT graph of 2^scale vertices:
+    every edge goes down the levels of the adjacency matrix, choosing at
+    each level one of its four quadrants with the probabilities a, b, c and
+    1 - a - b - c, for all the edges at once
+
+    Returns:
+        An int64 array of shape (count, 2)
+    """
+    rows = np.zeros(count, dtype=np.int64)
+    cols = np.zeros(count, dtype=np.int64)
+    for _ in range(scale):
+        r = rng.random(count)
+        down = r >= a + b
+        right = ((r >= a) & ~down) | (r >= a + b + c)
+        rows <<= 1
+        rows += down
+        cols <<= 1
+        cols += right
+    return np.stack((rows, cols), axis=1)
+
+
+def _rmat_calls(scale: int, edge_factor: int, a: float, b: float, c: float,
+                rng):
+    """
+    Blocks of work of the R-MAT generator, each with its own stream
+    """
+    if min(a, b, c, 1 - a - b - c) < 0:
+        raise Exception("The probabilities of the quadrants should be "
+                        "non negative and sum to 1")
+    blocks = _block_bounds(edge_factor << scale, edge_factor << scale)
+    return [(stop - start, scale, a, b, c, r) for ((start, stop), r)
+            in zip(blocks, rng.spawn(len(blocks)))]
+
+
+def _sbm_block(start: int, stop: int, p: float, row: int, col: int,
+               width, rng):
+    """
+    Worker drawing the pairs of indices start..stop-1 of a pair of blocks
+    of the stochastic block model. Inside a block ('width' None) the pairs
+    are numbered as in G(n, p), between two blocks as the entries of the
+    n_r x n_s matrix, 'width' being n_s.
+
+    Returns:
+        An int64 array of shape (m, 2) of vertex ids
+    """
+    indices = start + _skip_sample(stop - start, p, rng)
+    if width is None:
+        return _pairs_of_indices(indices) + row
+    return np.stack((row + indices // width, col + indices % width), axis=1)
+
+
+def _sbm_calls(sizes, probabilities, rng):
+    """
+    Blocks of work of the stochastic block model: every pair of blocks r <= s
+    is cut into blocks of about 10^6 expected edges, each with its own
+    stream
+
+    Returns:
+        The number of vertices and the list of the calls of _sbm_block
+    """
+    sizes = [int(x) for x in sizes]
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    k = len(sizes)
+    if probabilities.shape != (k, k) or \
+            not np.allclose(probabilities, probabilities.T):
+        raise Exception("The probabilities should be a symmetric matrix "
+                        "of the size of the number of blocks")
+    offsets = np.concatenate(([0], np.cumsum(sizes))).tolist()
+    tasks = []
+    for r in range(k):
+        for t in range(r, k):
+            p = min(max(float(probabilities[r, t]), 0), 1)
+            width = None if r == t else sizes[t]
+            total = sizes[r]*(sizes[r] - 1)//2 if r == t \
+                else sizes[r]*sizes[t]
+            tasks += [(a, b, p, offsets[r], offsets[t], width)
+                      for (a, b) in _block_bounds(total, total*p)]
+    streams = rng.spawn(len(tasks))
+    return offsets[-1], [task + (r,) for (task, r) in zip(tasks, streams)]
+
+
+def _lattice_tables(shape, periodic: bool):
+    """
+    Edges of the grid of the given shape, vertex ids being the row-major
+    indices of the cells, by axis. With 'periodic', the cells of the first
+    and last layers of every axis longer than 2 are linked as in a torus.
+    """
+    ids = np.arange(int(np.prod(shape)), dtype=np.int64).reshape(shape)
+    for (axis, size) in enumerate(shape):
+        ends = [(ids.take(range(0, size - 1), axis=axis),
+                 ids.take(range(1, size), axis=axis))]
+        if periodic and size > 2:
+            ends.append((ids.take([size - 1], axis=axis),
+                         ids.take([0], axis=axis)))
+        for (a, b) in ends:
+            yield np.stack((a.ravel(), b.ravel()), axis=1)
+
+
+def _watts_strogatz_pairs(N: int, k: int, beta: float, rng):
+    """
+    Edges of a Watts-Strogatz graph: the edges (i, i+d), 1 <= d <= k/2,
+    of the ring lattice are visited in order, and with probability beta
+    the end i+d is moved to a uniform vertex t, drawn again while t is i or
+    a neighbour of i.
+
+    Only the rewired edges are visited by Python code. Lattice edges are
+    recognized by the distance of their ends on the ring, so that the
+    sets of removed and added edges stay of the size of the rewiring.
+
+    Returns:
+        An int64 array of shape (N*k/2, 2)
+    """
+    half = k // 2
+    starts = np.repeat(np.arange(N, dtype=np.int64), half)
+    ends = (starts + np.tile(np.arange(1, half + 1), N)) % N
+    moved = np.flatnonzero(rng.random(len(starts)) < beta)
+    degree = [k]*N
+    removed, added = set(), set()
+
+    def adjacent(a, b):
+        key = (min(a, b), max(a, b))
+        if key in added:
+            return True
+        return min((a - b) % N, (b - a) % N) <= half and key not in removed
+    draws = iter(())
+    for e in moved.tolist():
+        i, j = int(starts[e]), int(ends[e])
+        if degree[i] >= N - 1:
+            continue
+        while True:
+            t = next(draws, None)
+            if t is None:
+                draws = iter(rng.integers(0, N, size=len(moved)+16).tolist())
+                continue
+            if t != i and not adjacent(i, t):
+                break
+        removed.add((min(i, j), max(i, j)))
+        added.add((min(i, t), max(i, t)))
+        degree[j] -= 1
+        degree[t] += 1
+        ends[e] = t
+    return np.stack((starts, ends), axis=1)
 
 
 class GraphGenerator:
@@ -59,11 +605,7 @@ class GraphGenerator:
         -------
             A new Graph Object
         """
-        g = GraphGenerator.empty(n, type=type)
-        for i in range(n):
-            for j in range(k):
-                g.add_edge(i, (i+j+1) % n)
-        return g
+        return _from_pairs(n, _gather(_cycle_tables(n, k)), type=type)
 
     @staticmethod
     def clique(n: int, type: str = None):
@@ -84,16 +626,20 @@ class GraphGenerator:
             A new Graph Object
         """
         g = GraphGenerator.empty(n, type=type)
-        for i in range(n):
-            for j in range(i):
-                g.add_edge(i, j)
-                g.add_edge(j, i)
+        g.add_edges_from(pair for i in range(n) for j in range(i)
+                         for pair in ((i, j), (j, i)))
         return g
 
     @staticmethod
-    def erdos_renyi_proba(n: int, p: float):
+    def erdos_renyi_proba(n: int, p: float, seed=None, workers: int = 1):
         """
         Generates a graph through the Erdös-Renyi model.
+        Only the edges present are drawn, by skipping geometric gaps over
+        the n(n-1)/2 pairs, in O(n + m) time.
+
+        The pairs are cut into blocks of about 10^6 expected edges, each
+        drawn from its own stream spawned from 'seed', so that a seed gives
+        the same graph whatever the number of workers.
 
         Parameters:
             'n' : int
@@ -102,22 +648,30 @@ class GraphGenerator:
             'p' : float between 0 and 1
                 The probability for each edge to be present in the graph
 
+            'seed' : None, int, numpy SeedSequence or Generator
+                The source of randomness. None draws fresh entropy
+
+            'workers' : int
+                Number of processes drawing the blocks
+
         Returns:
             A new Graph Object
         """
         p = min(max(p, 0), 1)
-        g = GraphGenerator.empty(n)
-        for i in range(n):
-            for j in range(i):
-                if random() <= p:
-                    g.add_edge(i, j)
-        return g
+        total = n*(n - 1)//2
+        blocks = _block_bounds(total, total*p)
+        streams = _rng(seed).spawn(len(blocks))
+        parts = map_blocks(_gnp_block, [(a, b, p, r) for ((a, b), r)
+                                        in zip(blocks, streams)], workers)
+        return _from_pairs(n, np.concatenate(parts))
 
     @staticmethod
-    def erdos_renyi_edge(n: int, l: int):
+    def erdos_renyi_edge(n: int, l: int, seed=None):
         """
         Generates a graph through the Erdös-Renyi model with fixed number
-        of edges
+        of edges. The l edges are drawn without replacement among the
+        n(n-1)/2 pairs in O(n + l) expected time, by blocks of about 10^6
+        edges (see iter_erdos_renyi_edge).
 
         Parameters:
             'n' : int
@@ -126,18 +680,16 @@ class GraphGenerator:
             'l' : int
                 Number of edges
 
+            'seed' : None, int, numpy SeedSequence or Generator
+                The source of randomness. None draws fresh entropy
+
         Returns:
             A new Graph Object
         """
-        adj = [[0 for i in range(n)] for j in range(n)]
-        possible_edges = [(i, j) for j in range(n) for i in range(j)]
-        for i in range(l):
-            (a, b) = possible_edges.pop(randint(0, len(possible_edges) - 1))
-            adj[a][b] = 1
-        return Graph.from_adjacency_matrix(adj)
+        return _from_pairs(n, _gather(_gnm_tables(n, l, _rng(seed))))
 
     @staticmethod
-    def barabasi_albert(n, m, s=None):
+    def barabasi_albert(n, m, s=None, seed=None):
         """
         Returns a graph built by the Barabasi-Albert model.
 
@@ -153,43 +705,32 @@ class GraphGenerator:
                 size of the small random graph used as initializer
                 if unspecified, default to 2*m
 
+            'seed' : None, int, numpy SeedSequence or Generator
+                The source of randomness. None draws fresh entropy
+
         Returns
         -------
         A new Graph object
         """
-        from graphtool.algorithms.search import get_connected_components
-        if s is None:
-            s = max(2*m, 1)
-        G = GraphGenerator.erdos_renyi_edge(s, s*m // 2)
-        comp = get_connected_components(G)
-        if len(comp) > 1:
-            v1 = list(comp[0].vertices())[0]
-            for i in range(1, len(comp)):
-                v = list(comp[i].vertices())[0]
-                G.add_edge(v1, v)
-        assert (len(get_connected_components(G)) == 1)
-        degdistribution = sum(([j]*len(G._dict[j]) for j in G._dict), [])
-        for i in range(s, n):
-            G.add_vertex(i)
-            mult = 0
-            for _ in range(m):
-                neighbour = degdistribution[randint(
-                    0, len(degdistribution) - 1)]
-                if neighbour not in G.get_neighbours(i):
-                    G.add_edge(Vertex(i), Vertex(neighbour))
-                    degdistribution.append(neighbour)
-                    mult += 1
-            degdistribution += [i] * mult
-        return G
+        s = _seed_size(m, s)
+        return _from_pairs(max(n, s), _gather(
+            _barabasi_albert_tables(n, m, s, _rng(seed))))
 
     @staticmethod
-    def configuration_model(seq, allow_multiple=False):
+    def configuration_model(seq, allow_multiple=False, seed=None,
+                            workers: int = 1):
         """
         Returns a graph built by the Molloy-Reed generation process.
         In this process, we feed the degree distribution. Each node is asigned
         a given degree according to this distribution.
         We then merge half-edges uniformly until there is no half-edge left.
 
+        The half-edges are shuffled by sending each one to a random block
+        of about 10^6 half-edges and shuffling every block with its own
+        stream spawned from 'seed', which is a uniform shuffle whatever the
+        number of workers. The blocks are those of iter_configuration_model,
+        which gives the same pairs for the same seed.
+
         Parameters
         ---------
             'seq' : container
@@ -197,36 +738,30 @@ class GraphGenerator:
 
             'allow_multiple' : boolean (default to False)
                 If set to False, will merge multiple edges between the same
-                pair of vertices into a single one
+                pair of vertices into a single one, and drop the loops
+
+            'seed' : None, int, numpy SeedSequence or Generator
+                The source of randomness. None draws fresh entropy
+
+            'workers' : int
+                Number of processes shuffling the blocks
 
         Returns
         -------
         A new Graph object
         """
-        if sum(seq) % 2 != 0:
+        seq = np.asarray(seq, dtype=np.int64)
+        if seq.sum() % 2 != 0:
             raise Exception("The sum of degrees should be even!")
         n = len(seq)
+        pairs = _gather(_configuration_tables(seq, _rng(seed),
+                                              workers=workers))
         if allow_multiple:
-            graph_dict = {Vertex(i): [] for i in range(n)}
-        else:
-            graph_dict = {Vertex(i): set() for i in range(n)}
-        seq2 = []
-        for i in range(n):
-            seq2 += [i]*seq[i]
-        m = len(seq2)//2
-        shuffle(seq2)
-        seq2 = [Vertex(x) for x in seq2]
-        for i in range(m):
-            if allow_multiple:
-                graph_dict[seq2[2*i]].append(seq2[2*i+1])
-            else:
-                graph_dict[seq2[2*i]].add(seq2[2*i+1])
-        if allow_multiple:
-            return MultiGraph(graph_dict)
-        return Graph(graph_dict)
+            return _from_pairs(n, pairs, type="multiple")
+        return _from_pairs(n, pairs[pairs[:, 0] != pairs[:, 1]])
 
     @staticmethod
-    def watts_strogatz(N: int, k: int, beta: float):
+    def watts_strogatz(N: int, k: int, beta: float, seed=None):
         """
         Returns a graph built by the Watts-Strogatz method.
         In this process, we build a regular ring lattice, and move edges with
@@ -243,26 +778,266 @@ class GraphGenerator:
             'beta' : float
                 The probability of moving each edge
 
+            'seed' : None, int, numpy SeedSequence or Generator
+                The source of randomness. None draws fresh entropy
+
         Returns
         -------
             A new Graph object
         """
         if k % 2 != 0:
             raise Exception("The mean degree must be even")
-        G = GraphGenerator.cycle(N, int(k / 2))
-
-        for i in range(N):
-            neigh = G.get_neighbours(i)
-            for j in neigh:
-                if i < j:
-                    if random() <= beta:
-                        # List all possible edges
-                        targets = [t for t in range(
-                            N) if t != i and t not in neigh]
-                        # Select the one to add
-                        t = choice(targets)
-                        # Remove it
-                        G.remove_edge(i, j)
-                        # Add the new one
-                        G.add_edge(i, t)
-        return G
+        return _from_pairs(N, _watts_strogatz_pairs(N, k, beta, _rng(seed)))
+
+    @staticmethod
+    def rmat(scale: int, edge_factor: int = 16, a: float = 0.57,
+             b: float = 0.19, c: float = 0.19, type: str = None,
+             scramble: bool = True, seed=None, workers: int = 1):
+        """
+        Generates a graph of 2^scale vertices through the R-MAT model, the
+        Kronecker generator of the Graph500 benchmark whose default
+        parameters are used. Each of the edge_factor * 2^scale edges picks
+        recursively one of the four quadrants of the adjacency matrix with
+        the probabilities a, b, c and 1 - a - b - c, which gives the skewed
+        degrees of real networks.
+
+        The edges are drawn by blocks of 10^6, each from its own stream
+        spawned from 'seed', so that a seed gives the same graph whatever
+        the number of workers.
+
+        Parameters:
+            'scale' : int
+                Logarithm in base 2 of the number of vertices
+
+            'edge_factor' : int
+                Number of edges drawn per vertex
+
+            'a', 'b', 'c' : float
+                Probabilities of the top left, top right and bottom left
+                quadrants
+
+            'type' : str
+                The type of the graph to be returned.
+                Type can be "simple", "oriented" or "multiple". Loops are
+                dropped, and so are duplicated edges unless "multiple"
+
+            'scramble' : bool
+                If True, vertex ids are randomly permuted as in Graph500,
+                so that the degree does not depend on the id
+
+            'seed' : None, int, numpy SeedSequence or Generator
+                The source of randomness. None draws fresh entropy
+
+            'workers' : int
+                Number of processes drawing the blocks
+
+        Returns:
+            A new Graph Object
+        """
+        rng = _rng(seed)
+        permutation = rng.permutation(1 << scale) if scramble else None
+        pairs = _gather(map_blocks(_rmat_block, _rmat_calls(
+            scale, edge_factor, a, b, c, rng), workers))
+        if permutation is not None:
+            pairs = permutation[pairs]
+        if type != "multiple":
+            pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+        return _from_pairs(1 << scale, pairs, type=type)
+
+    @staticmethod
+    def stochastic_block_model(sizes, probabilities, seed=None,
+                               workers: int = 1):
+        """
+        Generates a graph through the stochastic block model: the vertices
+        are cut into consecutive blocks of the given sizes, and two
+        vertices of blocks r and s are linked with probability
+        probabilities[r][s]. Every pair of blocks is sampled as G(n, p),
+        by skipping geometric gaps, in O(n + m) expected time.
+
+        The pairs of blocks are cut into blocks of about 10^6 expected
+        edges, each drawn from its own stream spawned from 'seed', so that
+        a seed gives the same graph whatever the number of workers.
+
+        Parameters:
+            'sizes' : list of int
+                The number of vertices of every block
+
+            'probabilities' : symmetric matrix of floats between 0 and 1
+                The probability of an edge between two vertices of every
+                pair of blocks
+
+            'seed' : None, int, numpy SeedSequence or Generator
+                The source of randomness. None draws fresh entropy
+
+            'workers' : int
+                Number of processes drawing the blocks
+
+        Returns:
+            A new Graph Object
+        """
+        n, calls = _sbm_calls(sizes, probabilities, _rng(seed))
+        return _from_pairs(n, _gather(map_blocks(_sbm_block, calls,
+                                                 workers)))
+
+    @staticmethod
+    def lattice(shape, periodic: bool = False, type: str = None):
+        """
+        Builds the grid of the given shape, in any dimension, vertex i
+        being the cell of row-major index i, linked to the cells next to it
+        along every axis. With 'periodic', the grid is closed into a torus.
+
+        Parameters:
+            'shape' : tuple of int
+                The number of cells along every axis, as (rows, columns)
+                for a 2D grid or (x, y, z) for a 3D one
+
+            'periodic' : bool
+                If True, the first and last cells of every axis are linked
+
+            'type' : str
+                The type of the graph to be returned.
+                Type can be "simple", "oriented" or "multiple"
+
+        Returns:
+            A new Graph Object
+        """
+        shape = tuple(int(x) for x in shape)
+        return _from_pairs(int(np.prod(shape)),
+                           _gather(_lattice_tables(shape, periodic)),
+                           type=type)
+
+    # ---------------- Streams of edges -----------------------------
+
+    @staticmethod
+    def iter_cycle(n: int, k: int = 1):
+        """
+        Edges of cycle(n, k), without building the graph
+
+        Returns:
+            An iterator over int64 arrays of shape (m, 2) of vertex ids
+        """
+        return _cycle_tables(n, k)
+
+    @staticmethod
+    def iter_erdos_renyi_proba(n: int, p: float, seed=None):
+        """
+        Edges of erdos_renyi_proba(n, p, seed), without building the graph.
+        Only one block of about 10^6 edges is held in memory at once.
+
+        Returns:
+            An iterator over int64 arrays of shape (m, 2) of vertex ids
+        """
+        return _gnp_tables(n, min(max(p, 0), 1), _rng(seed))
+
+    @staticmethod
+    def iter_erdos_renyi_edge(n: int, l: int, seed=None):
+        """
+        Edges of erdos_renyi_edge(n, l, seed), without building the graph.
+        The number of edges of every block of pairs is drawn first, so that
+        only one block of about 10^6 edges is held in memory at once.
+
+        Returns:
+            An iterator over int64 arrays of shape (m, 2) of vertex ids
+        """
+        return _gnm_tables(n, l, _rng(seed))
+
+    @staticmethod
+    def iter_barabasi_albert(n: int, m: int, s: int = None, seed=None,
+                             directory: str = None):
+        """
+        Edges of barabasi_albert(n, m, s, seed), without building the
+        graph. The m(n-s) targets drawn so far, which later draws copy, are
+        kept in a memory-mapped temporary file.
+
+        Parameters:
+            'directory' : where the temporary file is written, the default
+                temporary directory if None
+
+        Returns:
+            An iterator over int64 arrays of shape (k, 2) of vertex ids
+        """
+        s = _seed_size(m, s)
+        return _barabasi_albert_stream(n, m, s, _rng(seed), directory)
+
+    @staticmethod
+    def iter_configuration_model(seq, seed=None, directory: str = None):
+        """
+        Pairs of half-edges of the configuration model of the degree
+        sequence 'seq', loops and multiple edges included as in
+        configuration_model(seq, allow_multiple=True), without building the
+        graph. The half-edges are shuffled through temporary block files,
+        so that only the degree sequence and one block are held in memory.
+
+        Parameters:
+            'directory' : where the temporary files are written, the
+                default temporary directory if None
+
+        Returns:
+            An iterator over int64 arrays of shape (k, 2) of vertex ids
+        """
+        seq = np.asarray(seq, dtype=np.int64)
+        if seq.sum() % 2 != 0:
+            raise Exception("The sum of degrees should be even!")
+        return _configuration_tables(seq, _rng(seed), directory)
+
+    @staticmethod
+    def iter_rmat(scale: int, edge_factor: int = 16, a: float = 0.57,
+                  b: float = 0.19, c: float = 0.19, scramble: bool = True,
+                  seed=None):
+        """
+        Edges of rmat(...) as drawn, loops and duplicated edges included as
+        in the Graph500 edge lists, without building the graph. Only one
+        block of 10^6 edges is held in memory at once.
+
+        Returns:
+            An iterator over int64 arrays of shape (m, 2) of vertex ids
+        """
+        rng = _rng(seed)
+        permutation = rng.permutation(1 << scale) if scramble else None
+        calls = _rmat_calls(scale, edge_factor, a, b, c, rng)
+        if permutation is None:
+            return (_rmat_block(*call) for call in calls)
+        return (permutation[_rmat_block(*call)] for call in calls)
+
+    @staticmethod
+    def iter_stochastic_block_model(sizes, probabilities, seed=None):
+        """
+        Edges of stochastic_block_model(sizes, probabilities, seed),
+        without building the graph. Only one block of about 10^6 edges is
+        held in memory at once.
+
+        Returns:
+            An iterator over int64 arrays of shape (m, 2) of vertex ids
+        """
+        _, calls = _sbm_calls(sizes, probabilities, _rng(seed))
+        return (_sbm_block(*call) for call in calls)
+
+    @staticmethod
+    def iter_lattice(shape, periodic: bool = False):
+        """
+        Edges of lattice(shape, periodic), without building the graph
+
+        Returns:
+            An iterator over int64 arrays of shape (m, 2) of vertex ids
+        """
+        return _lattice_tables(tuple(int(x) for x in shape), periodic)
+
+    @staticmethod
+    def write_edges(filename: str, tables, binary: bool = False) -> int:
+        """
+        Streams the edge arrays of an iter_ generator to a file, one array
+        at a time, without building a graph.
+
+        Parameters:
+            'filename' : path of the file. Text files ending with .gz, .bz2
+                or .xz are compressed
+            'tables' : an iterable of integer arrays of shape (m, 2)
+            'binary' : if True, the edges are written as little endian
+                int64 pairs, read back by
+                np.fromfile(filename, dtype="<i8").reshape(-1, 2).
+                Otherwise, as an edge list read by from_edge_list
+
+        Returns:
+            The number of edges written
+        """
+        return write_edge_tables(filename, tables, binary)
@@ -0,0 +1,303 @@
+import os
+import pickle
+import re
+import struct
+import numpy as np
+from .vertex_edge import Vertex
+from ._parsing import _edge_batch
+
+MAGIC = b"GTJRNL\x00\x01"
+
+# operations of the records
+ADD_VERTEX, REMOVE_VERTEX, ADD_EDGE, REMOVE_EDGE = range(1, 5)
+
+# a record: operation, ids of the vertex or of the ends of the edge, and
+# weight of an added edge (NaN when not given)
+RECORD = np.dtype([("op", "u1"), ("a", "<i8"), ("b", "<i8"), ("w", "<f8")])
+_STRUCT = struct.Struct("<Bqqd")
+
+
+def _id(v) -> int:
+    return v.id if isinstance(v, Vertex) else int(v)
+
+
+def _weight(w) -> float:
+    # weights of 1 are the default and are not stored
+    return np.nan if w is None or w == 1 else float(w)
+
+
+def read_records(filename: str):
+    """
+    Reads the records of a journal file. A record cut by a crash at the end
+    of the file is ignored.
+
+    Returns:
+        A structured numpy array of dtype RECORD
+    """
+    if not os.path.exists(filename):
+        return np.empty(0, dtype=RECORD)
+    with open(filename, "rb") as f:
+        if f.read(len(MAGIC)) not in (MAGIC, b""):
+            raise Exception("Not a graph journal: "+filename)
+        data = f.read()
+    count = len(data) // RECORD.itemsize
+    return np.frombuffer(data, dtype=RECORD, count=count)
+
+
+def replay(graph, records) -> None:
+    """
+    Applies journal records to a graph. Runs of records of the same
+    operation are applied at once by the bulk methods of the graph.
+    """
+    if len(records) == 0:
+        return
+    bounds = np.flatnonzero(records["op"][1:] != records["op"][:-1]) + 1
+    for run in np.split(records, bounds):
+        op = run["op"][0]
+        a, b, w = run["a"], run["b"], run["w"]
+        if op == ADD_VERTEX:
+            graph.add_vertices_from(a.tolist())
+        elif op == REMOVE_VERTEX:
+            graph.remove_vertices(a.tolist())
+        elif op == REMOVE_EDGE:
+            graph.remove_edges_from(np.stack((a, b), axis=1))
+        elif op == ADD_EDGE and np.all(np.isnan(w)):
+            graph.add_edges_from(np.stack((a, b), axis=1))
+        elif op == ADD_EDGE:
+            graph.add_edges_from([(x, y) if z != z else (x, y, z) for
+                                  (x, y, z) in zip(a.tolist(), b.tolist(),
+                                                   w.tolist())])
+        else:
+            raise Exception("Unknown journal operation {}".format(op))
+
+
+class Journal:
+    """
+    An append-only journal of the mutations of a graph, kept in a directory
+    next to a snapshot of the graph.
+
+    Once attached, every add_vertex, remove_vertex, add_edge, remove_edge
+    and bulk version of the graph appends binary records of 25 bytes
+    (operation, vertex ids, weight). Records are buffered and written with
+    one fsync every 'sync_every' records, so that a crash loses at most the
+    last batch. compact() writes the pickle of the graph as a new snapshot
+    and starts an empty journal; load() restores the graph from the last
+    snapshot and the journal written since.
+
+    NOTE : Only the structure and the edge weights are journaled. Other
+    vertex and edge data set after the last snapshot are not restored.
+
+    The files of generation g are snapshot-g.pickle and journal-g.log.
+    Generation g+1 is complete before the files of generation g are
+    removed, so that a journal is never replayed on a snapshot that already
+    contains it.
+    """
+
+    def __init__(self, directory: str, sync_every: int = 1024,
+                 compact_every: int = None):
+        """
+        Parameters:
+            'directory' : the directory of the snapshot and journal files
+            'sync_every' : number of records written at once with an fsync
+            'compact_every' : if given, number of journal records after
+                which a new snapshot is written
+
+        self.graph : the graph the journal is attached to, or None
+        self._generation : generation of the current snapshot, 0 before
+            the first one
+        self._buffer : records not yet written
+        self._size : number of records written since the snapshot
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.sync_every = sync_every
+        self.compact_every = compact_every
+        self.graph = None
+        self._generation = max(
+            [int(m.group(1)) for m in map(
+                re.compile(r"snapshot-(\d+)\.pickle$").match,
+                os.listdir(directory)) if m] or [0])
+        self._buffer = bytearray()
+        self._pending = 0
+        self._size = 0
+        self._file = None
+
+    def _path(self, kind: str, generation: int) -> str:
+        extension = "pickle" if kind == "snapshot" else "log"
+        return os.path.join(self.directory, "{}-{}.{}".format(
+            kind, generation, extension))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # ---------------- Attachment -----------------------------
+
+    def load(self, cls=None):
+        """
+        Restores the graph saved in the directory: loads the last snapshot,
+        replays the journal written since and attaches the journal to the
+        graph.
+
+        Parameters:
+            'cls' : class of the empty graph created, with its first
+                snapshot, when the directory holds no snapshot yet (Graph
+                by default)
+
+        Returns:
+            The restored graph
+        """
+        if self._generation == 0:
+            if cls is None:
+                from .graph import Graph
+                cls = Graph
+            graph = cls(dict())
+            self.attach(graph)
+            return graph
+        with open(self._path("snapshot", self._generation), "rb") as f:
+            graph = pickle.load(f)
+        records = read_records(self._path("journal", self._generation))
+        replay(graph, records)
+        self._open(len(records))
+        self.graph = graph
+        graph._journal = self
+        return graph
+
+    def attach(self, graph) -> None:
+        """
+        Attaches the journal to a graph, whose first snapshot is written at
+        once. The previous content of the directory is replaced.
+        """
+        if self.graph is not None:
+            self.graph._journal = None
+        self.graph = graph
+        graph._journal = self
+        self.compact()
+
+    def _open(self, size: int) -> None:
+        """
+        Opens the journal of the current generation for appending, cutting
+        a record left incomplete by a crash
+        """
+        path = self._path("journal", self._generation)
+        self._file = open(path, "ab")
+        end = len(MAGIC) + size*RECORD.itemsize
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        elif self._file.tell() != end:
+            self._file.truncate(end)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._size = size
+
+    def close(self) -> None:
+        """
+        Writes the pending records and detaches the journal from its graph
+        """
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+        if self.graph is not None:
+            self.graph._journal = None
+            self.graph = None
+
+    # ---------------- Writing -----------------------------
+
+    def _append(self, data: bytes, count: int) -> None:
+        self._buffer += data
+        self._pending += count
+        if self._pending >= self.sync_every:
+            self.sync()
+
+    def _append_array(self, op: int, a, b=None, w=None) -> None:
+        records = np.zeros(len(a), dtype=RECORD)
+        records["op"] = op
+        records["a"] = a
+        records["b"] = 0 if b is None else b
+        records["w"] = np.nan if w is None else w
+        self._append(records.tobytes(), len(records))
+
+    def sync(self) -> None:
+        """
+        Writes the buffered records to the journal file and flushes them
+        to disk. Compacts the journal when it reached 'compact_every'
+        records.
+        """
+        if self._pending > 0:
+            self._file.write(self._buffer)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._size += self._pending
+            self._buffer = bytearray()
+            self._pending = 0
+        if self.compact_every is not None \
+                and self._size >= self.compact_every:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Writes the graph as the snapshot of a new generation and starts an
+        empty journal, then removes the files of the previous generations.
+        """
+        generation = self._generation + 1
+        path = self._path("snapshot", generation)
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump(self.graph, f, protocol=5)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+        if self._file is not None:
+            self._file.close()
+        self._buffer = bytearray()
+        self._pending = 0
+        self._generation = generation
+        self._open(0)
+        directory = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+        for name in os.listdir(self.directory):
+            m = re.match(r"(snapshot|journal)-(\d+)\.", name)
+            if m and int(m.group(2)) < generation:
+                os.remove(os.path.join(self.directory, name))
+
+    # ---------------- Records of the graph methods -----------------
+
+    def add_vertex(self, v) -> None:
+        self._append(_STRUCT.pack(ADD_VERTEX, _id(v), 0, np.nan), 1)
+
+    def remove_vertex(self, v) -> None:
+        self._append(_STRUCT.pack(REMOVE_VERTEX, _id(v), 0, np.nan), 1)
+
+    def add_edge(self, e) -> None:
+        self._append(_STRUCT.pack(ADD_EDGE, e.start.id, e.end.id,
+                                  _weight(e.weight)), 1)
+
+    def remove_edge(self, e) -> None:
+        self._append(_STRUCT.pack(REMOVE_EDGE, e.start.id, e.end.id,
+                                  np.nan), 1)
+
+    def add_vertices(self, vertices) -> None:
+        self._append_array(ADD_VERTEX, [_id(v) for v in vertices])
+
+    def remove_vertices(self, vertices) -> None:
+        self._append_array(REMOVE_VERTEX, [_id(v) for v in vertices])
+
+    def add_edges(self, edges) -> None:
+        if isinstance(edges, np.ndarray) and edges.ndim == 2:
+            self._append_array(
+                ADD_EDGE, edges[:, 0], edges[:, 1],
+                np.where(edges[:, 2] == 1, np.nan, edges[:, 2])
+                if edges.shape[1] == 3 else None)
+            return
+        rows = [(_id(a), _id(b), _weight(e.weight if e is not None else w))
+                for (a, b, w, e) in _edge_batch(edges)]
+        self._append_array(ADD_EDGE, *(zip(*rows) if rows else ([],)))
+
+    def remove_edges(self, edges) -> None:
+        rows = [(_id(a), _id(b)) for (a, b, _, _) in _edge_batch(edges)]
+        self._append_array(REMOVE_EDGE, *(zip(*rows) if rows else ([],)))
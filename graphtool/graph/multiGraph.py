@@ -1,6 +1,21 @@
+import numpy as np
+from collections import Counter
 from .vertex_edge import Vertex, Edge
 from .graph import Graph
 from ._parsing import *
+from ._parsing import _VertexPool, _edge_batch, _is_pair_array, _reusable
+from ._parsing import _check_no_data
+from ._parsing import _adjacency_batches
+from .frozenGraph import FrozenGraph
+from ._formats import read_metis, read_snap, read_dimacs, load_graphml
+from ._formats import add_vertex_range
+from ._parallel import read_edge_array_parallel, read_adjacency_parallel
+from ._parallel import read_matrix_parallel
+from ._cache import DerivedCache
+from ._attributes import load_vertex_data, load_edge_data, attach_tables
+from ._attributes import table_edges, attach_edge_arrays
+from ._matrix import adjacency_entries, build_matrix
+from ._pickling import pack, unpack
 
 
 class MultiGraph(Graph):
@@ -15,65 +30,102 @@ class MultiGraph(Graph):
 
         Parameters:
             self._dict : Vertex -> set of neighbours vertices
-            self._edges : Vertex pair -> corresponding Edge
-            self._matrix : adjacency matrix
+            self._edges : Vertex pair -> list of corresponding Edges
+            self._lazy_edges : AttributeTable of the edges of a graph built
+                from arrays, whose Edge objects are not built yet, or None
+            self._epoch : number of modifications of the graph
+            self._cache : data derived from the graph (adjacency matrix,
+                degrees, ...) stamped with the epoch they were computed at
+            self._vertex_table, self._edge_table : AttributeTable of the
+                vertex and edge data files the graph was loaded with, or None
+            self._journal : the Journal recording the mutations, or None
         """
         self._dict = _graph_dict
         self._edges = _edges
-        self._matrix = _matrix
+        self._epoch = 0
+        self._cache = DerivedCache()
+        self._vertex_table = None
+        self._edge_table = None
+        self._journal = None
+        if _matrix is not None:
+            self._cache.put("matrix", 0, _matrix)
 
     def __eq__(self, other):
         if (self._dict.keys() != other._dict.keys()):
             return False
-        a = self.edges()
-        b = other.edges()
-        a.sort()
-        b.sort()
-        return a == b
+        return sorted(self.edges()) == sorted(other.edges())
+
+    def _table_edges(self, table):
+        return table_edges(table, {v.id: v for v in self._dict},
+                           multiple=True)
 
     # --------------- Initialization methods --------------------------
 
     @staticmethod
-    def from_edge_list(l, vertex_data: str = None, edge_data: str = None):
+    def from_edge_list(l, vertex_data: str = None, edge_data: str = None,
+                       delimiter: str = None, comments: str = "#%",
+                       weighted: bool = False, fast: bool = False,
+                       workers: int = 1):
         """
-        Imports a graph from a txt file containing an edge list
+        Imports a graph from a txt file containing an edge list.
+        The file is streamed by chunks and may be compressed
+        (.gz, .bz2, .xz or .zst).
+
+        Parameters
+        ----------
+            'l' : path of the file, or an iterable of Edge objects
+            'vertex_data', 'edge_data' : paths of csv files of attributes
+            'delimiter' : separator of the fields, any whitespace if None
+            'comments' : lines starting with one of these characters are
+                skipped
+            'weighted' : if True, the third column is the weight of the edge
+            'fast' : if True, the file is parsed by numpy and the graph is
+                built by from_edge_array. Vertex and edge data files are not
+                supported in this mode
+            'workers' : number of processes parsing the file. More than one
+                worker implies 'fast', and needs an uncompressed file
 
         Returns
         -------
-            A new Graph object
+            A new MultiGraph object
         """
+        if fast or workers > 1:
+            _check_no_data(vertex_data, edge_data)
+            if workers > 1:
+                arr, weights = read_edge_array_parallel(
+                    l, workers, delimiter, comments, weighted)
+            else:
+                arr, weights = read_edge_array(l, delimiter, comments,
+                                               weighted)
+            return MultiGraph.from_edge_array(arr, weights)
         if vertex_data is not None:
-            vertex_data = parse_node_data(vertex_data)
+            vertex_data = load_vertex_data(vertex_data)
         if edge_data is not None:
-            edge_data = parse_edge_data(edge_data)
+            edge_data = load_edge_data(edge_data, oriented=False)
 
         edges = dict()
         if isinstance(l, str):
             # Load from a file
-            with open(l, 'r') as f:
-                for s in f.readlines():
-                    s = s.strip().split()
-                    xa, xb = int(s[0]), int(s[1])
-                    if vertex_data is None:
-                        a, b = Vertex(xa), Vertex(xb)
+            for (a, b, w) in stream_edge_list(l, vertex_data, delimiter,
+                                              comments, weighted):
+                if edge_data is None:
+                    e = Edge(a, b)
+                    if w is not None:
+                        e.weight = w
+                    if (a, b) not in edges:
+                        edges[(a, b)] = [e]
                     else:
-                        a, b = vertex_data[xa], vertex_data[xb]
-                    if edge_data is None:
-                        e = Edge(a, b)
-                        if (a, b) not in edges:
-                            edges[(a, b)] = [e]
-                        else:
-                            edges[(a, b)].append(e)
-                        if (b, a) not in edges:
-                            edges[(b, a)] = [e]
-                        else:
-                            edges[(b, a)].append(e)
-
+                        edges[(a, b)].append(e)
+                    if (b, a) not in edges:
+                        edges[(b, a)] = [e]
                     else:
-                        e = edge_data.get((a, b), None)
-                        if e is None:
-                            e = edge_data.get((b, a), [Edge(a, b)])
-                        edges[(a, b)] = e
+                        edges[(b, a)].append(e)
+
+                else:
+                    e = edge_data.get((a, b), None)
+                    if e is None:
+                        e = edge_data.get((b, a), [Edge(a, b)])
+                    edges[(a, b)] = e
         else:
             for e in l:
                 e = Edge(e)
@@ -95,102 +147,242 @@ class MultiGraph(Graph):
         for key in list(edges.keys()):
             a, b = key
             edges[(b, a)] = edges[(a, b)]
-        return MultiGraph(graph_dict, _edges=edges)
+        return attach_tables(MultiGraph(graph_dict, _edges=edges),
+                             vertex_data, edge_data)
 
     @staticmethod
-    def from_adjacency_dict(d, vertex_data: str = None, edge_data: str = None):
+    def from_edge_array(arr, weights=None, data=None):
+        """
+        Builds a multigraph from an integer array of vertex ids of shape
+        (m, 2). Every row is kept as an edge, and the adjacency lists are
+        filled in bulk from a single sort. Weights and data are kept in an
+        edge table, and the Edge objects are only built when needed.
+
+        Parameters
+        ----------
+            'arr' : array-like of shape (m, 2)
+            'weights' : array-like of length m, or None
+            'data' : dictionary attribute name -> array of length m, or None
+                The masked rows of a numpy masked array have no value
+
+        Returns
+        -------
+            A new MultiGraph object
+        """
+        arr = np.asarray(arr, dtype=np.int64).reshape(-1, 2)
+        # loops are only stored once in the adjacency list of their end
+        other = arr[:, 0] != arr[:, 1]
+        rows = np.concatenate((arr[:, 0], arr[other, 1]))
+        cols = np.concatenate((arr[:, 1], arr[other, 0]))
+        pool = _VertexPool()
+        graph = MultiGraph(dict(_adjacency_batches(rows, cols, pool)))
+        if weights is not None or data:
+            attach_edge_arrays(graph, arr[:, 0], arr[:, 1],
+                               np.arange(len(arr)), weights, data)
+        return graph
+
+    @staticmethod
+    def from_adjacency_dict(d, vertex_data: str = None, edge_data: str = None,
+                            workers: int = 1):
         """
         Imports a graph from a txt file containing an adjacency list
 
+        Parameters
+        ----------
+            'd' : path of the file, or an adjacency dictionary
+            'vertex_data', 'edge_data' : paths of csv files of attributes
+            'workers' : number of processes parsing the file. Needs an
+                uncompressed file and no vertex or edge data
+
         Returns
         -------
             A new Graph object
         """
+        pool = _VertexPool()
+        if workers > 1 and isinstance(d, str):
+            _check_no_data(vertex_data, edge_data)
+            rows, cols = read_adjacency_parallel(d, workers)
+            return MultiGraph(dict(_adjacency_batches(rows, cols, pool)))
         if vertex_data is not None:
-            vertex_data = parse_node_data(vertex_data)
+            vertex_data = load_vertex_data(vertex_data)
         edges = None
         if edge_data is not None:
-            edge_data = parse_edge_data(edge_data)
+            edge_data = load_edge_data(edge_data, oriented=False)
             edges = dict()
             for (a, b) in edge_data:
                 edges[(a, b)] = edge_data[(a, b)]
-                edges[(b, a)] = edge_data[(a, b)]
+                edges[(b, a)] = list(edge_data[(a, b)])
 
-        if isinstance(d, str):  # Load from a file
+        if isinstance(d, str):  # Load from a file, streamed by chunks
             graph_dict = dict()
-            with open(d, 'r') as f:
-                for line in f.readlines():
-                    line = line.strip().split()
+            for records in read_records(d):
+                for line in records:
                     if vertex_data is None:
-                        v = Vertex(int(line[0]))
+                        v = pool[int(line[0])]
                     else:
                         v = vertex_data[int(line[0])]
                     adj_list = line[1:]
                     for adj in adj_list:
                         if vertex_data is None:
-                            adj = Vertex(int(adj))
+                            adj = pool[int(adj)]
                         else:
-                            v = vertex_data[int(adj)]
+                            adj = vertex_data[int(adj)]
                         if v in graph_dict:
                             graph_dict[v].append(adj)
                         else:
                             graph_dict[v] = [adj]
-            return MultiGraph(graph_dict, _edges=edges)
+            return attach_tables(MultiGraph(graph_dict, _edges=edges),
+                                 vertex_data, edge_data)
         else:
-            return MultiGraph(d, _edges=edges)
+            return attach_tables(MultiGraph(d, _edges=edges),
+                                 vertex_data, edge_data)
 
     @staticmethod
     def from_adjacency_matrix(m, vertex_data: str = None,
-                              edge_data: str = None):
+                              edge_data: str = None, workers: int = 1):
         """
-        Imports a graph from a txt file containing an adjacency matrix
+        Imports a graph from a txt file containing an adjacency matrix.
+        Dense files are converted by numpy and only their non-zero entries
+        are visited. Matrix Market files (.mtx) are read in coordinate
+        format. The entries under the diagonal give the number of edges
+        between two vertices.
+
+        Parameters
+        ----------
+            'm' : path of the file, or a matrix as a list of rows
+            'vertex_data', 'edge_data' : paths of csv files of attributes
+            'workers' : number of processes parsing a dense file. Needs an
+                uncompressed file and no vertex or edge data
 
         Returns
         -------
             A new Graph object
         """
+        pool = _VertexPool()
+        if workers > 1 and isinstance(m, str) and not is_matrix_market(m):
+            _check_no_data(vertex_data, edge_data)
+            n, rows, cols, vals = read_matrix_parallel(m, workers)
+        else:
+            n, rows, cols, vals = read_matrix_entries(m)
+        lower = cols < rows
+        if vertex_data is None and edge_data is None:
+            # bulk path: every entry under the diagonal repeated by its value
+            counts = np.abs(vals[lower].astype(np.int64))
+            graph = MultiGraph.from_edge_array(np.repeat(
+                np.column_stack((rows[lower], cols[lower])), counts, axis=0))
+            graph.add_vertices_from(range(n))
+            return graph
         if vertex_data is not None:
-            vertex_data = parse_node_data(vertex_data)
+            vertex_data = load_vertex_data(vertex_data)
         if edge_data is not None:
-            edge_data = parse_edge_data(edge_data)
-
-        adj_mat = None
-        if isinstance(m, str):  # Load from a file
-            with open(m, 'r') as f:
-                adj_mat = [l.strip().split() for l in f.readlines()]
-        else:
-            adj_mat = m
-        n = len(adj_mat)
-        graph_dict = dict()
+            edge_data = load_edge_data(edge_data, oriented=False)
+        vertices = vertex_data or [pool[i] for i in range(n)]
+        graph_dict = {v: [] for v in vertices[:n]}
         edges = dict()
-        for i in range(n):
-            v = Vertex(i)
-            graph_dict[v] = []
-        for i in range(n):
-            for j in range(i):
-                if vertex_data is None:
-                    vi, vj = Vertex(i), Vertex(j)
-                else:
-                    vi, vj = vertex_data[i], vertex_data[j]
-                if int(adj_mat[i][j]) != 0:
-                    n_edge_ij = abs(int(adj_mat[i][j]))
-                    for k in range(n_edge_ij):
-                        graph_dict[vi].append(vj)
-                    if edge_data is not None:
-                        e = edge_data.get((vi, vj), None)
-                        if e is None:
-                            e = edge_data.get(
-                                (vj, vi), [Edge(vi, vj)]*n_edge_ij)
-                        edges[(i, j)] = e
-                        edges[(j, i)] = e
-                    else:
-                        e = [Edge(vi, vj)]*n_edge_ij
-                        edges[(i, j)] = e
-                        edges[(j, i)] = e
-        return MultiGraph(graph_dict, _edges=edges)
+        rows, cols = rows[lower].tolist(), cols[lower].tolist()
+        counts = np.abs(vals[lower].astype(np.int64)).tolist()
+        for (i, j, k) in zip(rows, cols, counts):
+            vi, vj = vertices[i], vertices[j]
+            graph_dict[vi].extend([vj]*k)
+            if edge_data is not None:
+                e = edge_data.get((vi, vj), None)
+                if e is None:
+                    e = edge_data.get((vj, vi), [Edge(vi, vj)]*k)
+            else:
+                e = [Edge(vi, vj)]*k
+            edges[(vi, vj)] = e
+            edges[(vj, vi)] = e
+        return attach_tables(MultiGraph(graph_dict, _edges=edges),
+                             vertex_data, edge_data)
+
+    @staticmethod
+    def from_metis(filename: str):
+        """
+        Imports a multigraph from a METIS file, where every edge is listed
+        by both of its ends. The vertices are numbered from 0, edge weights
+        are kept and the first vertex weight is stored as the "weight"
+        attribute of the vertices.
+
+        Parameters
+        ----------
+            'filename' : path of the file, possibly compressed
+
+        Returns
+        -------
+            A new MultiGraph object
+        """
+        n, rows, cols, weights, vweights = read_metis(filename)
+        once = rows <= cols
+        if weights is not None:
+            weights = weights[once]
+        graph = MultiGraph.from_edge_array(
+            np.stack((rows[once], cols[once]), axis=1), weights)
+        return add_vertex_range(graph, range(n), vweights)
+
+    @staticmethod
+    def from_snap(filename: str):
+        """
+        Imports a multigraph from a SNAP edge list, whose '#' header lines
+        are skipped. Vertex ids are kept as in the file, and every line
+        gives an edge.
+
+        Parameters
+        ----------
+            'filename' : path of the file, possibly compressed
+
+        Returns
+        -------
+            A new MultiGraph object
+        """
+        arr, _ = read_snap(filename)
+        return MultiGraph.from_edge_array(arr)
+
+    @staticmethod
+    def from_dimacs(filename: str):
+        """
+        Imports a multigraph from a DIMACS shortest path file (.gr). Vertex
+        ids are kept from 1 to n, and every arc gives a weighted edge.
+
+        Parameters
+        ----------
+            'filename' : path of the file, possibly compressed
+
+        Returns
+        -------
+            A new MultiGraph object
+        """
+        n, arr, weights = read_dimacs(filename)
+        graph = MultiGraph.from_edge_array(arr, weights)
+        return add_vertex_range(graph, range(1, n + 1))
+
+    @staticmethod
+    def from_graphml(filename: str):
+        """
+        Imports a multigraph from a GraphML file, streamed so that the XML
+        tree is never held in memory. The attributes become the data of the
+        vertices and edges, and the GraphML ids the names of the vertices
+        (see iter_graphml).
+
+        Parameters
+        ----------
+            'filename' : path of the file, possibly compressed
+
+        Returns
+        -------
+            A new MultiGraph object
+        """
+        return load_graphml(MultiGraph, filename)
 
     # ------------- Exportation methods -----------------
-    def export_as_edge_list(self, filename: str) -> None:
+    def __reduce__(self):
+        """
+        Pickles the multigraph as a few contiguous arrays, sent as
+        out-of-band buffers with pickle protocol 5
+        """
+        return (unpack, (MultiGraph, pack(self, self._dict, multiple=True)))
+
+    def export_as_edge_list(self, filename: str,
+                            weighted: bool = False) -> None:
         """
         Exports the graph in form of an edge list
 
@@ -198,10 +390,16 @@ class MultiGraph(Graph):
         ----------
             'filename' : string
                 the relative path of the file to write back the data
+            'weighted' : bool
+                If True, the weight of every edge is written as a third
+                column, read back by from_edge_list(..., weighted=True)
         """
-        with open(filename, 'w') as f:
-            for e in self.edges():
-                f.write(str(e.start)+" "+str(e.end)+"\n")
+        if weighted:
+            write_lines(filename, ("{} {} {!r}".format(
+                e.start.id, e.end.id, float(e.weight)) for e in self.edges()))
+        else:
+            write_lines(filename, ("{} {}".format(e.start.id, e.end.id)
+                                   for e in self.edges()))
 
     def export_as_adjacency_dict(self, filename: str) -> None:
         """
@@ -212,12 +410,9 @@ class MultiGraph(Graph):
             'filename' : string
                 the relative path of the file to write back the data
         """
-        with open(filename, 'w') as f:
-            for v in self._dict:
-                f.write(str(v)+" ")
-                for neigh in self._dict[v]:
-                    f.write(str(neigh)+" ")
-                f.write("\n")
+        adjacency = self._dict
+        write_lines(filename, (" ".join(str(u.id) for u in [v, *adjacency[v]])
+                               for v in adjacency))
 
     def export_as_adjacency_matrix(self, filename: str) -> None:
         """
@@ -228,20 +423,35 @@ class MultiGraph(Graph):
             'filename' : string
                 the relative path of the file to write back the data
         """
-        with open(filename, 'w') as f:
-            mat = self.adjacency_matrix()
-            n = len(mat)
-            for i in range(n):
-                string = ""
-                for j in range(n):
-                    string += str(mat[i][j])+" "
-                string += "\n"
-                f.write(string)
+        write_matrix(filename, self.adjacency_matrix())
+
+    def export_as_matrix_market(self, filename: str,
+                                weight: str = None) -> None:
+        """
+        Exports the adjacency matrix of the graph as a symmetric Matrix
+        Market coordinate file, writing only its non-zero entries. Rows
+        follow the order of the sorted vertex ids.
+
+        Parameters
+        ----------
+            'filename' : string
+                the relative path of the file to write back the data
+            'weight' : str or None
+                Edge attribute summed over the multiple edges. If None, the
+                entries count the edges, as read by from_adjacency_matrix
+        """
+        index, rows, cols, vals = adjacency_entries(self._dict, self._edges,
+                                                    weight, multiple=True)
+        rows, cols = np.asarray(rows), np.asarray(cols)
+        lower = rows >= cols
+        write_matrix_market(filename, len(index), rows[lower], cols[lower],
+                            np.asarray(vals)[lower], symmetric=True)
 
     def subgraph(self, vertices):
         """
         Extract a subgraph of the graph, containing the relevant vertices
-        and edges
+        and edges. Multiple edges and loops are kept. Only the neighbourhoods
+        of the relevant vertices are visited, in O(sum of their degrees).
 
         Parameters
         ----------
@@ -251,22 +461,20 @@ class MultiGraph(Graph):
 
         Returns
         -------
-        A new Graph object
+        A new MultiGraph object
         """
         vertices = set([Vertex(v) if isinstance(v, int)
                         else v for v in vertices])
-        graph_dict = {v: [] for v in vertices}
+        graph_dict = {v: [u for u in self._dict[v] if u in vertices]
+                      for v in vertices}
         edges = None
         if self._edges is not None:
             edges = dict()
-        for v in vertices:
-            for u in vertices:
-                if v != u and u in self._dict[v]:
-                    graph_dict[v].append(u)
-                    graph_dict[u].append(v)
-                    if edges is not None:
-                        edges[(u, v)] = self._edges[(u, v)]
-                        edges[(v, u)] = self._edges[(v, u)]
+            for v in vertices:
+                for u in graph_dict[v]:
+                    e = self._edges.get((v, u), None)
+                    if e is not None:
+                        edges[(v, u)] = list(e)
         return MultiGraph(graph_dict, _edges=edges)
 
     def renumber(self):
@@ -288,6 +496,25 @@ class MultiGraph(Graph):
                 graph_dict[vertices[v]].append(vertices[u])
         return MultiGraph(graph_dict)
 
+    def freeze(self):
+        """
+        Builds an immutable compressed sparse row copy of the graph.
+        Multiple edges are kept as repeated targets.
+
+        Returns
+        -------
+        A FrozenGraph object
+        """
+        return self.cached("frozen", self._freeze)
+
+    def _freeze(self, edge_attributes=False):
+        if self._lazy_edges is not None and not edge_attributes:
+            return FrozenGraph.from_edge_table(self._dict, self._lazy_edges,
+                                               multiple=True)
+        return FrozenGraph.from_adjacency(self._dict, self._edges,
+                                          multiple=True,
+                                          edge_attributes=edge_attributes)
+
     # ---------------- Getters and setters -----------------------------
 
     def vertices(self):
@@ -315,7 +542,8 @@ class MultiGraph(Graph):
                     self._edges[(b, a)] = [e]
                 else:
                     self._edges[(a, b)].append(e)
-                    self._edges[(b, a)].append(e)
+                    if a != b:
+                        self._edges[(b, a)].append(e)
 
     def edges(self, erase_multiple=False):
         """
@@ -328,48 +556,69 @@ class MultiGraph(Graph):
 
         Returns
         -------
-            An iterator over the edges of a the graph
+            An iterator over the edges of a the graph: a tuple, or a
+            frozenset if erase_multiple is True, shared by every call until
+            the graph is modified
         """
         if self._edges is None:
             self._generate_edges()
-        result = [x for ((a, b), sublist) in self._edges.items()
-                  for x in sublist if a <= b]
+        result = self.cached("edges", lambda: tuple(
+            x for ((a, b), sublist) in self._edges.items()
+            for x in sublist if a <= b))
         if erase_multiple:
-            return set(result)
+            return self.cached("edge_set", lambda: frozenset(result))
         return result
 
     def _generate_adjacency(self):
         """
-        Generates the adjacency matrix of the graph.
-        This matrix is then stored into the self._matrix attribute
+        Generates the adjacency matrix of the graph, counting the multiple
+        edges.
+
+        Returns
+        -------
+            The adjacency matrix as a list of lists
         """
-        try:
-            n = len(self._dict)  # number of vertices
-            # assign a number between 0 and n to all vertices
-            self._matrix = [[0 for j in range(n)] for i in range(n)]
-            for u in self._dict:
-                for v in self._dict[u]:
-                    self._matrix[u.id][v.id] += 1
-                    self._matrix[v.id][u.id] += 1
-        except Exception as e:
-            self._matrix = None
-            raise e
+        index, rows, cols, vals = adjacency_entries(self._dict,
+                                                    multiple=True)
+        n = len(index)
+        matrix = [[0 for j in range(n)] for i in range(n)]
+        for (i, j, k) in zip(rows, cols, vals):
+            matrix[i][j] = k
+        return matrix
 
-    def adjacency_matrix(self):
+    def adjacency_matrix(self, format: str = None, dtype=None,
+                         weight: str = "weight"):
         """
-        Computes and return the adjacency matrix of the graph.
+        Computes and return the adjacency matrix of the graph. Multiple edges
+        are summed.
 
-        Returns:
-            A numpy array of shape (N*N) where N is the number of vertices
-            in the graph
+        Parameters
+        ----------
+            'format' : None, "dense", "csr" or "coo"
+                None returns the legacy list of lists. The other formats
+                return a numpy array or a scipy sparse matrix
+            'dtype' : numpy dtype of the values, inferred if None
+            'weight' : str or None
+                Edge attribute used as value. Edges without it count as 1.
+                If None, entries count the edges
+
+        Returns
+        -------
+            With format None, a list of lists of shape (N*N) where N is the
+            number of vertices in the graph. Otherwise, a pair
+            (matrix, index) where index maps each Vertex to its row.
+            Rows follow the order of the sorted vertex ids.
         """
-        if self._matrix is None:
-            self._generate_adjacency()
-        return self._matrix
+        if format is None:
+            return self.cached("matrix", self._generate_adjacency)
+        index, rows, cols, vals = adjacency_entries(self._dict, self._edges,
+                                                    weight, multiple=True)
+        return build_matrix(len(index), rows, cols, vals, format, dtype), index
 
     def get_neighbours_edge(self, v):
         """
-        Returns the edges of the graph that are incident to v
+        Returns the edges of the graph that are incident to v.
+        Costs O(deg(v)) as the adjacency list of v indexes self._edges.
 
         Parameters
         ----------
@@ -384,12 +633,11 @@ class MultiGraph(Graph):
             v = Vertex(v)
         if self._edges is None:
             return [Edge(v, u) for u in self._dict[v]]
-        else:
-            output = []
-            for e in self.edges():
-                if e.start == v or e.end == v:
-                    output.append(e)
-            return output
+        output = []
+        for (u, k) in Counter(self._dict[v]).items():
+            e = self._edges.get((v, u), None)
+            output += [Edge(v, u)]*k if e is None else e
+        return output
 
     # ---------------  Modification of the data ------------------------
     def add_vertex(self, v) -> None:
@@ -402,17 +650,21 @@ class MultiGraph(Graph):
                 If an integer is provided, the method will build a Vertex
                 with the id field being v.
         """
-        self._matrix = None  # reset adjacency matrix
+        self._touch()
         if not isinstance(v, Vertex):
             assert isinstance(v, int)
             v = Vertex(v)
         if v not in self._dict:
             self._dict[v] = []
+        if self._journal is not None:
+            self._journal.add_vertex(v)
 
     def remove_vertex(self, v) -> None:
         """
         Removes a vertex from the graph. If the given vertex is not present,
         this method does not do anything.
+        Only the neighbourhood of v is visited, and the edges incident to v
+        are removed from the edge set.
 
         Parameters
         ----------
@@ -420,18 +672,38 @@ class MultiGraph(Graph):
                 If an integer is provided, the method will build a Vertex
                 with the id field being v.
         """
-        self._edges = None  # reset edges set
-        self._matrix = None  # reset adjacency
-        if not isinstance(v, Vertex):
-            assert isinstance(v, int)
-            v = Vertex(v)
-        if v in self._dict:
-            self._dict.pop(v, None)
-        for x in self._dict:
-            try:
-                self._dict[x].remove(v)
-            except ValueError:
-                continue
+        self.remove_vertices([v])
+
+    def remove_vertices(self, vertices) -> None:
+        """
+        Removes several vertices from the graph. Vertices that are not present
+        are ignored. The adjacency list of each remaining neighbour is
+        filtered only once for the whole batch.
+
+        Parameters
+        ----------
+            'vertices' : an iterable of Vertex objects or integers
+        """
+        self._touch()
+        removed = set()
+        for v in vertices:
+            if not isinstance(v, Vertex):
+                assert isinstance(v, int)
+                v = Vertex(v)
+            if v in self._dict:
+                removed.add(v)
+        touched = set()
+        for v in removed:
+            for u in set(self._dict.pop(v)):
+                if u not in removed:
+                    touched.add(u)
+                if self._edges is not None:
+                    self._edges.pop((u, v), None)
+                    self._edges.pop((v, u), None)
+        for u in touched:
+            self._dict[u] = [x for x in self._dict[u] if x not in removed]
+        if self._journal is not None:
+            self._journal.remove_vertices(removed)
 
     def add_edge(self, *args):
         """
@@ -444,7 +716,8 @@ class MultiGraph(Graph):
                 The data needed to generate the edge. Can be directly an Edge
                 object, or any pair of Vertex or vertex names.
         """
-        e = Edge(args)
+        e = Edge(*args)
+        self._touch()
         if e.start not in self._dict:
             self._dict[e.start] = [e.end]
         else:
@@ -462,6 +735,8 @@ class MultiGraph(Graph):
                 self._edges[(e.start, e.end)].append(e)
                 if e.start != e.end:
                     self._edges[(e.end, e.start)].append(e)
+        if self._journal is not None:
+            self._journal.add_edge(e)
 
     def remove_edge(self, *args):
         """
@@ -473,7 +748,8 @@ class MultiGraph(Graph):
                 The data needed to generate the edge. Can be directly an Edge
                 object, or any pair of Vertex or vertex names.
         """
-        e = Edge(args)
+        e = Edge(*args)
+        self._touch()
         try:
             self._dict[e.start].remove(e.end)
         except ValueError:
@@ -485,6 +761,131 @@ class MultiGraph(Graph):
         if self._edges is not None:
             self._edges[(e.start, e.end)] = self._edges[(e.start, e.end)][1:]
             self._edges[(e.end, e.start)] = self._edges[(e.end, e.start)][1:]
+        if self._journal is not None:
+            self._journal.remove_edge(e)
+
+    # ---------------  Bulk modification of the data ------------------------
+    def add_vertices_from(self, vertices) -> None:
+        """
+        Adds several vertices to the graph. Vertices already present are
+        ignored.
+
+        Parameters
+        ----------
+            'vertices' : an iterable of Vertex objects or integers
+        """
+        if self._journal is not None:
+            vertices = list(vertices)
+        self._touch()
+        for v in vertices:
+            if not isinstance(v, Vertex):
+                v = Vertex(int(v))
+            if v not in self._dict:
+                self._dict[v] = []
+        if self._journal is not None:
+            self._journal.add_vertices(vertices)
+
+    def add_edges_from(self, edges) -> None:
+        """
+        Adds several edges to the graph. Missing ends are added as new
+        vertices. An Edge object is only built for edges carrying data, or
+        when the edge set has already been computed.
+        Caches are reset once for the whole batch.
+
+        Parameters
+        ----------
+            'edges' : an iterable of Edge objects, (u, v) pairs or
+                (u, v, weight) triples, or a numpy array of shape (m, 2)
+                or (m, 3)
+        """
+        if self._journal is not None:
+            edges = _reusable(edges)
+        self._touch()
+        pool = _VertexPool((v.id, v) for v in self._dict)
+        adj = self._dict
+        if _is_pair_array(edges) and self._edges is None:
+            # loops are only stored once in the adjacency list of their end
+            other = edges[:, 0] != edges[:, 1]
+            rows = np.concatenate((edges[:, 0], edges[other, 1]))
+            cols = np.concatenate((edges[:, 1], edges[other, 0]))
+            for (v, neighbours) in _adjacency_batches(rows, cols, pool):
+                if v in adj:
+                    adj[v] += neighbours
+                else:
+                    adj[v] = neighbours
+            if self._journal is not None:
+                self._journal.add_edges(edges)
+            return
+        for (a, b, w, e) in _edge_batch(edges):
+            a, b = pool.get_vertex(a), pool.get_vertex(b)
+            if self._edges is None and (e is not None or w is not None):
+                # built before the edge is added, so as not to list it twice
+                self._generate_edges()
+            if a not in adj:
+                adj[a] = []
+            if b not in adj:
+                adj[b] = []
+            adj[a].append(b)
+            if a != b:
+                adj[b].append(a)
+            if self._edges is None:
+                continue
+            if e is None:
+                e = Edge(a, b)
+                if w is not None:
+                    e.weight = w
+            ab = self._edges.get((a, b), None)
+            if ab is None:
+                ab = self._edges[(a, b)] = []
+            ba = self._edges.get((b, a), None)
+            if ba is None:
+                ba = self._edges[(b, a)] = []
+            ab.append(e)
+            if ba is not ab:
+                ba.append(e)
+        if self._journal is not None:
+            self._journal.add_edges(edges)
+
+    def remove_edges_from(self, edges) -> None:
+        """
+        Removes several edges from the graph, one occurrence per given pair.
+        The adjacency list of each end is filtered once for the whole batch.
+
+        Parameters
+        ----------
+            'edges' : an iterable of Edge objects or (u, v) pairs, or a numpy
+                array of shape (m, 2)
+        """
+        if self._journal is not None:
+            edges = _reusable(edges)
+        self._touch()
+        count = Counter()
+        for (a, b, _, _) in _edge_batch(edges):
+            a = a if isinstance(a, Vertex) else Vertex(a)
+            b = b if isinstance(b, Vertex) else Vertex(b)
+            if a in self._dict and b in self._dict:
+                count[(a, b) if a <= b else (b, a)] += 1
+        # removals to apply to each adjacency list
+        removals = dict()
+        for ((a, b), k) in count.items():
+            k = min(k, self._dict[a].count(b))
+            removals.setdefault(a, Counter())[b] += k
+            if a != b:
+                removals.setdefault(b, Counter())[a] += k
+            if self._edges is not None and (a, b) in self._edges:
+                self._edges[(a, b)] = self._edges[(a, b)][k:]
+                if a != b:
+                    self._edges[(b, a)] = self._edges[(b, a)][k:]
+        for (v, todo) in removals.items():
+            kept = []
+            for u in self._dict[v]:
+                if todo[u] > 0:
+                    todo[u] -= 1
+                else:
+                    kept.append(u)
+            self._dict[v] = kept
+        if self._journal is not None:
+            self._journal.remove_edges(edges)
 
     # ----- statistics -------
 
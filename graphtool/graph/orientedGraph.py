@@ -1,7 +1,24 @@
+import numpy as np
 from random import random, randint, uniform
 from .vertex_edge import Vertex, Edge
 from .graph import Graph
 from ._parsing import *
+from ._parsing import _VertexPool, _edge_batch, _is_pair_array, _reusable
+from ._parsing import _check_no_data
+from ._parsing import _adjacency_batches, _unique_index
+from .frozenGraph import FrozenGraph
+from ._formats import read_metis, read_snap, read_dimacs, load_graphml
+from ._formats import add_vertex_range
+from ._parallel import read_edge_array_parallel, read_adjacency_parallel
+from ._parallel import read_matrix_parallel
+from ._cache import DerivedCache
+from ._attributes import load_vertex_data, load_edge_data, attach_tables
+from ._attributes import table_edges, attach_edge_arrays
+from .subgraphView import SubgraphView
+from ._binary import vertex_columns, write_binary
+from ._pickling import pack, unpack
+from .sharedGraph import SharedGraph
+from ._matrix import adjacency_entries, build_matrix
 
 
 class OrientedGraph:
@@ -18,15 +35,50 @@ class OrientedGraph:
         self._dict_in : Vertex -> set of vertices that can reach v
         self._dict_out : Vertex -> set of vertices reachable from v
         self._edges : Vertex pair -> corresponding Edge
-        self._matrix : adjacency matrix
+        self._lazy_edges : AttributeTable of the edges of a graph built from
+            arrays, whose Edge objects are not built yet, or None
+        self._epoch : number of modifications of the graph
+        self._cache : data derived from the graph (adjacency matrix,
+            degrees, ...) stamped with the epoch they were computed at
+        self._vertex_table, self._edge_table : AttributeTable of the vertex
+            and edge data files the graph was loaded with, or None
+        self._journal : the Journal recording the mutations, or None
         """
         self._dict_out = _graph_dict
+        for v in list(_graph_dict):
+            for u in _graph_dict[v]:
+                if u not in _graph_dict:
+                    _graph_dict[u] = set()
         self._dict_in = {v: set() for v in _graph_dict}
         for v in _graph_dict:
             for u in _graph_dict[v]:
                 self._dict_in[u].add(v)
         self._edges = _edges
-        self._matrix = _matrix
+        self._epoch = 0
+        self._cache = DerivedCache()
+        self._vertex_table = None
+        self._edge_table = None
+        self._journal = None
+        if _matrix is not None:
+            self._cache.put("matrix", 0, _matrix)
+
+    @property
+    def _edges(self):
+        """
+        The Vertex pair -> Edge dictionary, or None. The edges of a graph
+        built from arrays are only turned into Edge objects here, the
+        first time they are needed
+        """
+        if self._lazy_edges is not None:
+            table, self._lazy_edges = self._lazy_edges, None
+            self._edge_dict = table_edges(
+                table, {v.id: v for v in self._dict_out}, oriented=True)
+        return self._edge_dict
+
+    @_edges.setter
+    def _edges(self, edges):
+        self._lazy_edges = None
+        self._edge_dict = edges
 
     def __eq__(self, other):
         return (self._dict_in == other._dict_in
@@ -41,45 +93,120 @@ class OrientedGraph:
         """
         return len(self._dict_out)
 
+    # ---------------- Cache of derived data ---------------------------
+
+    def _touch(self) -> None:
+        """
+        Marks the graph as modified: every cached result becomes stale
+        """
+        self._epoch += 1
+
+    def cached(self, key, compute):
+        """
+        Memoizes data derived from the graph. The result of compute() is
+        stored under 'key' and returned again until the graph is modified.
+
+        NOTE : Modifying the data of a vertex or an edge in place does not
+        count as a modification of the graph. Use clear_cache() afterwards.
+
+        Parameters
+        ----------
+        'key' : a hashable object naming the derived data
+        'compute' : a function without arguments computing the data
+
+        Returns
+        -------
+        The cached or freshly computed result
+        """
+        return self._cache.get(key, self._epoch, compute)
+
+    def clear_cache(self, key=None) -> None:
+        """
+        Evicts the cached result stored under 'key', or every cached result
+        if key is None
+        """
+        self._cache.evict(key)
+
+    def set_cache_limit(self, max_entries: int) -> None:
+        """
+        Sets the maximal number of derived results kept in the cache.
+        A limit of 0 disables the cache.
+        """
+        self._cache.max_entries = max_entries
+        self._cache.evict()
+
     # --------------- Initialization methods --------------------------
 
     @staticmethod
-    def from_edge_list(l, vertex_data: str = None, edge_data: str = None):
+    def from_edge_list(l, vertex_data: str = None, edge_data: str = None,
+                       delimiter: str = None, comments: str = "#%",
+                       weighted: bool = False, fast: bool = False,
+                       workers: int = 1):
         """
-        Imports a graph from a txt file containing an edge list
+        Imports a graph from a txt file containing an edge list.
+        The file is streamed by chunks and may be compressed
+        (.gz, .bz2, .xz or .zst). Edge objects are only built when
+        the edges carry data.
+
+        Parameters
+        ----------
+        'l' : path of the file, or an iterable of Edge objects
+        'vertex_data', 'edge_data' : paths of csv files of attributes
+        'delimiter' : separator of the fields, any whitespace if None
+        'comments' : lines starting with one of these characters are
+            skipped
+        'weighted' : if True, the third column is the weight of the edge
+        'fast' : if True, the file is parsed by numpy and the graph is
+            built by from_edge_array. Vertex and edge data files are not
+            supported in this mode
+        'workers' : number of processes parsing the file. More than one
+            worker implies 'fast', and needs an uncompressed file
 
         Returns
         -------
         A new OrientedGraph object
         """
+        if fast or workers > 1:
+            _check_no_data(vertex_data, edge_data)
+            if workers > 1:
+                arr, weights = read_edge_array_parallel(
+                    l, workers, delimiter, comments, weighted)
+            else:
+                arr, weights = read_edge_array(l, delimiter, comments,
+                                               weighted)
+            return OrientedGraph.from_edge_array(arr, weights)
         if vertex_data is not None:
-            vertex_data = parse_node_data(vertex_data)
+            vertex_data = load_vertex_data(vertex_data)
         if edge_data is not None:
-            edge_data = parse_edge_data(edge_data, oriented=True)
+            edge_data = load_edge_data(edge_data, oriented=True)
 
-        edges = dict()
         if isinstance(l, str):
             # Load from a file
-            with open(l, 'r') as f:
-                for s in f.readlines():
-                    s = s.strip().split()
-                    xa, xb = int(s[0]), int(s[1])
-                    if vertex_data is None:
-                        a, b = Vertex(xa), Vertex(xb)
-                    else:
-                        a, b = vertex_data[xa], vertex_data[xb]
-                    if edge_data is None:
-                        e = Edge(a, b, oriented=True)
-                        edges[(a, b)] = e
-                    else:
-                        e = edge_data.get((a, b), [Edge(a, b, oriented=True)])
-                        edges[(a, b)] = e[0]
-        else:
-            for e in l:
-                e = Edge(e)
-                edges[(e["start"], e["end"])] = e
-                if not e.oriented:
-                    edges[(e["end"], e["start"])] = Edge.revert(e)
+            graph_dict = dict()
+            edges = None
+            if edge_data is not None or weighted:
+                edges = dict()
+            for (a, b, w) in stream_edge_list(l, vertex_data, delimiter,
+                                              comments, weighted):
+                if a not in graph_dict:
+                    graph_dict[a] = set()
+                graph_dict[a].add(b)
+                if edges is None:
+                    continue
+                if edge_data is None:
+                    e = Edge(a, b, oriented=True)
+                    e.weight = w
+                else:
+                    e = edge_data.get((a, b), [Edge(a, b, oriented=True)])[0]
+                edges[(a, b)] = e
+            return attach_tables(OrientedGraph(graph_dict, _edges=edges),
+                                 vertex_data, edge_data)
+        edges = dict()
+        for e in l:
+            e = Edge(e)
+            edges[(e["start"], e["end"])] = e
+            if not e.oriented:
+                edges[(e["end"], e["start"])] = Edge.revert(e)
         graph_dict = dict()
         for key in edges:
             edge = edges[key]
@@ -87,36 +214,88 @@ class OrientedGraph:
                 graph_dict[edge.start] = set([edge.end])
             else:
                 graph_dict[edge.start].add(edge.end)
-        return OrientedGraph(graph_dict, _edges=edges)
+        return attach_tables(OrientedGraph(graph_dict, _edges=edges),
+                             vertex_data, edge_data)
 
     @staticmethod
-    def from_adjacency_dict(d, vertex_data: str = None, edge_data: str = None):
+    def from_edge_array(arr, weights=None, data=None):
+        """
+        Builds an oriented graph from an integer array of vertex ids of
+        shape (m, 2), each row (u, v) being the edge from u to v.
+        Edges are deduplicated with array operations before the adjacency
+        sets are filled in bulk. Weights and data are kept in an edge
+        table, and the Edge objects are only built when needed.
+
+        NOTE : Loops raise an exception as in add_edge.
+
+        Parameters
+        ----------
+        'arr' : array-like of shape (m, 2)
+        'weights' : array-like of length m, or None
+            For duplicated edges, the last weight is kept
+        'data' : dictionary attribute name -> array of length m, or None
+            The masked rows of a numpy masked array have no value.
+            For duplicated edges, the last row is kept
+
+        Returns
+        -------
+        A new OrientedGraph object
+        """
+        arr = np.asarray(arr, dtype=np.int64).reshape(-1, 2)
+        if np.any(arr[:, 0] == arr[:, 1]):
+            raise Exception("Loops are forbidden in the OrientedGraph \
+                             class. Use the MultiGraph class instead.")
+        kept = _unique_index(arr[:, 0], arr[:, 1])
+        rows, cols = arr[kept, 0], arr[kept, 1]
+        pool = _VertexPool()
+        graph_dict = {v: set(neighbours) for (v, neighbours)
+                      in _adjacency_batches(rows, cols, pool)}
+        graph = OrientedGraph(graph_dict)
+        if weights is not None or data:
+            attach_edge_arrays(graph, rows, cols, kept, weights, data)
+        return graph
+
+    @staticmethod
+    def from_adjacency_dict(d, vertex_data: str = None, edge_data: str = None,
+                            workers: int = 1):
         """
         Imports a graph from a txt file containing an adjacency list
 
+        Parameters
+        ----------
+        'd' : path of the file, or an adjacency dictionary
+        'vertex_data', 'edge_data' : paths of csv files of attributes
+        'workers' : number of processes parsing the file. Needs an
+            uncompressed file and no vertex or edge data
+
         Returns
         -------
         A new OrientedGraph object
         """
+        pool = _VertexPool()
+        if workers > 1 and isinstance(d, str):
+            _check_no_data(vertex_data, edge_data)
+            rows, cols = read_adjacency_parallel(d, workers)
+            return OrientedGraph.from_edge_array(
+                np.column_stack((rows, cols)))
         edges = None
         if isinstance(d, str):  # Load from a file
             if vertex_data is not None:
-                vertex_data = parse_node_data(vertex_data)
+                vertex_data = load_vertex_data(vertex_data)
             if edge_data is not None:
-                edge_data = parse_edge_data(edge_data, oriented=True)
+                edge_data = load_edge_data(edge_data, oriented=True)
                 edges = dict()
             graph_dict = dict()
-            with open(d, 'r') as f:
-                for line in f.readlines():
-                    line = line.strip().split()
+            for records in read_records(d):
+                for line in records:
                     if vertex_data is None:
-                        v = Vertex(int(line[0]))
+                        v = pool[int(line[0])]
                     else:
                         v = vertex_data[int(line[0])]
                     adj_list = line[1:]
                     for adj in adj_list:
                         if vertex_data is None:
-                            adj = Vertex(int(adj))
+                            adj = pool[int(adj)]
                         else:
                             adj = vertex_data[int(adj)]
                         if v in graph_dict:
@@ -126,55 +305,207 @@ class OrientedGraph:
                         if edge_data is not None:
                             edges[(v, adj)] = edge_data.get(
                                 (v, adj), [Edge(v, adj, oriented=True)])[0]
-            return OrientedGraph(graph_dict, _edges=edges)
+            return attach_tables(OrientedGraph(graph_dict, _edges=edges),
+                                 vertex_data, edge_data)
         else:
             return OrientedGraph(d)
 
     @staticmethod
     def from_adjacency_matrix(m, vertex_data: str = None,
-                              edge_data: str = None):
+                              edge_data: str = None, workers: int = 1):
         """
-        Imports a graph from a txt file containing an adjacency matrx
+        Imports a graph from a txt file containing an adjacency matrx.
+        Dense files are converted by numpy and only their non-zero entries
+        are visited. Matrix Market files (.mtx) are read in coordinate
+        format. The value of an entry gives the weight of its edge, and
+        every row gives a vertex, even without out-edges.
+
+        Parameters
+        ----------
+        'm' : path of the file, or a matrix as a list of rows
+        'vertex_data', 'edge_data' : paths of csv files of attributes
+        'workers' : number of processes parsing a dense file. Needs an
+            uncompressed file and no vertex or edge data
 
         Returns
         -------
         A new OrientedGraph object
         """
+        pool = _VertexPool()
+        if workers > 1 and isinstance(m, str) and not is_matrix_market(m):
+            _check_no_data(vertex_data, edge_data)
+            n, rows, cols, vals = read_matrix_parallel(m, workers)
+        else:
+            n, rows, cols, vals = read_matrix_entries(m)
+        if vertex_data is None and edge_data is None:
+            # bulk path: one Edge per weighted entry, none if all weights
+            # are 1
+            graph = OrientedGraph.from_edge_array(
+                np.column_stack((rows, cols)),
+                vals if np.any(vals != 1) else None)
+            graph.add_vertices_from(range(n))
+            return graph
         if vertex_data is not None:
-            vertex_data = parse_node_data(vertex_data)
+            vertex_data = load_vertex_data(vertex_data)
         if edge_data is not None:
-            edge_data = parse_edge_data(edge_data, oriented=True)
-
-        adj_mat = None
-        if isinstance(m, str):  # Load from a file
-            with open(m, 'r') as f:
-                adj_mat = [l.strip().split() for l in f.readlines()]
-        else:
-            adj_mat = m
-        n = len(adj_mat)
-        graph_dict = dict()
+            edge_data = load_edge_data(edge_data, oriented=True)
+        vertices = vertex_data or [pool[i] for i in range(n)]
+        graph_dict = {v: set() for v in vertices[:n]}
         edges = dict()
-        for i in range(n):
-            for j in range(n):
-                if vertex_data is None:
-                    vi, vj = Vertex(i), Vertex(j)
-                else:
-                    vi, vj = vertex_data[i], vertex_data[j]
-                if float(adj_mat[i][j]) != 0:
-                    if (vi not in graph_dict):
-                        graph_dict[vi] = set([vj])
-                    else:
-                        graph_dict[vi].add(vj)
-                    if edge_data is not None:
-                        e = edge_data.get((vi, vj), [Edge(vi, vj)])
-                        edges[(i, j)] = e[0]
-                    else:
-                        edges[(i, j)] = Edge(vi, vj)
-        return OrientedGraph(graph_dict, _edges=edges)
+        for (i, j, w) in zip(rows.tolist(), cols.tolist(), vals.tolist()):
+            vi, vj = vertices[i], vertices[j]
+            graph_dict[vi].add(vj)
+            if edge_data is not None:
+                e = edge_data.get((vi, vj), [Edge(vi, vj, oriented=True)])
+                edges[(vi, vj)] = e[0]
+            else:
+                e = Edge(vi, vj, oriented=True)
+                e.weight = w
+                edges[(vi, vj)] = e
+        return attach_tables(OrientedGraph(graph_dict, _edges=edges),
+                             vertex_data, edge_data)
+
+    @staticmethod
+    def from_metis(filename: str):
+        """
+        Imports a graph from a METIS file. The vertices are numbered from 0
+        and every edge of the file gives an arc in both directions. Edge
+        weights are kept and the first vertex weight is stored as the
+        "weight" attribute of the vertices.
+
+        Parameters
+        ----------
+        'filename' : path of the file, possibly compressed
+
+        Returns
+        -------
+        A new OrientedGraph object
+        """
+        n, rows, cols, weights, vweights = read_metis(filename)
+        graph = OrientedGraph.from_edge_array(
+            np.stack((rows, cols), axis=1), weights)
+        return add_vertex_range(graph, range(n), vweights)
+
+    @staticmethod
+    def from_snap(filename: str):
+        """
+        Imports a graph from a SNAP edge list, whose '#' header lines are
+        skipped. Vertex ids are kept as in the file.
+
+        NOTE : Loops raise an exception as in add_edge.
+
+        Parameters
+        ----------
+        'filename' : path of the file, possibly compressed
+
+        Returns
+        -------
+        A new OrientedGraph object
+        """
+        arr, _ = read_snap(filename)
+        return OrientedGraph.from_edge_array(arr)
+
+    @staticmethod
+    def from_dimacs(filename: str):
+        """
+        Imports a graph from a DIMACS shortest path file (.gr). Vertex ids
+        are kept from 1 to n, and the arcs become weighted arcs.
+
+        Parameters
+        ----------
+        'filename' : path of the file, possibly compressed
+
+        Returns
+        -------
+        A new OrientedGraph object
+        """
+        n, arr, weights = read_dimacs(filename)
+        graph = OrientedGraph.from_edge_array(arr, weights)
+        return add_vertex_range(graph, range(1, n + 1))
+
+    @staticmethod
+    def from_graphml(filename: str):
+        """
+        Imports a graph from a GraphML file, streamed so that the XML tree
+        is never held in memory. The attributes become the data of the
+        vertices and arcs, and the GraphML ids the names of the vertices
+        (see iter_graphml). Undirected edges give an arc in both directions.
+
+        NOTE : Loops raise an exception as in add_edge.
+
+        Parameters
+        ----------
+        'filename' : path of the file, possibly compressed
+
+        Returns
+        -------
+        A new OrientedGraph object
+        """
+        return load_graphml(OrientedGraph, filename, oriented=True)
 
     # ------------- Exportation methods -----------------
 
-    def export_as_edge_list(self, filename: str) -> None:
+    def save(self, filename: str) -> None:
+        """
+        Saves the graph in a versioned binary format storing the compressed
+        sparse row arrays, the edge weights, the vertex attributes that
+        are set on every vertex and the data of the edges. An edge
+        attribute that is not a boolean, a number or a string set on every
+        edge raises an Exception.
+
+        Parameters
+        ----------
+        'filename' : string
+            the relative path of the file to write
+        """
+        write_binary(filename, self._freeze(edge_attributes=True),
+                     vertex_columns(sorted(self._dict_out)))
+
+    @staticmethod
+    def load(filename: str, mmap: bool = True):
+        """
+        Loads a graph saved by a save() method.
+
+        Parameters
+        ----------
+        'filename' : string
+            the relative path of the file to read
+        'mmap' : bool
+            If True, returns a read-only FrozenGraph whose arrays are
+            memory-mapped: it is queryable at once and its pages are shared
+            between the processes opening the file. If False, returns a
+            mutable graph of the class the file was saved from
+
+        Returns
+        -------
+        A FrozenGraph, or a Graph, OrientedGraph or MultiGraph object
+        """
+        graph = FrozenGraph.load(filename, mmap)
+        if mmap:
+            return graph
+        return graph.thaw()
+
+    def __reduce__(self):
+        """
+        Pickles the graph as a few contiguous arrays, sent as out-of-band
+        buffers with pickle protocol 5, instead of one object per vertex
+        and edge
+        """
+        return (unpack, (OrientedGraph, pack(self, self._dict_out)))
+
+    def share(self):
+        """
+        Places the graph in shared memory, so that worker processes attach
+        to it instead of receiving a pickled copy each.
+
+        Returns
+        -------
+        A SharedGraph object, whose graph() method gives back the graph
+        """
+        return SharedGraph(self)
+
+    def export_as_edge_list(self, filename: str,
+                            weighted: bool = False) -> None:
         """
         Exports the graph in form of an edge list
 
@@ -182,10 +513,16 @@ class OrientedGraph:
         ----------
         'filename' : string
             the relative path of the file to write back the data
+        'weighted' : bool
+            If True, the weight of every edge is written as a third column,
+            read back by from_edge_list(..., weighted=True)
         """
-        with open(filename, 'w') as f:
-            for e in self.edges():
-                f.write(str(e.start)+" "+str(e.end)+"\n")
+        if weighted:
+            write_lines(filename, ("{} {} {!r}".format(
+                e.start.id, e.end.id, float(e.weight)) for e in self.edges()))
+        else:
+            write_lines(filename, ("{} {}".format(e.start.id, e.end.id)
+                                   for e in self.edges()))
 
     def export_as_adjacency_dict(self, filename: str) -> None:
         """
@@ -196,12 +533,9 @@ class OrientedGraph:
         'filename' : string
             the relative path of the file to write back the data
         """
-        with open(filename, 'w') as f:
-            for v in self._dict_out:
-                f.write(str(v)+" ")
-                for neigh in self._dict_out[v]:
-                    f.write(str(neigh)+" ")
-                f.write("\n")
+        adjacency = self._dict_out
+        write_lines(filename, (" ".join(str(u.id) for u in [v, *adjacency[v]])
+                               for v in adjacency))
 
     def export_as_adjacency_matrix(self, filename: str) -> None:
         """
@@ -212,20 +546,56 @@ class OrientedGraph:
         'filename' : string
             the relative path of the file to write back the data
         """
-        with open(filename, 'w') as f:
-            mat = self.adjacency_matrix()
-            n = len(mat)
-            for i in range(n):
-                string = ""
-                for j in range(n):
-                    string += str(mat[i][j])+" "
-                string += "\n"
-                f.write(string)
+        write_matrix(filename, self.adjacency_matrix())
+
+    def export_as_matrix_market(self, filename: str,
+                                weight: str = "weight") -> None:
+        """
+        Exports the adjacency matrix of the graph as a general Matrix Market
+        coordinate file, writing only its non-zero entries. Rows follow the
+        order of the sorted vertex ids.
+
+        Parameters
+        ----------
+        'filename' : string
+            the relative path of the file to write back the data
+        'weight' : str or None
+            Edge attribute used as value, see adjacency_matrix
+        """
+        index, rows, cols, vals = adjacency_entries(self._dict_out,
+                                                    self._edges, weight)
+        write_matrix_market(filename, len(index), rows, cols, vals)
+
+    def export_vertex_data(self, filename: str) -> None:
+        """
+        Exports the data of the vertices in a csv file with a typed header,
+        read back by the 'vertex_data' argument of the loaders
+
+        Parameters
+        ----------
+        'filename' : string
+            the relative path of the csv file to write
+        """
+        write_node_data(filename, self._dict_out)
+
+    def export_edge_data(self, filename: str) -> None:
+        """
+        Exports the ends, the weight and the data of the edges in a csv file
+        with a typed header, read back by the 'edge_data' argument of the
+        loaders
+
+        Parameters
+        ----------
+        'filename' : string
+            the relative path of the csv file to write
+        """
+        write_edge_data(filename, self.edges())
 
     def subgraph(self, vertices):
         """
         Extract a subgraph of the graph, containing the relevant vertices
-        and edges
+        and edges. Only the out-neighbourhoods of the relevant vertices are
+        visited, in O(sum of their degrees).
 
         Parameters
         ----------
@@ -239,18 +609,32 @@ class OrientedGraph:
         """
         vertices = set([Vertex(v) if isinstance(v, int)
                         else v for v in vertices])
-        graph_dict = {v: set() for v in vertices}
+        graph_dict = {v: self._dict_out[v] & vertices for v in vertices}
         edges = None
         if self._edges is not None:
             edges = dict()
-        for v in vertices:
-            for u in vertices:
-                if v != u and u in self._dict_out[v]:
-                    graph_dict[v].add(u)
-                    if edges is not None:
-                        edges[(v, u)] = self._edges[(v, u)]
+            for v in vertices:
+                for u in graph_dict[v]:
+                    e = self._edges.get((v, u), None)
+                    if e is not None:
+                        edges[(v, u)] = e
         return OrientedGraph(graph_dict, _edges=edges)
 
+    def subgraph_view(self, vertices):
+        """
+        Builds a read-only view of the subgraph induced by the relevant
+        vertices, without copying any adjacency data
+
+        Parameters
+        ----------
+        'vertices' : an iterable of Vertex objects or integers
+
+        Returns
+        -------
+        A SubgraphView object
+        """
+        return SubgraphView(self, vertices)
+
     def renumber(self):
         """
         Returns a copy of the graph where all the vertices have been renumbered
@@ -270,6 +654,29 @@ class OrientedGraph:
                 graph_dict[vertices[v]].add(vertices[u])
         return OrientedGraph(graph_dict)
 
+    def freeze(self):
+        """
+        Builds an immutable compressed sparse row copy of the graph, storing
+        both the out- and the in-adjacency.
+        Vertex data are dropped and only the weights of the edges are kept.
+        The copy is cached until the graph is modified.
+
+        Returns
+        -------
+        A FrozenGraph object
+        """
+        return self.cached("frozen", self._freeze)
+
+    def _freeze(self, edge_attributes=False):
+        if self._lazy_edges is not None and not edge_attributes:
+            return FrozenGraph.from_edge_table(self._dict_out,
+                                               self._lazy_edges,
+                                               oriented=True)
+        adj = {v: self._dict_out.get(v, ())
+               for v in self._dict_out.keys() | self._dict_in.keys()}
+        return FrozenGraph.from_adjacency(adj, self._edges, oriented=True,
+                                          edge_attributes=edge_attributes)
+
     # ---------------- Getters and setters -----------------------------
 
     def symetrize(self):
@@ -302,6 +709,49 @@ class OrientedGraph:
         """
         return self._dict_out.keys()
 
+    def vertex_attributes(self):
+        """
+        Getter on the table of the vertex data, holding one array per
+        attribute. Only graphs loaded with a vertex data file have one.
+
+        Returns
+        -------
+        An AttributeTable object, or None
+        """
+        return self._vertex_table
+
+    def edge_attributes(self):
+        """
+        Getter on the table of the edge data, holding one array per
+        attribute. Only graphs loaded with an edge data file have one.
+
+        Returns
+        -------
+        An AttributeTable object, or None
+        """
+        return self._edge_table
+
+    def select_vertices(self, name, predicate):
+        """
+        Selects vertices on one of their attributes, the predicate being
+        evaluated once on the whole column of the vertex attribute table.
+
+        Parameters
+        ----------
+        'name' : the name of a vertex attribute
+        'predicate' : a function array -> boolean array, such as
+            lambda x: x > 5
+
+        Returns
+        -------
+        The list of the selected vertices of the graph
+        """
+        if self._vertex_table is None:
+            raise Exception("The graph has no vertex attribute table")
+        rows = self._vertex_table.select(name, predicate).tolist()
+        vertices = self._vertex_table.objects
+        return [vertices[i] for i in rows if vertices[i] in self._dict_out]
+
     def _generate_edges(self):
         """
         Generates the set of edges of the graph.
@@ -310,7 +760,7 @@ class OrientedGraph:
         self._edges = dict()
         for a in self.vertices():
             for b in self._dict_out[a]:
-                self._edges[(a, b)] = Edge(a, b)
+                self._edges[(a, b)] = Edge(a, b, oriented=True)
 
     def edges(self):
         """
@@ -318,41 +768,56 @@ class OrientedGraph:
 
         Returns
         -------
-        An iterator over the edges of a the graph
+        An iterator over the edges of a the graph, as a frozenset shared by
+        every call until the graph is modified
         """
         if self._edges is None:
             self._generate_edges()
-        return set(self._edges.values())
+        return self.cached("edges", lambda: frozenset(self._edges.values()))
 
     def _generate_adjacency(self):
         """
         Generates the adjacency matrix of the graph.
-        This matrix is then stored into the self._matrix attribute
-        """
-        try:
-            n = len(self._dict_out)  # number of vertices
-            # assign a number between 0 and n to all vertices
-            self._matrix = [[0 for j in range(n)] for i in range(n)]
-            for u in self._dict_out:
-                for v in self._dict_out[u]:
-                    self._matrix[u.id][v.id] = 1
-        except Exception as e:
-            # roll-back operations on matrix before continuing
-            self._matrix = None
-            raise e
 
-    def adjacency_matrix(self):
+        Returns
+        -------
+        The adjacency matrix as a list of lists
         """
-        Computes and return the adjacency matrix of the graph.
+        index, rows, cols, vals = adjacency_entries(self._dict_out)
+        n = len(index)
+        matrix = [[0 for j in range(n)] for i in range(n)]
+        for (i, j, k) in zip(rows, cols, vals):
+            matrix[i][j] = k
+        return matrix
+
+    def adjacency_matrix(self, format: str = None, dtype=None,
+                         weight: str = "weight"):
+        """
+        Computes and return the adjacency matrix of the graph. The entry
+        (i, j) is non-zero when the oriented edge (i, j) exists.
+
+        Parameters
+        ----------
+        'format' : None, "dense", "csr" or "coo"
+            None returns the legacy list of lists. The other formats
+            return a numpy array or a scipy sparse matrix
+        'dtype' : numpy dtype of the values, inferred if None
+        'weight' : str or None
+            Edge attribute used as value. Edges without it count as 1.
+            If None, entries count the edges
 
         Returns
         -------
-        A numpy array of shape (N*N) where N is the number of vertices
-        in the graph
+        With format None, a list of lists of shape (N*N) where N is the
+        number of vertices in the graph. Otherwise, a pair
+        (matrix, index) where index maps each Vertex to its row.
+        Rows follow the order of the sorted vertex ids.
         """
-        if self._matrix is None:
-            self._generate_adjacency()
-        return self._matrix
+        if format is None:
+            return self.cached("matrix", self._generate_adjacency)
+        index, rows, cols, vals = adjacency_entries(self._dict_out,
+                                                    self._edges, weight)
+        return build_matrix(len(index), rows, cols, vals, format, dtype), index
 
     def get_neighbours(self, v):
         """
@@ -394,7 +859,8 @@ class OrientedGraph:
 
     def get_neighbours_edge(self, v):
         """
-        Returns the edges of the graph that start from v
+        Returns the edges of the graph that start from v.
+        Costs O(deg(v)) as the out-adjacency of v indexes self._edges.
 
         Parameters
         ----------
@@ -409,17 +875,17 @@ class OrientedGraph:
             assert isinstance(v, int)
             v = Vertex(v)
         if self._edges is None:
-            return set([Edge(v, u) for u in self._dict_out[v]])
-        else:
-            output = set()
-            for e in self.edges():
-                if e.start == v:
-                    output.add(e)
-            return output
+            return set([Edge(v, u, oriented=True) for u in self._dict_out[v]])
+        output = set()
+        for u in self._dict_out[v]:
+            e = self._edges.get((v, u), None)
+            output.add(Edge(v, u, oriented=True) if e is None else e)
+        return output
 
     def get_neighbours_edge_in(self, v):
         """
-        Returns the edges of the graph that lead to v
+        Returns the edges of the graph that lead to v.
+        Costs O(deg(v)) as the in-adjacency of v indexes self._edges.
 
         Parameters
         ----------
@@ -434,13 +900,12 @@ class OrientedGraph:
             assert isinstance(v, int)
             v = Vertex(v)
         if self._edges is None:
-            return set([Edge(u, v) for u in self._dict_in[v]])
-        else:
-            output = set()
-            for e in self.edges():
-                if e.end == v:
-                    output.add(e)
-            return output
+            return set([Edge(u, v, oriented=True) for u in self._dict_in[v]])
+        output = set()
+        for u in self._dict_in[v]:
+            e = self._edges.get((u, v), None)
+            output.add(Edge(u, v, oriented=True) if e is None else e)
+        return output
 
     # ---------------  Modification of the data ------------------------
     def add_vertex(self, v) -> None:
@@ -453,18 +918,22 @@ class OrientedGraph:
             If an integer is provided, the method will build a Vertex with the
             id field being v.
         """
-        self._matrix = None  # reset adjacency matrix
+        self._touch()
         if not isinstance(v, Vertex):
             assert isinstance(v, int)
             v = Vertex(v)
         if v not in self._dict_out:
             self._dict_out[v] = set()
             self._dict_in[v] = set()
+        if self._journal is not None:
+            self._journal.add_vertex(v)
 
     def remove_vertex(self, v) -> None:
         """
         Removes a vertex from the graph. If the given vertex is not present,
         this method does not do anything.
+        Only the in- and out-neighbourhoods of v are visited, and the edges
+        incident to v are removed from the edge set.
 
         Parameters
         ----------
@@ -475,21 +944,29 @@ class OrientedGraph:
         if not isinstance(v, Vertex):
             assert isinstance(v, int)
             v = Vertex(v)
+        self._touch()
+        for u in self._dict_out.pop(v, ()):
+            self._dict_in[u].discard(v)
+            if self._edges is not None:
+                self._edges.pop((v, u), None)
+        for u in self._dict_in.pop(v, ()):
+            self._dict_out[u].discard(v)
+            if self._edges is not None:
+                self._edges.pop((u, v), None)
+        if self._journal is not None:
+            self._journal.remove_vertex(v)
+
+    def remove_vertices(self, vertices) -> None:
+        """
+        Removes several vertices from the graph. Vertices that are not present
+        are ignored.
 
-        if self._edges is not None:
-            for e in list(self._edges.values()):
-                if e in self._edges and (self._edges[e].start == v
-                                         or self._edges[e].end == v):
-                    self._edges.pop(e, None)
-
-        self._matrix = None  # reset adjacency
-
-        if v in self._dict_in:
-            self._dict_in.pop(v, None)
-            self._dict_out.pop(v, None)
-        for x in self._dict_out:
-            self._dict_out[x].discard(v)
-            self._dict_in[x].discard(v)
+        Parameters
+        ----------
+        'vertices' : an iterable of Vertex objects or integers
+        """
+        for v in vertices:
+            self.remove_vertex(v)
 
     def add_edge(self, *args) -> None:
         """
@@ -502,20 +979,22 @@ class OrientedGraph:
             The data needed to generate the edge. Can be directly an Edge
             object, or any pair of Vertex or vertex names.
         """
-        e = Edge(args, oriented=True)
+        e = Edge(*args, oriented=True)
+        e.oriented = True
         if e.start == e.end:
             raise Exception("Loops are forbidden in the OrientedGraph class.\
                              Use the MultiGraph class instead.")
-        if e.start not in self._dict_out:
-            self._dict_out[e.start] = set([e.end])
-        else:
-            self._dict_out[e.start].add(e.end)
-        if e.end not in self._dict_in:
-            self._dict_in[e.end] = set([e.start])
-        else:
-            self._dict_in[e.end].add(e.start)
+        self._touch()
+        for v in (e.start, e.end):
+            if v not in self._dict_out:
+                self._dict_out[v] = set()
+                self._dict_in[v] = set()
+        self._dict_out[e.start].add(e.end)
+        self._dict_in[e.end].add(e.start)
         if self._edges is not None:
             self._edges[(e.start, e.end)] = e
+        if self._journal is not None:
+            self._journal.add_edge(e)
 
     def remove_edge(self, *args) -> None:
         """
@@ -527,11 +1006,115 @@ class OrientedGraph:
             The data needed to generate the edge. Can be directly an Edge
             object, or any pair of Vertex or vertex names.
         """
-        e = Edge(args)
+        e = Edge(*args)
+        self._touch()
         self._dict_out[e.start].discard(e.end)
         self._dict_in[e.end].discard(e.start)
         if self._edges is not None:
             self._edges.pop((e.start, e.end), None)
+        if self._journal is not None:
+            self._journal.remove_edge(e)
+
+    # ---------------  Bulk modification of the data ------------------------
+    def add_vertices_from(self, vertices) -> None:
+        """
+        Adds several vertices to the graph. Vertices already present are
+        ignored.
+
+        Parameters
+        ----------
+        'vertices' : an iterable of Vertex objects or integers
+        """
+        if self._journal is not None:
+            vertices = list(vertices)
+        self._touch()
+        for v in vertices:
+            if not isinstance(v, Vertex):
+                v = Vertex(int(v))
+            if v not in self._dict_out:
+                self._dict_out[v] = set()
+                self._dict_in[v] = set()
+        if self._journal is not None:
+            self._journal.add_vertices(vertices)
+
+    def add_edges_from(self, edges) -> None:
+        """
+        Adds several oriented edges to the graph. Missing ends are added as
+        new vertices. An Edge object is only built for edges carrying data, or
+        when the edge set has already been computed.
+        Caches are reset once for the whole batch.
+
+        NOTE : Loops raise an exception as in add_edge.
+
+        Parameters
+        ----------
+        'edges' : an iterable of Edge objects, (u, v) pairs or (u, v, weight)
+            triples, or a numpy array of shape (m, 2) or (m, 3)
+        """
+        if self._journal is not None:
+            edges = _reusable(edges)
+        self._touch()
+        pool = _VertexPool((v.id, v) for v in self._dict_out)
+        out, inn = self._dict_out, self._dict_in
+        if _is_pair_array(edges) and self._edges is None:
+            if np.any(edges[:, 0] == edges[:, 1]):
+                raise Exception("Loops are forbidden in the OrientedGraph \
+                                 class. Use the MultiGraph class instead.")
+            self.add_vertices_from(pool[i] for i in np.unique(edges).tolist())
+            for (v, neighbours) in _adjacency_batches(edges[:, 0],
+                                                      edges[:, 1], pool):
+                out[v].update(neighbours)
+            for (v, neighbours) in _adjacency_batches(edges[:, 1],
+                                                      edges[:, 0], pool):
+                inn[v].update(neighbours)
+            if self._journal is not None:
+                self._journal.add_edges(edges)
+            return
+        for (a, b, w, e) in _edge_batch(edges):
+            a, b = pool.get_vertex(a), pool.get_vertex(b)
+            if a == b:
+                raise Exception("Loops are forbidden in the OrientedGraph \
+                                 class. Use the MultiGraph class instead.")
+            for v in (a, b):
+                if v not in out:
+                    out[v] = set()
+                    inn[v] = set()
+            out[a].add(b)
+            inn[b].add(a)
+            if e is None and w is None and self._edges is None:
+                continue
+            if self._edges is None:
+                self._generate_edges()
+            if e is None:
+                e = Edge(a, b, oriented=True)
+                if w is not None:
+                    e.weight = w
+            self._edges[(a, b)] = e
+        if self._journal is not None:
+            self._journal.add_edges(edges)
+
+    def remove_edges_from(self, edges) -> None:
+        """
+        Removes several oriented edges from the graph. Edges that are not
+        present are ignored.
+
+        Parameters
+        ----------
+        'edges' : an iterable of Edge objects or (u, v) pairs, or a numpy
+            array of shape (m, 2)
+        """
+        if self._journal is not None:
+            edges = _reusable(edges)
+        self._touch()
+        for (a, b, _, _) in _edge_batch(edges):
+            if a in self._dict_out:
+                self._dict_out[a].discard(b)
+            if b in self._dict_in:
+                self._dict_in[b].discard(a)
+            if self._edges is not None:
+                self._edges.pop((a, b), None)
+        if self._journal is not None:
+            self._journal.remove_edges(edges)
 
 # ---------------- Stats computations -----------------------------
     def get_sources(self):
@@ -547,9 +1130,9 @@ class OrientedGraph:
         return [x for x in self._dict_out if len(self._dict_out[x]) == 0]
 
     def get_in_degrees(self):
-        return {vertex: len(self._dict_in[vertex])
-                for vertex in self._dict_in}
+        return dict(self.cached("in_degrees", lambda: {
+            vertex: len(self._dict_in[vertex]) for vertex in self._dict_in}))
 
     def get_out_degrees(self):
-        return {vertex: len(self._dict_out[vertex])
-                for vertex in self._dict_out}
+        return dict(self.cached("out_degrees", lambda: {
+            vertex: len(self._dict_out[vertex]) for vertex in self._dict_out}))
@@ -0,0 +1,108 @@
+import pickle
+from multiprocessing import shared_memory
+
+# alignment in bytes of the arrays in the shared segment
+ALIGNMENT = 64
+
+
+def _align(n: int) -> int:
+    return -(-n // ALIGNMENT) * ALIGNMENT
+
+
+class SharedGraph:
+    """
+    A graph placed in a shared memory segment, to be sent to worker
+    processes.
+
+    The graph is pickled with protocol 5: its arrays are written once in
+    the segment as out-of-band buffers, next to the small pickle of the
+    rest. Pickling a SharedGraph only sends the name and the layout of the
+    segment, and graph() rebuilds the graph on top of the shared buffers.
+    A FrozenGraph is then used in place without any copy, while the other
+    classes only read the arrays to build their dictionaries.
+
+    A SharedGraph is built with the share() method of the graph classes.
+    The process that built it owns the segment and unlinks it on close().
+    """
+
+    def __init__(self, graph):
+        """
+        Copies a graph into a new shared memory segment.
+
+        self.name : name of the segment
+        self._layout : list of the (offset, size) of the pickle and of the
+            out-of-band buffers in the segment
+        self._owner : True in the process that created the segment
+        """
+        buffers = []
+        meta = pickle.dumps(graph, protocol=5,
+                            buffer_callback=buffers.append)
+        parts = [memoryview(meta)] + [b.raw() for b in buffers]
+        self._layout = []
+        position = 0
+        for part in parts:
+            self._layout.append((position, part.nbytes))
+            position = _align(position + part.nbytes)
+        self._memory = shared_memory.SharedMemory(create=True,
+                                                  size=max(1, position))
+        for ((offset, size), part) in zip(self._layout, parts):
+            self._memory.buf[offset:offset + size] = part
+        self.name = self._memory.name
+        self._owner = True
+        self._graph = None
+
+    @staticmethod
+    def _attach(name: str, layout):
+        shared = SharedGraph.__new__(SharedGraph)
+        shared._memory = shared_memory.SharedMemory(name=name)
+        shared._layout = layout
+        shared.name = name
+        shared._owner = False
+        shared._graph = None
+        return shared
+
+    def __reduce__(self):
+        return (SharedGraph._attach, (self.name, self._layout))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def graph(self):
+        """
+        Attaches to the graph stored in the segment. The graph is built on
+        the first call only. The arrays of a FrozenGraph are read-only
+        views of the segment.
+
+        Returns:
+            The shared Graph, OrientedGraph, MultiGraph or FrozenGraph
+        """
+        if self._graph is None:
+            views = [self._memory.buf[offset:offset + size].toreadonly()
+                     for (offset, size) in self._layout]
+            self._graph = pickle.loads(views[0], buffers=views[1:])
+        return self._graph
+
+    def close(self) -> None:
+        """
+        Detaches from the segment, and destroys it in the process that
+        created it. A FrozenGraph returned by graph() and still in use
+        keeps the memory mapped until it is collected: the segment is only
+        unlinked, and its memory is freed once no process maps it anymore.
+        """
+        self._graph = None
+        try:
+            self._memory.close()
+        except BufferError:
+            # arrays of graph() still export the mapping: it is left to
+            # them, to be unmapped when they are collected, so that the
+            # SharedMemory object has nothing more to close
+            self._memory._buf = None
+            self._memory._mmap = None
+            self._memory.close()
+        finally:
+            if self._owner:
+                self._owner = False
+                self._memory.unlink()
@@ -0,0 +1,156 @@
+from .vertex_edge import Vertex
+
+
+class SubgraphView:
+    """
+    A read-only view of the subgraph of a graph induced by a set of vertices.
+    No adjacency data is copied: the neighbourhoods of the parent graph are
+    filtered on the fly, so that a view costs O(k) to build for k vertices
+    and follows the later modifications of the edges of the parent.
+
+    Call materialize() to get an independent copy of the subgraph.
+    """
+
+    def __init__(self, parent, vertices):
+        """
+        Initialization function. Is not meant to be called as it is, use the
+        subgraph_view method of the parent graph.
+
+        self.parent : the graph being viewed
+        self._vertices : frozenset of the selected vertices present in parent
+        """
+        self.parent = parent
+        self._vertices = frozenset(
+            v for v in (u if isinstance(u, Vertex) else Vertex(u)
+                        for u in vertices) if v in parent.vertices())
+
+    def __len__(self):
+        """
+        Number of vertices in the view
+        """
+        return len(self._vertices)
+
+    def __contains__(self, v):
+        return v in self._vertices
+
+    def __str__(self):
+        return "SubgraphView" + str(sorted(self._vertices))
+
+    def vertices(self):
+        """
+        Getter on the vertices of the view
+
+        Returns:
+            A frozenset of vertices
+        """
+        return self._vertices
+
+    def _filter(self, neighbours):
+        """
+        Keeps the neighbours belonging to the view. Lists, as used by
+        multigraphs, keep their repetitions.
+        """
+        if isinstance(neighbours, list):
+            return [u for u in neighbours if u in self._vertices]
+        return set(u for u in neighbours if u in self._vertices)
+
+    def _check(self, v):
+        if not isinstance(v, Vertex):
+            assert isinstance(v, int)
+            v = Vertex(v)
+        if v not in self._vertices:
+            raise KeyError(v)
+        return v
+
+    def get_neighbours(self, v):
+        """
+        Returns the vertices of the view that are adjacent to v
+
+        Parameters:
+            'v' : A Vertex object or an integer (vertex id)
+
+        Returns:
+            The set of neighbours of v, or a list for multigraphs
+        """
+        v = self._check(v)
+        return self._filter(self.parent.get_neighbours(v))
+
+    def get_neighbours_in(self, v):
+        """
+        Returns the vertices of the view that can lead to v. Only available
+        when the parent graph is oriented.
+
+        Parameters:
+            'v' : A Vertex object or an integer (vertex id)
+
+        Returns:
+            The set of in-neighbours of v
+        """
+        v = self._check(v)
+        return self._filter(self.parent.get_neighbours_in(v))
+
+    def get_neighbours_edge(self, v):
+        """
+        Returns the edges of the view that are incident to v
+
+        Parameters:
+            'v' : A Vertex object or an integer (vertex id)
+
+        Returns:
+            The set of edges incident to v, or a list for multigraphs
+        """
+        v = self._check(v)
+        edges = self.parent.get_neighbours_edge(v)
+        kept = [e for e in edges if e.other(v) in self._vertices]
+        if isinstance(edges, list):
+            return kept
+        return set(kept)
+
+    def edges(self):
+        """
+        Getter on the edges of the view
+
+        Returns:
+            The set of edges between vertices of the view, or a list for
+            multigraphs
+        """
+        output = []
+        multiple = False
+        for v in self._vertices:
+            edges = self.parent.get_neighbours_edge(v)
+            multiple = isinstance(edges, list)
+            for e in edges:
+                u = e.other(v)
+                if u in self._vertices and (e.oriented or v <= u):
+                    output.append(e)
+        if multiple:
+            return output
+        return set(output)
+
+    def vertex_degree(self):
+        """
+        Returns the list of degrees of the vertices in the view
+
+        Returns:
+            A list of integers
+        """
+        return [len(self.get_neighbours(v)) for v in self._vertices]
+
+    def materialize(self):
+        """
+        Copies the viewed subgraph into a graph of the same class as the
+        parent, in O(sum of the degrees of the selected vertices)
+
+        Returns:
+            A new graph object
+        """
+        return self.parent.subgraph(self._vertices)
+
+    def freeze(self):
+        """
+        Builds an immutable compressed sparse row copy of the viewed subgraph
+
+        Returns:
+            A FrozenGraph object
+        """
+        return self.parent.freeze().subgraph(self._vertices)
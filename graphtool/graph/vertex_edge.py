@@ -7,18 +7,33 @@ class Vertex:
 
     'data' : dict
 
-    A vertex is designed as an integer on which we build additionnal data
+    A vertex is designed as an integer on which we build additionnal data.
+    The data dictionary is only allocated once some data is attached to the
+    vertex. Until then, the name of the vertex is the string of its id.
     """
+    __slots__ = ("id", "_data")
 
     def __init__(self, id: int, data: dict = None):
         self.id = id
-        if data is None:
-            self.data = dict({"name": str(self.id)})
-        else:
-            self.data = data
-            if "name" not in self.data:
-                self.data["name"] = str(self.id)
-            self.id = self.data.get("id", self.id)
+        self._data = None
+        if data is not None:
+            self._data = data
+            if "name" not in self._data:
+                self._data["name"] = str(self.id)
+            self.id = self._data.get("id", self.id)
+
+    @property
+    def data(self):
+        """
+        The attribute dictionary of the vertex, allocated on first access
+        """
+        if self._data is None:
+            self._data = {"name": str(self.id)}
+        return self._data
+
+    @data.setter
+    def data(self, d):
+        self._data = d
 
     def __eq__(self, other):
         if isinstance(other, int):
@@ -46,13 +61,17 @@ class Vertex:
         return self.id >= other.id
 
     def __str__(self):
-        return self.data["name"]
+        return self["name"]
 
     def __repr__(self):
         return "V("+str(self.id)+")"
 
     def __getitem__(self, key):
-        return self.data[key]
+        if self._data is None:
+            if key == "name":
+                return str(self.id)
+            raise KeyError(key)
+        return self._data[key]
 
     def __setitem__(self, key, item):
         if key == "id":
@@ -64,6 +83,21 @@ class Vertex:
 
 
 class Edge:
+    """
+    'start', 'end' : Vertex
+
+    'weight' : number, default to 1
+
+    'oriented' : bool
+
+    'data' : dict
+
+    The ends and the weight of an edge are stored as attributes. The data
+    dictionary only holds additional attributes and is allocated once some
+    data is attached to the edge.
+    """
+    __slots__ = ("start", "end", "oriented", "weight", "_data")
+
     def __init__(self, *args, **kwargs):
         """
         Different ways to initialize an Edge:
@@ -72,41 +106,54 @@ class Edge:
             two names of vertices
         - Edge(a,b) where a and b are either Vertex objects or vertices' names
         """
-        self.data = kwargs.get("data", dict())
+        data = kwargs.get("data", None)
         self.oriented = kwargs.get("oriented", False)
+        self.weight = 1
+        self._data = None
         if len(args) == 1 and isinstance(args[0], Edge):
             self.start = args[0].start
             self.end = args[0].end
-            self.data = args[0].data
+            self.weight = args[0].weight
+            self._data = args[0]._data
             self.oriented = args[0].oriented
-        else:
-            a, b = None, None
-            if len(args) == 0:
-                # start and end are either specified as own kwargs or as
-                # a key in data dict
-                a, b = kwargs.get("start", None), kwargs.get("end", None)
+            return
+        a, b = None, None
+        if len(args) == 0:
+            # start and end are either specified as own kwargs or as
+            # a key in data dict
+            a, b = kwargs.get("start", None), kwargs.get("end", None)
+            if data is not None:
                 if a is None:
-                    a = self.data.get("start", None)
+                    a = data.get("start", None)
                 if b is None:
-                    b = self.data.get("end", None)
-                if a is None or b is None:
-                    raise Exception("Invalid argument")
-            elif len(args) == 1:
-                a, b = args[0][0], args[0][1]
-            elif len(args) == 2:
-                a, b = args[0], args[1]
-            else:
-                raise Exception("Too many arguments : only 2 were expected")
-            if not isinstance(a, Vertex):
-                a = Vertex(a)
-            if not isinstance(b, Vertex):
-                b = Vertex(b)
-            self.start = a
-            self.end = b
-            self.data["start"] = a
-            self.data["end"] = b
-            if "weight" not in self.data:
-                self.data["weight"] = 1
+                    b = data.get("end", None)
+            if a is None or b is None:
+                raise Exception("Invalid argument")
+        elif len(args) == 1:
+            a, b = args[0][0], args[0][1]
+        elif len(args) == 2:
+            a, b = args[0], args[1]
+        else:
+            raise Exception("Too many arguments : only 2 were expected")
+        if not isinstance(a, Vertex):
+            a = Vertex(a)
+        if not isinstance(b, Vertex):
+            b = Vertex(b)
+        self.start = a
+        self.end = b
+        if data:
+            for key in data:
+                self[key] = data[key]
+
+    @property
+    def data(self):
+        """
+        The dictionary of additional attributes of the edge, allocated on
+        first access
+        """
+        if self._data is None:
+            self._data = dict()
+        return self._data
 
     def __eq__(self, other):
         if self.oriented:
@@ -115,12 +162,12 @@ class Edge:
 
     def _get_comp(self, other):
         if self.oriented and other.oriented:
-            a = (self.data["weight"], self.start, self.end)
-            b = (other.data["weight"], other.start, other.end)
+            a = (self.weight, self.start, self.end)
+            b = (other.weight, other.start, other.end)
         else:
-            a = (self.data["weight"], min(self.start, self.end),
+            a = (self.weight, min(self.start, self.end),
                  max(self.start, self.end))
-            b = (other.data["weight"], min(other.start, other.end),
+            b = (other.weight, min(other.start, other.end),
                  max(other.start, other.end))
         return a, b
 
@@ -141,22 +188,35 @@ class Edge:
         return a >= b
 
     def __getitem__(self, key):
-        return self.data[key]
+        if key == "weight":
+            return self.weight
+        elif key == "start":
+            return self.start
+        elif key == "end":
+            return self.end
+        if self._data is None:
+            raise KeyError(key)
+        return self._data[key]
 
     def __setitem__(self, key, item):
-        if key == "start":
-            self.start = item
+        if key == "weight":
+            self.weight = item
+        elif key == "start":
+            self.start = item if isinstance(item, Vertex) else Vertex(item)
         elif key == "end":
-            self.end = item
-        self.data[key] = item
+            self.end = item if isinstance(item, Vertex) else Vertex(item)
+        else:
+            self.data[key] = item
 
     def __repr__(self):
         return "Edge("+str(self.start)+", "+str(self.end)+")"
 
     def __hash__(self):
-        if self.oriented or self.start < self.end:
-            return hash((self.start, self.end, self.oriented))
-        return hash((self.end, self.start, self.oriented))
+        # same value as hashing the Vertex objects, without their methods
+        a, b = self.start.id, self.end.id
+        if self.oriented or a < b:
+            return hash((a, b, self.oriented))
+        return hash((b, a, self.oriented))
 
     def other(self, v):
         if self.start == v:
@@ -179,6 +239,8 @@ class Edge:
         -------
         The reversed Edge object
         """
-        d = copy(edge.data)
-        d["end"], d["start"] = d["start"], d["end"]
-        return Edge(d["start"], d["end"], oriented=edge.oriented, data=d)
+        e = Edge(edge.end, edge.start, oriented=edge.oriented)
+        e.weight = edge.weight
+        if edge._data is not None:
+            e._data = copy(edge._data)
+        return e
@@ -9,5 +9,6 @@ setuptools.setup(
         author="Guillaume Coiffier, Louis Bethune, Simon Fernandez",
         description="A graph toolbox implementing classical algorithms",
         long_description=long_description,
-        packages=setuptools.find_packages()
+        packages=setuptools.find_packages(),
+        install_requires=["numpy"]
         )
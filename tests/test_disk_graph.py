@@ -0,0 +1,40 @@
+import pytest
+import numpy as np
+from graphtool.graph import *
+from graphtool.algorithms import *
+from utils import *
+
+
+def test_disk_graph(tmp_path, monkeypatch):
+    # small pages so that neighbourhoods span several of them
+    monkeypatch.setattr("graphtool.graph.diskGraph.PAGE_SIZE", 5)
+    path = "graph_examples/graph_1000n_4000m.txt"
+    graph = Graph.from_edge_list(path)
+    # a tiny budget forces many sorted runs in the external merge sort
+    disk = DiskGraph.from_edge_list(path, str(tmp_path / "g"),
+                                    memory=1 << 12)
+    assert len(disk) == len(graph)
+    assert set(disk.vertices()) == set(graph.vertices())
+    for v in graph.vertices():
+        assert disk.get_neighbours(v) == graph.get_neighbours(v)
+    assert disk.degree_sequence() == graph.degree_sequence()
+    reopened = DiskGraph(str(tmp_path / "g"), memory=1)
+    assert reopened.get_neighbours(0) == graph.get_neighbours(0)
+    functors = count_nodes_functors()
+    assert (depth_first_search(reopened, Vertex(0), functors)
+            == depth_first_search(graph, Vertex(0), functors))
+    assert breath_first_search(disk, 0) == breath_first_search(graph, 0)
+
+
+def test_disk_graph_oriented(tmp_path, oriented_triangle):
+    tables = [np.array([[0, 1], [1, 2]]), np.array([[2, 0], [0, 1], [3, 3]])]
+    disk = DiskGraph.from_edge_tables(tables, str(tmp_path / "g"),
+                                      oriented=True, memory=64)
+    assert len(disk) == 3
+    for v in oriented_triangle.vertices():
+        assert disk.get_neighbours(v) == oriented_triangle.get_neighbours(v)
+        assert (disk.get_neighbours_in(v)
+                == oriented_triangle.get_neighbours_in(v))
+    assert disk.get_in_degrees() == oriented_triangle.get_in_degrees()
+    with pytest.raises(KeyError):
+        disk.get_neighbours(3)
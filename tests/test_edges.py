@@ -74,3 +74,20 @@ def test_edge_setitem():
     edge = Edge(0, 1)
     edge["field"] = 42
     assert edge["field"] == 42
+
+
+def test_edge_slots():
+    edge = Edge(0, 1)
+    assert not hasattr(edge, "__dict__")
+    assert edge._data is None
+    assert edge["weight"] == 1
+    assert edge["start"] == Vertex(0)
+    edge["weight"] = 3
+    assert edge.weight == 3
+    assert edge._data is None
+    edge = Edge(data={"start": 0, "end": 1, "weight": 2, "name": "toto"})
+    assert edge.weight == 2
+    assert edge.data == {"name": "toto"}
+    # the ends and the weight are not part of the data dictionary
+    assert "weight" not in Edge(0, 1).data
+    assert edge["start"] == Vertex(0) and "start" not in edge.data
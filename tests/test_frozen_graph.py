@@ -0,0 +1,81 @@
+import pytest
+import random
+from graphtool.graph import *
+from graphtool.algorithms import *
+from utils import *
+
+
+def test_freeze(triangle, oriented_triangle, multi_triangle):
+    frozen = triangle.freeze()
+    assert len(frozen) == 3
+    assert frozen.vertices() == {Vertex(0), Vertex(1), Vertex(2)}
+    assert frozen.edges() == triangle.edges()
+    assert frozen.get_neighbours(0) == {Vertex(1), Vertex(2)}
+    assert frozen.adjacency_matrix() == triangle.adjacency_matrix()
+    assert frozen.thaw() == triangle
+    assert oriented_triangle.freeze().get_neighbours_in(0) == {Vertex(2)}
+    assert oriented_triangle.freeze().thaw() == oriented_triangle
+    assert len(multi_triangle.freeze().edges(erase_multiple=False)) == 4
+    assert multi_triangle.freeze().thaw() == multi_triangle
+
+
+def test_freeze_non_contiguous_ids():
+    g = GraphGenerator.empty(0)
+    g.add_edge(10, 42)
+    g.add_edge(42, 7)
+    frozen = g.freeze()
+    assert list(frozen.ids) == [7, 10, 42]
+    assert frozen.index_of(42) == 2
+    assert frozen.get_neighbours(42) == {Vertex(7), Vertex(10)}
+    assert 10 in frozen.vertices()
+    assert 11 not in frozen.vertices()
+
+
+def test_freeze_weights():
+    g = Graph.from_edge_list(
+        "graph_examples/triangle_edge_list.txt",
+        edge_data="graph_examples/triangle_edge_data.csv")
+    frozen = g.freeze()
+    weights = {frozenset((e.start.id, e.end.id)): e["weight"]
+               for e in frozen.edges()}
+    assert weights[frozenset((0, 1))] == 1.2
+    assert weights[frozenset((1, 2))] == 3.14
+    g = MultiGraph(dict())
+    g.add_edges_from([(0, 1, 2.5), (0, 1, 4), (1, 2, 3)])
+    frozen = g.freeze()
+    assert sorted(frozen.weights_index(frozen.index_of(1))) == [2.5, 3, 4]
+    assert sorted(e["weight"] for e in frozen.edges(erase_multiple=False)) \
+        == [2.5, 3, 4]
+
+
+def test_frozen_algorithms():
+    graph = Graph.from_edge_list("graph_examples/graph_100n_1000m.txt")
+    frozen = graph.freeze()
+    functors = count_nodes_functors()
+    assert depth_first_search(frozen, Vertex(0), functors) == 100
+    for _ in range(10):
+        i = random.randint(0, 99)
+        j = random.randint(0, 99)
+        assert dijkstra(frozen, Vertex(i), Vertex(j))[0] == \
+            dijkstra(graph, Vertex(i), Vertex(j))[0]
+    assert bellman_ford(frozen, Vertex(0)) == bellman_ford(graph, Vertex(0))
+    assert len(MST(frozen, algo='Kruskal')) == 99
+    assert len(MST(frozen, algo='Prim')) == 99
+    assert global_clustering_coeff(frozen) == global_clustering_coeff(graph)
+
+
+def test_frozen_components():
+    graph = Graph.from_edge_list("graph_examples/not_connex_10n.txt")
+    comp = get_connected_components(graph.freeze())
+    assert sorted(len(c) for c in comp) == [5, 5]
+    assert biggest_component_diameter(graph.freeze()) == \
+        biggest_component_diameter(graph)
+
+
+def test_frozen_topological_sort():
+    g = GraphGenerator.empty(4, type="oriented")
+    g.add_edge(0, 1)
+    g.add_edge(1, 2)
+    g.add_edge(2, 3)
+    assert topological_sort(g.freeze()) == [Vertex(3),
+                                            Vertex(2), Vertex(1), Vertex(0)]
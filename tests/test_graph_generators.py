@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from graphtool.graph import *
 from graphtool.graph.generator import *
 from utils import *
@@ -35,6 +36,23 @@ def test_random_graph_generator():
     assert len(graph2.vertices()) == 100
 
 
+def test_erdos_renyi_sampling():
+    n = 2000
+    graph = GraphGenerator.erdos_renyi_proba(n, 0.01)
+    assert len(graph) == n
+    m = len(graph.edges())
+    # n(n-1)/2 * p = 19990, the standard deviation being about 140
+    assert abs(m - 19990) < 1000
+    assert all(e.start != e.end for e in graph.edges())
+    graph = GraphGenerator.erdos_renyi_edge(n, 30000)
+    assert len(graph) == n
+    assert len(graph.edges()) == 30000
+    assert GraphGenerator.erdos_renyi_edge(6, 15) == GraphGenerator.clique(6)
+    assert GraphGenerator.erdos_renyi_edge(6, 0) == GraphGenerator.empty(6)
+    with pytest.raises(Exception):
+        GraphGenerator.erdos_renyi_edge(6, 16)
+
+
 def test_configuration_model():
     seq = [1, 1, 2, 2, 4]
     assert len(GraphGenerator.configuration_model(seq)) == 5
@@ -53,6 +71,12 @@ def test_barabasi_albert():
     assert len(graph.vertices()) == 100
     graph = GraphGenerator.barabasi_albert(100, 10)
     assert len(graph.vertices()) == 100
+    # every new node brings exactly m edges to distinct nodes
+    graph = GraphGenerator.barabasi_albert(5000, 3)
+    assert len(graph.edges()) >= 3*(5000 - 6)
+    assert all(len(graph.get_neighbours(v)) >= 3 for v in graph.vertices())
+    with pytest.raises(Exception):
+        GraphGenerator.barabasi_albert(100, 3, s=3)
 
 
 def test_watts_strogatz():
@@ -61,9 +85,133 @@ def test_watts_strogatz():
     beta = 0.25
     G = GraphGenerator.watts_strogatz(N, k, beta)
     assert sum(G.degree_sequence()) == N*k
+    assert GraphGenerator.watts_strogatz(N, k, 0) == \
+        GraphGenerator.cycle(N, k // 2)
+    G = GraphGenerator.watts_strogatz(1000, 6, 0.5)
+    assert sum(G.degree_sequence()) == 6000
     k = 3
     try:
         G = GraphGenerator.watts_strogatz(N, k, beta)
         assert False
     except Exception as e:
         assert str(e) == "The mean degree must be even"
+
+
+def test_seeded_generators(monkeypatch):
+    import graphtool.graph.generator as generator
+    monkeypatch.setattr(generator, "_BLOCK", 500)
+    g = GraphGenerator.erdos_renyi_proba(300, 0.05, seed=7)
+    assert g == GraphGenerator.erdos_renyi_proba(300, 0.05, seed=7,
+                                                 workers=2)
+    assert g != GraphGenerator.erdos_renyi_proba(300, 0.05, seed=8)
+    seq = [3, 1, 2, 2, 4, 5, 1]*300
+    g = GraphGenerator.configuration_model(seq, seed=5)
+    assert g == GraphGenerator.configuration_model(seq, seed=5, workers=2)
+    g = GraphGenerator.configuration_model(seq, allow_multiple=True, seed=5)
+    assert len(g.edges()) == sum(seq) // 2
+    for build in (lambda s: GraphGenerator.erdos_renyi_edge(100, 300, s),
+                  lambda s: GraphGenerator.barabasi_albert(300, 3, seed=s),
+                  lambda s: GraphGenerator.watts_strogatz(100, 4, 0.3, s)):
+        assert build(1) == build(1)
+        assert build(1) != build(2)
+        assert build(np.random.default_rng(3)) == \
+            build(np.random.SeedSequence(3))
+
+
+def test_edge_streams(tmp_path, monkeypatch):
+    import graphtool.graph.generator as generator
+    monkeypatch.setattr(generator, "_BLOCK", 300)
+    monkeypatch.setattr(generator, "_CHUNK", 1000)
+
+    def build(n, tables):
+        graph = Graph.from_edge_array(np.concatenate(list(tables)))
+        graph.add_vertices_from(range(n))
+        return graph
+    assert build(500, GraphGenerator.iter_erdos_renyi_proba(
+        500, 0.05, seed=3)) == GraphGenerator.erdos_renyi_proba(
+            500, 0.05, seed=3)
+    assert build(500, GraphGenerator.iter_erdos_renyi_edge(
+        500, 4000, seed=3)) == GraphGenerator.erdos_renyi_edge(
+            500, 4000, seed=3)
+    assert build(3000, GraphGenerator.iter_barabasi_albert(
+        3000, 3, seed=4)) == GraphGenerator.barabasi_albert(3000, 3, seed=4)
+    # populations too large for the hypergeometric draws of numpy
+    monkeypatch.setattr(generator, "_HYPERGEOMETRIC_LIMIT", 1000)
+    pairs = np.concatenate(list(GraphGenerator.iter_erdos_renyi_edge(
+        500, 4000, seed=3)))
+    assert len(np.unique(np.sort(pairs, axis=1), axis=0)) == 4000
+    seq = [3, 1, 2, 2, 4, 5, 1]*1000
+    pairs = np.concatenate(list(GraphGenerator.iter_configuration_model(
+        seq, seed=2)))
+    assert np.array_equal(np.bincount(pairs.ravel()), seq)
+    # the graph is built from the same blocks, capped in number
+    monkeypatch.setattr(generator, "_MAX_FILES", 16)
+    pairs = np.concatenate(list(GraphGenerator.iter_configuration_model(
+        seq, seed=2)))
+    graph = MultiGraph.from_edge_array(pairs)
+    graph.add_vertices_from(range(len(seq)))
+    assert graph == GraphGenerator.configuration_model(
+        seq, allow_multiple=True, seed=2, workers=2)
+
+    path = str(tmp_path / "edges.txt.gz")
+    count = GraphGenerator.write_edges(
+        path, GraphGenerator.iter_erdos_renyi_edge(500, 4000, seed=3))
+    assert count == 4000
+    assert Graph.from_edge_list(path) == \
+        GraphGenerator.erdos_renyi_edge(500, 4000, seed=3)
+    path = str(tmp_path / "edges.bin")
+    GraphGenerator.write_edges(path, GraphGenerator.iter_cycle(7, 2),
+                               binary=True)
+    pairs = np.fromfile(path, dtype="<i8").reshape(-1, 2)
+    assert Graph.from_edge_array(pairs) == GraphGenerator.cycle(7, 2)
+
+
+def test_rmat():
+    graph = GraphGenerator.rmat(8, seed=3)
+    assert len(graph) == 256
+    assert all(e.start != e.end for e in graph.edges())
+    assert graph == GraphGenerator.rmat(8, seed=3, workers=2)
+    graph = GraphGenerator.rmat(8, seed=3, type="multiple")
+    assert len(graph.edges()) == 16*256
+    pairs = np.concatenate(list(GraphGenerator.iter_rmat(10, seed=1)))
+    assert len(pairs) == 16*1024
+    # the degrees are skewed, unlike in G(n, p)
+    degrees = np.bincount(pairs.ravel(), minlength=1024)
+    assert degrees.max() > 10*np.median(degrees)
+    with pytest.raises(Exception):
+        GraphGenerator.rmat(8, a=0.9, b=0.1, c=0.1)
+
+
+def test_stochastic_block_model(monkeypatch):
+    import graphtool.graph.generator as generator
+    monkeypatch.setattr(generator, "_BLOCK", 500)
+    sizes = [300, 200, 100]
+    probabilities = [[0.1, 0.01, 0], [0.01, 0.2, 0.02], [0, 0.02, 0.5]]
+    graph = GraphGenerator.stochastic_block_model(sizes, probabilities,
+                                                  seed=1)
+    assert len(graph) == 600
+    assert graph == GraphGenerator.stochastic_block_model(
+        sizes, probabilities, seed=1, workers=2)
+    blocks = np.repeat([0, 1, 2], sizes)
+    counts = np.zeros((3, 3))
+    for e in graph.edges():
+        a, b = sorted((blocks[e.start.id], blocks[e.end.id]))
+        counts[a, b] += 1
+    expected = [[4485, 600, 0], [0, 3980, 400], [0, 0, 2475]]
+    assert np.all(np.abs(counts - expected) <= 4*np.sqrt(expected) + 1)
+    with pytest.raises(Exception):
+        GraphGenerator.stochastic_block_model([2, 2], [[0.5, 0.1], [0, 1]])
+
+
+def test_lattice():
+    grid = GraphGenerator.lattice((3, 4))
+    assert len(grid) == 12
+    assert len(grid.edges()) == 17
+    assert sorted(grid.degree_sequence()) == [2]*4 + [3]*6 + [4]*2
+    torus = GraphGenerator.lattice((3, 3, 3), periodic=True)
+    assert len(torus.edges()) == 81
+    assert set(torus.degree_sequence()) == {6}
+    assert GraphGenerator.lattice((7,), periodic=True) == \
+        GraphGenerator.cycle(7)
+    assert len(np.concatenate(list(GraphGenerator.iter_lattice(
+        (4, 5), periodic=True)))) == 40
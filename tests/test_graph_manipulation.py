@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from utils import *
 from graphtool.graph import *
 from graphtool.algorithms import *
@@ -128,7 +129,7 @@ def test_getters(triangle, oriented_triangle, multi_triangle):
     assert multi_triangle.vertices() == set([Vertex(0),
                                              Vertex(1),
                                              Vertex(2)])
-    edge_list = multi_triangle.edges()
+    edge_list = list(multi_triangle.edges())
     for e in [Edge(2, 0), Edge(1, 2), Edge(0, 1), Edge(0, 1)]:
         assert e in edge_list
         edge_list.remove(e)
@@ -157,3 +158,100 @@ def test_renumber_multi(multi_triangle):
     g.add_edge(5, 6)
     g.add_edge(6, 4)
     assert g.renumber() == multi_triangle
+
+
+def test_remove_vertices():
+    g = GraphGenerator.cycle(6)
+    g.edges()
+    g.remove_vertices([0, 3, 42])
+    assert set(g.vertices()) == {Vertex(1), Vertex(2), Vertex(4), Vertex(5)}
+    assert g.edges() == {Edge(1, 2), Edge(4, 5)}
+    assert g.vertex_degree() == [1, 1, 1, 1]
+
+
+def test_remove_vertex_keeps_edge_data():
+    g = Graph.from_edge_list(
+        "graph_examples/triangle_edge_list.txt",
+        edge_data="graph_examples/triangle_edge_data.csv")
+    g.remove_vertex(0)
+    assert [e["weight"] for e in g.edges()] == [3.14]
+
+
+def test_remove_vertices_oriented():
+    g = GraphGenerator.cycle(4, type="oriented")
+    g.edges()
+    g.remove_vertices([1, 2])
+    assert g.edges() == {Edge(3, 0, oriented=True)}
+    assert g.get_neighbours_in(0) == {Vertex(3)}
+    assert g.get_neighbours(0) == set()
+
+
+def test_remove_vertices_multi(multi_triangle):
+    multi_triangle.add_edge(1, 1)
+    multi_triangle.remove_vertices([0])
+    assert len(multi_triangle.edges()) == 2
+    assert multi_triangle.get_neighbours(1) == [Vertex(2), Vertex(1)]
+    multi_triangle.remove_vertices([1, 2])
+    assert len(multi_triangle) == 0
+
+
+def test_oriented_edge_list_with_sink():
+    g = OrientedGraph.from_edge_list([Edge(0, 1, oriented=True)])
+    assert set(g.vertices()) == {Vertex(0), Vertex(1)}
+    assert g.get_sinks() == [Vertex(1)]
+
+
+def test_add_edges_from(triangle):
+    g = GraphGenerator.empty(0)
+    g.add_edges_from([(0, 1), (1, 2), (2, 0)])
+    assert g == triangle
+    g = GraphGenerator.empty(3)
+    g.add_edges_from(np.array([[0, 1], [1, 2], [2, 0], [0, 1]]))
+    assert g == triangle
+    g = GraphGenerator.empty(0)
+    g.add_edges_from([(0, 1, 2.5), (1, 2, 1)])
+    assert {e["weight"] for e in g.get_neighbours_edge(1)} == {2.5, 1}
+    try:
+        g.add_edges_from([(3, 3)])
+        assert False
+    except Exception:
+        assert True
+
+
+def test_add_edges_from_oriented(oriented_triangle):
+    g = GraphGenerator.empty(0, type="oriented")
+    g.add_edges_from(np.array([[0, 1], [1, 2], [2, 0]]))
+    assert g == oriented_triangle
+    g.add_edges_from([Edge(0, 2, oriented=True, data={"weight": 4})])
+    assert Edge(0, 2, oriented=True) in g.edges()
+    assert g.get_neighbours_in(2) == {Vertex(0), Vertex(1)}
+
+
+def test_add_edges_from_multi(multi_triangle):
+    g = GraphGenerator.empty(0, type="multiple")
+    g.add_edges_from([(0, 1), (1, 2), (0, 1), (2, 0)])
+    assert g == multi_triangle
+    g.add_edges_from([(0, 0, 3)])
+    assert g.number_of_loops() == 1
+
+
+def test_remove_edges_from(triangle, oriented_triangle, multi_triangle):
+    triangle.remove_edges_from([(0, 1), (2, 0), (5, 6)])
+    assert triangle.edges() == {Edge(1, 2)}
+    oriented_triangle.remove_edges_from(np.array([[0, 1], [1, 0]]))
+    assert len(oriented_triangle.edges()) == 2
+    multi_triangle.remove_edges_from([(1, 0), (1, 2)])
+    assert sorted(multi_triangle.edges()) == sorted([Edge(0, 1), Edge(0, 2)])
+    assert multi_triangle.get_neighbours(0) == [Vertex(1), Vertex(2)]
+
+
+def test_add_vertices_from():
+    g = GraphGenerator.empty(2)
+    g.add_vertices_from(range(4))
+    assert len(g) == 4
+    g = GraphGenerator.empty(0, type="oriented")
+    g.add_vertices_from(np.arange(3))
+    assert g.get_sources() == [Vertex(0), Vertex(1), Vertex(2)]
+    g = GraphGenerator.empty(0, type="multiple")
+    g.add_vertices_from([Vertex(5)])
+    assert len(g) == 1
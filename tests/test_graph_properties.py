@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from graphtool.graph import *
 from graphtool.algorithms import *
 from utils import *
@@ -15,6 +16,32 @@ def test_adjacency(triangle):
     assert triangle.adjacency_matrix() == expected
 
 
+def test_adjacency_formats(triangle, oriented_triangle, multi_triangle):
+    expected = np.array([[0, 1, 1], [1, 0, 1], [1, 1, 0]])
+    mat, index = triangle.adjacency_matrix(format="dense")
+    assert np.array_equal(mat, expected)
+    assert index == {Vertex(0): 0, Vertex(1): 1, Vertex(2): 2}
+    mat, _ = triangle.adjacency_matrix(format="csr")
+    assert np.array_equal(mat.toarray(), expected)
+    mat, _ = oriented_triangle.adjacency_matrix(format="coo", dtype=float)
+    assert mat.dtype == float
+    assert np.array_equal(mat.toarray(), [[0, 1, 0], [0, 0, 1], [1, 0, 0]])
+    mat, _ = multi_triangle.adjacency_matrix(format="dense")
+    assert np.array_equal(mat, [[0, 2, 1], [2, 0, 1], [1, 1, 0]])
+    mat, _ = triangle.freeze().adjacency_matrix(format="csr")
+    assert np.array_equal(mat.toarray(), expected)
+
+
+def test_adjacency_weights_and_ids():
+    g = GraphGenerator.empty(0)
+    g.add_edges_from([(10, 42, 2.5), (42, 7, 1)])
+    mat, index = g.adjacency_matrix(format="dense")
+    assert index == {Vertex(7): 0, Vertex(10): 1, Vertex(42): 2}
+    assert mat[1, 2] == mat[2, 1] == 2.5
+    assert mat[0, 2] == 1
+    assert g.adjacency_matrix() == [[0, 0, 1], [0, 0, 1], [1, 1, 0]]
+
+
 def test_find_isolated_vertices():
     graph1 = Graph.from_edge_list("graph_examples/triangle_edge_list.txt")
     assert graph1.find_isolated_vertices() == []
@@ -48,6 +75,26 @@ def test_neighbours_edge():
     assert graph2.get_neighbours_edge(0) == {Edge(0, 1, oriented=True)}
 
 
+def test_neighbours_edge_with_data():
+    graph1 = Graph.from_edge_list(
+        "graph_examples/triangle_edge_list.txt",
+        edge_data="graph_examples/triangle_edge_data.csv")
+    graph2 = OrientedGraph.from_edge_list(
+        "graph_examples/triangle_edge_list.txt",
+        edge_data="graph_examples/triangle_edge_data.csv")
+    graph3 = MultiGraph.from_edge_list([Edge(0, 1), Edge(0, 1), Edge(1, 2)])
+    weights = {e.other(1): e["weight"] for e in graph1.get_neighbours_edge(1)}
+    assert weights == {Vertex(0): 1.2, Vertex(2): 3.14}
+    graph1.add_edge(Edge(1, 3, data={"weight": 7}))
+    graph1.remove_edge(1, 2)
+    weights = {e.other(1): e["weight"] for e in graph1.get_neighbours_edge(1)}
+    assert weights == {Vertex(0): 1.2, Vertex(3): 7}
+    assert [e["weight"] for e in graph2.get_neighbours_edge_in(2)] == [3.14]
+    assert len(graph3.get_neighbours_edge(1)) == 3
+    graph3.remove_edge(0, 1)
+    assert len(graph3.get_neighbours_edge(1)) == 2
+
+
 def test_edges():
     graph1 = Graph.from_edge_list("graph_examples/triangle_edge_list.txt")
     graph2 = OrientedGraph.from_edge_list(
@@ -103,3 +150,74 @@ def test_multigraph_multi_edges():
     g.add_edge(0, 1)
     g.add_edge(0, 1)
     assert g.number_of_multiple_edges() == 2
+
+
+def test_cache_invalidation(triangle, oriented_triangle, multi_triangle):
+    assert triangle.degree_sequence() == [2, 2, 2]
+    assert triangle.freeze() is triangle.freeze()
+    assert triangle.edges() is triangle.edges()
+    assert multi_triangle.edges() is multi_triangle.edges()
+    assert isinstance(oriented_triangle.edges(), frozenset)
+    triangle.add_edge(0, 3)
+    assert triangle.degree_sequence() == [3, 2, 2, 1]
+    assert len(triangle.adjacency_matrix()) == 4
+    assert len(triangle.edges()) == 4
+    assert len(get_connected_components(triangle)) == 1
+    triangle.add_vertex(4)
+    assert len(get_connected_components(triangle)) == 2
+    assert oriented_triangle.get_out_degrees()[Vertex(0)] == 1
+    oriented_triangle.add_edge(0, 2)
+    assert oriented_triangle.get_out_degrees()[Vertex(0)] == 2
+    assert len(multi_triangle.edges()) == 4
+    multi_triangle.remove_edge(0, 1)
+    assert len(multi_triangle.edges()) == 3
+
+
+def test_cache_limit(triangle):
+    triangle.degree_sequence()
+    triangle.adjacency_matrix()
+    assert len(triangle._cache) == 3
+    triangle.set_cache_limit(1)
+    assert len(triangle._cache) == 0
+    triangle.degree_sequence()
+    assert "degree_sequence" in triangle._cache
+    assert len(triangle._cache) == 1
+    triangle.clear_cache("degree_sequence")
+    assert len(triangle._cache) == 0
+    triangle.set_cache_limit(0)
+    triangle.adjacency_matrix()
+    assert len(triangle._cache) == 0
+
+
+def test_attribute_tables():
+    graph = Graph.from_edge_list(
+        "graph_examples/triangle_edge_list.txt",
+        vertex_data="graph_examples/triangle_vertex_data.csv",
+        edge_data="graph_examples/triangle_edge_data.csv")
+    table = graph.vertex_attributes()
+    assert table["weight"].tolist() == [10.0, 5.0, 42.0]
+    v = [u for u in graph.vertices() if u == 1][0]
+    assert v["name"] == "un" and str(v) == "un"
+    v["name"] = "un et demi"
+    assert table["name"][1] == "un et demi"
+    v["color"] = 3
+    assert "color" in v.data
+    assert "color" not in table.row(0)
+    v["pair"] = [1, 2]
+    v["tags"] = {"x": 1}
+    assert v["pair"] == [1, 2] and v["tags"] == {"x": 1}
+    assert graph.select_vertices("weight", lambda w: w > 7) == \
+        [Vertex(0), Vertex(2)]
+    # a value of another type leaves the other rows as they were
+    v["weight"] = "heavy"
+    v["testbool"] = 2
+    v["name"] = "un et trois quarts"
+    others = sorted(u for u in graph.vertices() if u != 1)
+    assert [u["weight"] for u in others] == [10.0, 42.0]
+    assert [u["testbool"] for u in others] == [True, True]
+    assert v["weight"] == "heavy" and v["testbool"] == 2
+    assert table["name"].dtype.kind == "U"
+    edges = graph.edge_attributes()
+    assert edges["weight"].tolist() == [1.2, 3.14, 59.666]
+    assert sorted(e["name"] for e in graph.edges()) == \
+        [" tata", " toto", " tutu"]
@@ -1,5 +1,14 @@
+import bz2
+import gzip
+import lzma
+import pickle
+from concurrent.futures import ProcessPoolExecutor
 import pytest
+import numpy as np
 from graphtool.graph import *
+from graphtool.graph._parsing import read_records
+from graphtool.graph._parsing import parse_node_data, parse_edge_data
+from graphtool.graph._parallel import split_lines
 from utils import *
 
 
@@ -31,6 +40,14 @@ def test_export_as_adjacency_matrix():
     assert graph1 == graph2
 
 
+def test_write_float_matrix(tmp_path):
+    from graphtool.graph._parsing import write_matrix
+    path = str(tmp_path / "matrix.txt")
+    write_matrix(path, np.array([[0, 1.5, 0.1], [1.5, 0, 0], [0.1, 0, 0]]))
+    graph = Graph.from_adjacency_matrix(path)
+    assert sorted(e.weight for e in graph.edges()) == [0.1, 1.5]
+
+
 def test_graph_from_adjacency_dict(triangle):
     graph1 = Graph.from_adjacency_dict("graph_examples/triangle_adjacency.txt")
     assert (graph1 == triangle)
@@ -172,6 +189,27 @@ def test_subgraph(triangle, oriented_triangle, multi_triangle):
     assert multi_triangle.subgraph(
         [Vertex(0)]) == GraphGenerator.empty(1, type="multiple")
     assert multi_triangle.subgraph([0, 1, 2]) == multi_triangle
+    pair = multi_triangle.subgraph([0, 1])
+    assert len(pair.edges()) == 2
+    assert len(multi_triangle.edges()) == 4
+
+
+def test_subgraph_view(triangle, oriented_triangle, multi_triangle):
+    view = triangle.subgraph_view([0, 1])
+    assert len(view) == 2
+    assert view.get_neighbours(0) == {Vertex(1)}
+    assert view.edges() == {Edge(0, 1)}
+    triangle.remove_edge(0, 1)
+    assert view.get_neighbours(0) == set()
+    assert view.materialize() == GraphGenerator.empty(2)
+    view = oriented_triangle.subgraph_view([0, 1])
+    assert view.get_neighbours_in(1) == {Vertex(0)}
+    assert view.get_neighbours_in(0) == set()
+    assert view.materialize() == oriented_triangle.subgraph([0, 1])
+    view = multi_triangle.subgraph_view([0, 1])
+    assert view.get_neighbours(0) == [Vertex(1), Vertex(1)]
+    assert len(view.edges()) == 2
+    assert view.freeze() == view.materialize()
 
 # ----------- Multigraph tests --------------------
 
@@ -261,3 +299,420 @@ def test_multiple_all_import_with_data():
     assert graph_edge == graph_adj
     assert graph_adj == graph_mat
     assert graph_mat == graph_edge
+
+
+# ----------- Streaming loader tests --------------------
+
+
+def test_compressed_edge_list(tmp_path, triangle, oriented_triangle):
+    text = "# a comment\n% another one\n0 1\n\n1 2\n2 0"
+    for (ext, module) in [("gz", gzip), ("bz2", bz2), ("xz", lzma)]:
+        path = str(tmp_path / ("triangle." + ext))
+        with module.open(path, "wt") as f:
+            f.write(text)
+        assert Graph.from_edge_list(path) == triangle
+        assert OrientedGraph.from_edge_list(path) == oriented_triangle
+        assert len(MultiGraph.from_edge_list(path).edges()) == 3
+
+
+def test_edge_list_delimiter_and_weights(tmp_path):
+    path = tmp_path / "weighted.csv"
+    path.write_text("0,1,2.5\n1,2,0.5\n")
+    for cls in (Graph, OrientedGraph, MultiGraph):
+        g = cls.from_edge_list(str(path), delimiter=",", weighted=True)
+        assert sorted(e.weight for e in g.edges()) == [0.5, 2.5]
+
+
+def test_read_records_chunks(tmp_path):
+    path = tmp_path / "long.txt"
+    path.write_text("".join("{} {}\n".format(i, i+1) for i in range(1000)))
+    chunks = list(read_records(str(path), chunk_size=64))
+    assert len(chunks) > 1
+    records = [r for chunk in chunks for r in chunk]
+    assert records == [[str(i), str(i+1)] for i in range(1000)]
+
+
+def test_from_edge_array(triangle, oriented_triangle, multi_triangle):
+    arr = np.array([[0, 1], [1, 2], [2, 0], [1, 0]])
+    assert Graph.from_edge_array(arr) == triangle
+    assert OrientedGraph.from_edge_array(arr[:3]) == oriented_triangle
+    assert MultiGraph.from_edge_array(arr) == multi_triangle
+    g = Graph.from_edge_array(arr, weights=[1, 2, 3, 4])
+    assert sorted(e.weight for e in g.edges()) == [2, 3, 4]
+    g = MultiGraph.from_edge_array([[0, 0], [0, 1]], weights=[5, 6])
+    assert g.number_of_loops() == 1
+    assert sorted(e.weight for e in g.edges()) == [5, 6]
+    with pytest.raises(Exception):
+        Graph.from_edge_array([[0, 0]])
+
+
+def test_from_edge_array_data():
+    arr = np.array([[0, 1], [1, 2], [2, 0], [3, 0]])
+    weights = [1, 2, 3, 4]
+    label = np.ma.array(["a", "b", "c", "d"], mask=[0, 0, 1, 0])
+    for cls in (Graph, OrientedGraph, MultiGraph):
+        # the Edge objects are only built when needed
+        g = cls.from_edge_array(arr, weights=weights, data={"label": label})
+        frozen = g.freeze()
+        assert g._lazy_edges is not None
+        assert frozen == cls.from_edge_array(arr, weights=weights).freeze()
+        assert g.edge_attributes()["label"][0] == "a"
+        edges = {frozenset((e.start.id, e.end.id)): e for e in g.edges()}
+        assert edges[frozenset((0, 1))]["label"] == "a"
+        assert edges[frozenset((1, 2))].weight == 2
+        assert "label" not in edges[frozenset((0, 2))].data
+        g = cls.from_edge_array(arr, weights=weights, data={"label": label})
+        g.remove_vertex(0)
+        assert [(e.start.id, e.end.id, e["label"])
+                for e in g.edges()] == [(1, 2, "b")]
+
+
+def test_fast_edge_list(tmp_path):
+    path = tmp_path / "edges.txt.gz"
+    with gzip.open(str(path), "wt") as f:
+        f.write("# source target weight\n0,1,0.5\n1,2,1.5\n2,0,2.5\n")
+    for cls in (Graph, OrientedGraph, MultiGraph):
+        slow = cls.from_edge_list(str(path), delimiter=",", weighted=True)
+        fast = cls.from_edge_list(str(path), delimiter=",", weighted=True,
+                                  fast=True)
+        assert fast == slow
+        assert sorted(e.weight for e in fast.edges()) == [0.5, 1.5, 2.5]
+    graph = Graph.from_edge_list("graph_examples/graph_100n_1000m.txt")
+    assert Graph.from_edge_list("graph_examples/graph_100n_1000m.txt",
+                                fast=True) == graph
+
+
+def test_split_lines():
+    path = "graph_examples/graph_100n_1000m.txt"
+    ranges = split_lines(path, 7)
+    assert ranges[0][0] == 0
+    assert all(a[1] == b[0] for (a, b) in zip(ranges[:-1], ranges[1:]))
+    with open(path, "rb") as f:
+        data = f.read()
+    assert ranges[-1][1] == len(data)
+    assert all(data[b-1:b] == b"\n" for (_, b) in ranges[:-1])
+
+
+def test_parallel_loaders(tmp_path):
+    edges = "graph_examples/graph_100n_1000m.txt"
+    for cls in (Graph, OrientedGraph, MultiGraph):
+        assert cls.from_edge_list(edges, workers=3) == \
+            cls.from_edge_list(edges)
+    for (adjacency, matrix, classes) in (
+            ("triangle_adjacency.txt", "triangle_matrix.txt",
+             (Graph, MultiGraph)),
+            ("triangle_adjacency_oriented.txt",
+             "triangle_matrix_oriented.txt", (OrientedGraph,))):
+        for cls in classes:
+            path = "graph_examples/" + adjacency
+            assert cls.from_adjacency_dict(path, workers=2) == \
+                cls.from_adjacency_dict(path)
+            path = "graph_examples/" + matrix
+            assert cls.from_adjacency_matrix(path, workers=2) == \
+                cls.from_adjacency_matrix(path)
+    # isolated vertices and weights go through from_edge_array as well
+    path = str(tmp_path / "matrix.txt")
+    with open(path, "w") as f:
+        f.write("0 2 0 0\n2 0 1 0\n0 1 0 0\n0 0 0 0\n")
+    for cls in (Graph, OrientedGraph, MultiGraph):
+        graph = cls.from_adjacency_matrix(path, workers=2)
+        assert sorted(v.id for v in graph.vertices()) == [0, 1, 2, 3]
+    weights = [e.weight for e in
+               Graph.from_adjacency_matrix(path, workers=2).edges()]
+    assert sorted(weights) == [1, 2]
+    assert len(MultiGraph.from_adjacency_matrix(path, workers=2).edges()) \
+        == 3
+    path = str(tmp_path / "edges.txt.gz")
+    with gzip.open(path, "wt") as f:
+        f.write("0 1\n1 2\n")
+    with pytest.raises(Exception):
+        Graph.from_edge_list(path, workers=2)
+
+
+def test_columnar_data():
+    vertices = parse_node_data("graph_examples/triangle_vertex_data.csv")
+    assert [v.data["weight"] for v in vertices] == [10.0, 5.0, 42.0]
+    columns = parse_node_data("graph_examples/triangle_vertex_data.csv",
+                              columnar=True)
+    assert columns["id"].dtype == np.int64
+    assert columns["name"].tolist() == ["zero", "un", "deux"]
+    assert columns["posy"].tolist() == [2.0, 4.0, 4.0]
+    columns = parse_edge_data("graph_examples/triangle_edge_data.csv",
+                              columnar=True)
+    assert columns["start"].tolist() == [0, 1, 2]
+    assert columns["end"].tolist() == [1, 2, 0]
+    assert columns["weight"].dtype == np.float64
+    edges = parse_edge_data("graph_examples/triangle_edge_data.csv")
+    assert edges[(1, 2)][0].weight == 3.14
+
+
+# ----------- Binary format tests --------------------
+
+
+def test_binary_round_trip(tmp_path, triangle, oriented_triangle,
+                           multi_triangle):
+    path = str(tmp_path / "graph.bin")
+    for graph in (triangle, oriented_triangle, multi_triangle):
+        graph.save(path)
+        frozen = Graph.load(path)
+        assert isinstance(frozen.ids, np.memmap)
+        assert frozen == graph
+        thawed = Graph.load(path, mmap=False)
+        assert type(thawed) is type(graph)
+        assert thawed == graph
+    thawed.export_as_edge_list(str(tmp_path / "edges.txt"))
+    assert MultiGraph.from_edge_list(str(tmp_path / "edges.txt")) == thawed
+
+
+def test_binary_weights_and_attributes(tmp_path):
+    path = str(tmp_path / "graph.bin")
+    graph = Graph.from_edge_list("graph_examples/triangle_edge_list.txt",
+                                 "graph_examples/triangle_vertex_data.csv")
+    graph.add_edges_from([(0, 1, 2.5)])
+    graph.save(path)
+    frozen = FrozenGraph.load(path)
+    assert sorted(frozen.attributes) == sorted(graph_vertex(graph, 0).data)
+    thawed = frozen.thaw()
+    assert thawed == graph
+    assert graph_vertex(thawed, 2).data == graph_vertex(graph, 2).data
+    assert sorted(e.weight for e in thawed.edges()) == [1, 1, 2.5]
+
+
+def test_binary_skips_non_scalar_attributes(tmp_path):
+    path = str(tmp_path / "graph.bin")
+    graph = Graph.from_edge_list("graph_examples/triangle_edge_list.txt",
+                                 "graph_examples/triangle_vertex_data.csv")
+    for v in graph.vertices():
+        v["tags"] = {"id": v.id}
+        v["pair"] = [v.id, 2*v.id]
+        v["path"] = list(range(v.id))
+    graph.save(path)
+    assert sorted(Graph.load(path).attributes) == \
+        ["id", "name", "posx", "posy", "testbool", "weight"]
+    thawed = Graph.load(path, mmap=False)
+    assert thawed == graph
+    for v in thawed.vertices():
+        data = graph_vertex(graph, v.id).data
+        assert v.data == {key: data[key] for key in data
+                          if key not in ("tags", "pair", "path")}
+
+
+def test_binary_edge_attributes(tmp_path):
+    path = str(tmp_path / "graph.bin")
+    for cls in (Graph, OrientedGraph, MultiGraph):
+        graph = cls.from_edge_list(
+            "graph_examples/triangle_edge_list.txt",
+            edge_data="graph_examples/triangle_edge_data.csv")
+        graph.save(path)
+        frozen = Graph.load(path)
+        assert sorted(frozen.edge_attributes) == ["name", "testbool"]
+        names = {(e.start.id, e.end.id): e["name"] for e in frozen.edges()}
+        assert names[(1, 2)] == " toto"
+        thawed = Graph.load(path, mmap=False)
+        assert sorted((e.weight, dict(e.data.items()))
+                      for e in thawed.edges()) == \
+            sorted((e.weight, dict(e.data.items())) for e in graph.edges())
+        graph.add_edge(3, 4)
+        with pytest.raises(Exception, match="not set on every edge"):
+            graph.save(path)
+    graph = MultiGraph(dict())
+    graph.add_edges_from([Edge(0, 1, data={"c": "a"}),
+                          Edge(0, 1, data={"c": "b"})])
+    graph.save(path)
+    thawed = Graph.load(path, mmap=False)
+    assert sorted(e["c"] for e in thawed.edges()) == ["a", "b"]
+    for e in graph.edges():
+        e["c"] = [1, 2]
+    with pytest.raises(Exception, match="only booleans"):
+        graph.save(path)
+
+
+def graph_vertex(graph, i):
+    return [v for v in graph.vertices() if v == i][0]
+
+
+def test_data_round_trip(tmp_path):
+    graph = Graph.from_edge_list(
+        "graph_examples/triangle_edge_list.txt",
+        vertex_data="graph_examples/triangle_vertex_data.csv",
+        edge_data="graph_examples/triangle_edge_data.csv")
+    edges, vertex_data, edge_data = (str(tmp_path / name) for name in (
+        "edges.txt", "vertices.csv", "edges.csv"))
+    graph.export_as_edge_list(edges, weighted=True)
+    graph.export_vertex_data(vertex_data)
+    graph.export_edge_data(edge_data)
+    weighted = Graph.from_edge_list(edges, weighted=True)
+    assert sorted(e.weight for e in weighted.edges()) == [1.2, 3.14, 59.666]
+    copy = Graph.from_edge_list(edges, vertex_data=vertex_data,
+                                edge_data=edge_data)
+    assert copy == graph
+    for v in graph.vertices():
+        assert graph_vertex(copy, v.id).data == v.data
+    assert graph_vertex(copy, 1)["testbool"] is False
+    assert sorted((e.weight, e["name"]) for e in copy.edges()) == \
+        sorted((e.weight, e["name"]) for e in graph.edges())
+
+
+def test_sparse_matrix_import(tmp_path):
+    graph = OrientedGraph.from_adjacency_matrix([[0, 2.5], [0, 0]])
+    assert len(graph) == 2
+    assert [e.weight for e in graph.edges()] == [2.5]
+    path = str(tmp_path / "graph.mtx")
+    with open(path, "w") as f:
+        f.write("%%MatrixMarket matrix coordinate real symmetric\n"
+                "% a comment\n3 3 2\n2 1 0.5\n3 2 4\n")
+    graph = Graph.from_adjacency_matrix(path)
+    assert graph == Graph.from_adjacency_matrix(
+        [[0, 0.5, 0], [0.5, 0, 4], [0, 4, 0]])
+    assert sorted(e.weight for e in graph.edges()) == [0.5, 4]
+    with open(path, "w") as f:
+        f.write("%%MatrixMarket matrix coordinate pattern general\n"
+                "2 2 1\n1 2\n")
+    graph = OrientedGraph.from_adjacency_matrix(path)
+    assert [(e.start, e.end) for e in graph.edges()] == [(0, 1)]
+    with gzip.open(path + ".gz", "wt") as f:
+        f.write("%%MatrixMarket matrix coordinate pattern general\n"
+                "2 2 1\n1 2\n")
+    assert OrientedGraph.from_adjacency_matrix(path + ".gz") == graph
+    # only the suffix of the name tells a Matrix Market file
+    directory = tmp_path / "data.mtx_old"
+    directory.mkdir()
+    path = str(directory / "graph.txt")
+    with open(path, "w") as f:
+        f.write("0 1\n1 0\n")
+    assert Graph.from_adjacency_matrix(path) == \
+        Graph.from_adjacency_matrix([[0, 1], [1, 0]])
+
+
+def test_matrix_market_round_trip(tmp_path):
+    path = str(tmp_path / "graph.mtx")
+    for (cls, name) in ((Graph, "triangle_matrix.txt"),
+                        (MultiGraph, "triangle_matrix.txt"),
+                        (OrientedGraph, "triangle_matrix_oriented.txt")):
+        graph = cls.from_adjacency_matrix("graph_examples/" + name)
+        graph.export_as_matrix_market(path)
+        assert cls.from_adjacency_matrix(path) == graph
+    graph = Graph.from_edge_list("graph_examples/graph_100n_1000m.txt")
+    graph.export_as_matrix_market(path)
+    assert Graph.from_adjacency_matrix(path) == graph
+
+
+def test_metis_snap_dimacs(tmp_path):
+    path = str(tmp_path / "graph.txt")
+    with open(path, "w") as f:
+        f.write("% triangle with a pendant and an isolated vertex\n"
+                "5 4 011\n1 2 3 3 4\n2 1 3 3 2\n3 1 4 2 2 4 1\n4 3 1\n5\n\n")
+    graph = Graph.from_metis(path)
+    assert len(graph) == 5 and graph.get_neighbours(4) == set()
+    expected = Graph.from_edge_array([[0, 1], [0, 2], [1, 2], [2, 3]])
+    expected.add_vertex(4)
+    assert graph == expected
+    assert sorted(e.weight for e in graph.edges()) == [1, 2, 3, 4]
+    assert graph_vertex(graph, 2)["weight"] == 3
+    assert sorted(MultiGraph.from_metis(path).vertex_degree()) == \
+        [0, 1, 2, 2, 3]
+    assert len(OrientedGraph.from_metis(path).edges()) == 8
+    with open(path, "w") as f:
+        f.write("3 1\n2\n1\n\n")
+    graph = Graph.from_metis(path)
+    assert len(graph) == 3 and len(graph.edges()) == 1
+    with open(path, "w") as f:
+        f.write("# Directed graph: example.txt\n"
+                "# Nodes: 3 Edges: 3\n# FromNodeId\tToNodeId\n"
+                "0\t1\n1\t2\n2\t0\n")
+    assert OrientedGraph.from_snap(path) == OrientedGraph.from_edge_array(
+        [[0, 1], [1, 2], [2, 0]])
+    assert Graph.from_snap(path) == Graph.from_edge_array(
+        [[0, 1], [1, 2], [2, 0]])
+    with open(path, "w") as f:
+        f.write("c shortest path\np sp 4 3\na 1 2 7\na 2 3 1\na 3 1 2\n")
+    graph = OrientedGraph.from_dimacs(path)
+    assert len(graph) == 4
+    assert sorted((e.start.id, e.end.id, e.weight)
+                  for e in graph.edges()) == [(1, 2, 7), (2, 3, 1), (3, 1, 2)]
+    assert len(MultiGraph.from_dimacs(path).edges()) == 3
+
+
+def test_graphml(tmp_path):
+    path = str(tmp_path / "graph.graphml")
+    with open(path, "w") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+                '<key id="d0" for="node" attr.name="color" '
+                'attr.type="string"><default>red</default></key>\n'
+                '<key id="d1" for="edge" attr.name="weight" '
+                'attr.type="double"/>\n'
+                '<key id="d2" for="edge" attr.name="ok" attr.type="boolean"/>'
+                '\n<graph id="G" edgedefault="undirected">\n'
+                '<node id="a"><data key="d0">blue</data></node>\n'
+                '<node id="b"/>\n<node id="c"/>\n<node id="d"/>\n'
+                '<edge source="a" target="b"><data key="d1">2.5</data>'
+                '<data key="d2">true</data></edge>\n'
+                '<edge source="b" target="c"/>\n'
+                '</graph>\n</graphml>\n')
+    graph = Graph.from_graphml(path)
+    expected = Graph.from_edge_array([[0, 1], [1, 2]])
+    expected.add_vertex(3)
+    assert graph == expected
+    assert str(graph_vertex(graph, 3)) == "d"
+    a, c = graph_vertex(graph, 0), graph_vertex(graph, 2)
+    assert (str(a), a["color"], str(c), c["color"]) == \
+        ("a", "blue", "c", "red")
+    bc, ab = sorted(graph.edges(), key=lambda e: e.weight)
+    assert ab.weight == 2.5 and ab["ok"] is True and bc.weight == 1
+    assert "ok" not in bc.data
+    assert len(OrientedGraph.from_graphml(path).edges()) == 4
+    assert len(MultiGraph.from_graphml(path).edges()) == 2
+
+
+def test_pickle_round_trip(triangle, oriented_triangle, multi_triangle):
+    graph = Graph.from_edge_list(
+        "graph_examples/triangle_edge_list.txt",
+        vertex_data="graph_examples/triangle_vertex_data.csv",
+        edge_data="graph_examples/triangle_edge_data.csv")
+    next(iter(graph.edges()))["color"] = "red"
+    # these loaders key the edges by integer ids
+    adjacency = [cls.from_adjacency_dict(
+        "graph_examples/triangle_adjacency.txt",
+        edge_data="graph_examples/triangle_edge_data.csv")
+        for cls in (Graph, MultiGraph)]
+    for g in [graph, triangle, oriented_triangle, multi_triangle,
+              OrientedGraph.from_edge_array([[0, 1], [1, 2]], [2.5, 3])] \
+            + adjacency:
+        copy = pickle.loads(pickle.dumps(g, protocol=5))
+        assert type(copy) is type(g) and copy == g
+        assert sorted((e.weight, dict(e.data.items())) for e in
+                      copy.edges()) == \
+            sorted((e.weight, dict(e.data.items())) for e in g.edges())
+        assert [v.data for v in copy.vertices()] == \
+            [v.data for v in g.vertices()]
+    copy = pickle.loads(pickle.dumps(graph, protocol=5))
+    assert copy.select_vertices("weight", lambda x: x > 6) == \
+        graph.select_vertices("weight", lambda x: x > 6) == [0, 2]
+
+
+def degrees(shared):
+    return sorted(shared.graph().vertex_degree())
+
+
+def test_shared_graph():
+    graph = Graph.from_edge_list("graph_examples/graph_100n_1000m.txt")
+    for g in (graph, graph.freeze()):
+        with g.share() as shared:
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                results = list(executor.map(degrees, [shared]*2))
+            assert results == [sorted(g.vertex_degree())]*2
+            assert shared.graph() == g
+
+
+def test_shared_graph_kept_after_close():
+    from multiprocessing import shared_memory
+    frozen = Graph.from_edge_list(
+        "graph_examples/graph_100n_1000m.txt").freeze()
+    with frozen.share() as shared:
+        graph = shared.graph()
+    # the segment is unlinked, while the views of the graph stay valid
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=shared.name)
+    assert graph == frozen
+    shared.close()
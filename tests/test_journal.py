@@ -0,0 +1,65 @@
+import os
+import numpy as np
+from graphtool.graph import *
+from utils import *
+
+
+def mutate(graph):
+    graph.add_edge(0, 1)
+    graph.add_edges_from([(1, 2, 2.5), (2, 3)])
+    graph.add_vertex(7)
+    graph.remove_edge(0, 1)
+    graph.add_edges_from(np.array([[4, 5], [5, 6]]))
+    graph.add_vertices_from([8, 9])
+    graph.remove_vertex(5)
+    graph.remove_edges_from([(2, 3)])
+
+
+def test_journal_replay(tmp_path):
+    for cls in (Graph, OrientedGraph, MultiGraph):
+        directory = str(tmp_path / cls.__name__)
+        journal = Journal(directory, sync_every=4)
+        graph = journal.load(cls)
+        mutate(graph)
+        journal.close()
+        expected = cls(dict())
+        mutate(expected)
+        restored = Journal(directory).load()
+        assert type(restored) is cls and restored == expected == graph
+        assert [e.weight for e in restored.edges()] == [2.5]
+
+
+def test_journal_compaction(tmp_path, triangle):
+    directory = str(tmp_path / "g")
+    journal = Journal(directory, sync_every=1, compact_every=3)
+    journal.attach(triangle)
+    for i in range(3, 10):
+        triangle.add_edge(i - 1, i)
+    journal.close()
+    assert sorted(os.listdir(directory)) == ["journal-3.log",
+                                             "snapshot-3.pickle"]
+    restored = Journal(directory).load()
+    assert restored == triangle
+    # a record cut by a crash is dropped
+    with open(os.path.join(directory, "journal-3.log"), "ab") as f:
+        f.write(b"\x03\x00")
+    journal = Journal(directory)
+    restored = journal.load()
+    restored.add_edge(10, 11)
+    journal.close()
+    triangle.add_edge(10, 11)
+    assert Journal(directory).load() == triangle
+
+
+def test_journal_edge_data(tmp_path):
+    # from_adjacency_dict keys the edges of the edge data by integer ids
+    for cls in (Graph, MultiGraph):
+        directory = str(tmp_path / cls.__name__)
+        graph = cls.from_adjacency_dict(
+            "graph_examples/triangle_adjacency.txt",
+            edge_data="graph_examples/triangle_edge_data.csv")
+        journal = Journal(directory)
+        journal.attach(graph)
+        graph.add_edge(2, 3)
+        journal.close()
+        assert Journal(directory).load() == graph
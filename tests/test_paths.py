@@ -47,3 +47,30 @@ def test_bellman_ford():
             j = random.randint(0, N-1)
             dist = bellman_ford(graph, Vertex(i))
             assert adj[i][j] == dist[Vertex(j)]
+
+
+def test_bellman_ford_non_oriented():
+    # both directions of a non-oriented edge are relaxed
+    graph = Graph(dict())
+    graph.add_edges_from([(0, 1, 2), (1, 2, 3), (0, 2, 7)])
+    dist = bellman_ford(graph, Vertex(2))
+    assert dist == {Vertex(0): 5, Vertex(1): 3, Vertex(2): 0}
+    assert bellman_ford(graph.freeze(), Vertex(2)) == dist
+    graph.add_edge(Edge(2, 3, data={"weight": -1}))
+    with pytest.raises(Exception, match="Negative cycle"):
+        bellman_ford(graph, Vertex(0))
+
+
+def test_weight_column(tmp_path):
+    path = str(tmp_path / "edges.csv")
+    with open(path, "w") as f:
+        f.write("start(INT),end(INT),cost(FLOAT)\n0,1,1\n1,2,1\n0,2,5\n")
+    graph = Graph.from_edge_list("graph_examples/triangle_edge_list.txt",
+                                 edge_data=path)
+    assert dijkstra(graph, Vertex(0), Vertex(2), weight="cost")[0] == 2
+    assert dijkstra(graph, Vertex(0), Vertex(2), weight=None)[0] == 1
+    assert bellman_ford(graph, Vertex(0), weight="cost")[Vertex(2)] == 2
+    mst = MST(graph, weight="cost")
+    assert sorted(e["cost"] for e in mst) == [1, 1]
+    with pytest.raises(Exception):
+        dijkstra(graph.freeze(), Vertex(0), Vertex(2), weight="cost")
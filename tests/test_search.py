@@ -43,3 +43,15 @@ def test_topological_sort():
         assert False
     except Exception as e:
         assert str(e) == "Topological sort error : cycles found graph"
+
+
+def test_bfs(triangle):
+    g = GraphGenerator.empty(4)
+    g.add_edge(0, 1)
+    g.add_edge(1, 2)
+    assert breath_first_search(g, Vertex(0)) == {Vertex(0): 0, Vertex(1): 1,
+                                                 Vertex(2): 2}
+    assert breath_first_search(g, 0, max_depth=1) == {Vertex(0): 0,
+                                                      Vertex(1): 1}
+    assert breath_first_search(triangle.freeze(), 0) == {
+        Vertex(0): 0, Vertex(1): 1, Vertex(2): 1}
@@ -35,3 +35,14 @@ def test_vertex_setitem():
     vertex1 = Vertex(0, data={})
     vertex1["field"] = 42
     assert vertex1["field"] == 42
+
+
+def test_vertex_lazy_data():
+    vertex1 = Vertex(3)
+    assert not hasattr(vertex1, "__dict__")
+    assert vertex1._data is None
+    assert vertex1["name"] == "3"
+    assert str(vertex1) == "3"
+    vertex1["field"] = 42
+    assert vertex1["name"] == "3"
+    assert vertex1.data == {"name": "3", "field": 42}